@@ -0,0 +1,47 @@
+# Deduplication προτάσεων σε επίπεδο corpus
+# Τα corpora έχουν πολλές επαναλαμβανόμενες προτάσεις (boilerplate, headers, templates). Κάθε μοναδική
+# (κανονικοποιημένη) πρόταση παίρνει ένα job ID: τα pipelines τρέχουν μία φορά ανά ID και το αποτέλεσμα
+# μοιράζεται (fan-out) σε κάθε εμφάνιση, στη σειρά του αρχικού κειμένου.
+from array import array
+
+from text_pipelines.sentence_cache import normalize_sentence
+
+
+class SentenceDeduplicator:
+
+    def __init__(self):
+        self.ids = {}        # κανονικοποιημένη πρόταση -> job ID
+        self.sentences = []  # job ID -> πρόταση (η πρώτη εμφάνιση)
+        self.total = 0       # όλες οι εμφανίσεις
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def add(self, sentence):
+        self.total += 1
+        key = normalize_sentence(sentence)
+        job_id = self.ids.get(key)
+        if job_id is None:
+            job_id = len(self.sentences)
+            self.ids[key] = job_id
+            self.sentences.append(sentence)
+        return job_id
+
+    def add_all(self, sentences):
+        # job IDs των προτάσεων ενός document (array: 4 bytes ανά πρόταση)
+        return array('I', [self.add(sentence) for sentence in sentences])
+
+    @property
+    def duplicates(self):
+        return self.total - len(self.sentences)
+
+    def ratio(self):
+        # μοναδικές / όλες (1.0: καμία επανάληψη)
+        return len(self.sentences) / self.total if self.total else 1.0
+
+
+def deduplicate(sentences):
+    # Μία λίστα προτάσεων -> (μοναδικές προτάσεις, job ID κάθε εμφάνισης)
+    deduplicator = SentenceDeduplicator()
+    ids = deduplicator.add_all(sentences)
+    return deduplicator.sentences, ids
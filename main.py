@@ -1,17 +1,75 @@
 # NLP 2025 - ενιαία main για το πρώτο ερώτημα
+import argparse
+import glob
+import gzip
+import importlib
+import io
+import json
 import os
+import shutil
+import subprocess
 import sys
-# import json
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections.abc import Mapping, Sequence
 
 # ============================== File imports ==============================
+from corpus_dedup import SentenceDeduplicator, deduplicate
+from model_client import ModelClient
+from result_manifest import MANIFEST_FILENAME, ResultManifest, hash_sources
+from text_pipelines.sentence_cache import SENTENCE_CACHE_FILENAME, open_sentence_cache, sentence_cache_stats
+from work_queue import HEARTBEAT_SECONDS, ClaimLost, Heartbeat, WorkQueue, worker_id
 # paradoteo 1a
-from sentence_pipeline.preprocessing_1.preprocessing import preprocess_pipeline
-from sentence_pipeline.syntactic_analysis_2.syntactic_analysis import syntactic_analysis_pipeline
-from sentence_pipeline.grammatical_correction_3.grammatical_correction4 import grammatical_correction_pipeline
-# paradoteo 1b
-from text_pipelines.pipeline_textblob_1.pipeline_1 import pipeline_textblob_1_main
-from text_pipelines.pipeline_embeddings_2.pipeline_2 import pipeline_embeddings_2_main
-from text_pipelines.pipeline_transformers_3.pipeline_3 import pipeline_transformer_3_main
+from sentence_pipeline.preprocessing_1.preprocessing import preprocess_pipeline, preprocess_pipeline_batch, preprocess_pipeline_stream, split_sentences_stream
+from sentence_pipeline.syntactic_analysis_2.syntactic_analysis import syntactic_analysis_pipeline, syntactic_analysis_pipeline_batch
+from sentence_pipeline.grammatical_correction_3.grammatical_correction4 import grammatical_correction_pipeline, grammatical_correction_pipeline_batch
+# paradoteo 1b - τα text pipelines φέρνουν textblob, gensim και transformers/torch (δευτερόλεπτα και εκατοντάδες MB),
+# οπότε φορτώνονται την πρώτη φορά που χρησιμοποιείται το αντίστοιχο pipeline (text_pipeline_module)
+TEXT_PIPELINE_MODULES = {
+    'textblob': "text_pipelines.pipeline_textblob_1.pipeline_1",
+    'embeddings': "text_pipelines.pipeline_embeddings_2.pipeline_2",
+    'transformer': "text_pipelines.pipeline_transformers_3.pipeline_3",
+}
+# (reconstruct χωρίς εκτυπώσεις, *_main που τυπώνει το αποτέλεσμα) ανά text pipeline
+TEXT_PIPELINE_ENTRY_POINTS = {
+    'textblob': ('reconstruct_text_with_textblob', 'pipeline_textblob_1_main'),
+    'embeddings': ('reconstruct_text_with_embeddings', 'pipeline_embeddings_2_main'),
+    'transformer': ('reconstruct_with_transformer', 'pipeline_transformer_3_main'),
+}
+
+
+# batched εκδοχή (λίστα κειμένων -> λίστα αποτελεσμάτων) για τον model server - τα υπόλοιπα τρέχουν ανά κείμενο
+TEXT_PIPELINE_BATCH_FUNCTIONS = {
+    'embeddings': 'reconstruct_texts_with_embeddings',
+    'transformer': 'reconstruct_with_transformer_batch',
+}
+
+
+def text_pipeline_module(pipeline):
+    return importlib.import_module(TEXT_PIPELINE_MODULES[pipeline])
+
+
+def text_pipeline_function(pipeline, verbose=False):
+    if _model_client is not None and not verbose:
+        return lambda text: _model_client.call(pipeline, [text])[0]
+    reconstruct, main_function = TEXT_PIPELINE_ENTRY_POINTS[pipeline]
+    return getattr(text_pipeline_module(pipeline), main_function if verbose else reconstruct)
+
+
+# Model server (python main.py --serve): με σύνδεση (connect_model_server) το sentence pipeline και τα text
+# pipelines τρέχουν στον server, που έχει ήδη φορτωμένα τα μοντέλα, αντί για αυτό το process
+_model_client = None
+
+
+def connect_model_server(socket_path):
+    # -> τα endpoints του server (OSError αν δεν τρέχει κανένας server στο socket_path)
+    global _model_client
+    client = ModelClient(socket_path)
+    endpoints = client.ping()
+    _model_client = client
+    return endpoints
+
 
 # ============================== DIRECTORY STRUCTURE ==============================
 BASE_DIR = "data"
@@ -31,6 +89,10 @@ TEXT2_FILE = os.path.join(TEXTS_DIR, "text2.txt")
 RESULTS_DIR = os.path.join(BASE_DIR, "results")
 SENTENCE_RESULTS_DIR = os.path.join(RESULTS_DIR, "sentence_pipeline")
 TEXT_RESULTS_DIR = os.path.join(RESULTS_DIR, "text_pipelines")
+# manifest των αποτελεσμάτων του menu (βλ. result_manifest.py)
+RESULTS_MANIFEST = os.path.join(RESULTS_DIR, MANIFEST_FILENAME)
+# sentence cache των text pipelines (βλ. text_pipelines/sentence_cache.py)
+RESULTS_SENTENCE_CACHE = os.path.join(RESULTS_DIR, SENTENCE_CACHE_FILENAME)
 
 # ============================== FILE I/O FUNCTIONS ==============================
 # load from file
@@ -41,17 +103,124 @@ def load_file(filepath):
         sentence = f.read().strip()
     return sentence
     
-# save to file 
+# load from file σε κομμάτια (για μεγάλα αρχεία - χωρίς να διαβαστεί ολόκληρο στη μνήμη)
+def load_file_stream(filepath, chunk_size=1 << 16):
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found: {filepath}")
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            yield chunk
+
+# save to file - σε προσωρινό αρχείο + os.replace, ώστε ένα kill να μην αφήνει μισό αποτέλεσμα
 def save_result(result_text, output_path):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w', encoding='utf-8') as f:
+    temporary = output_path + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
         f.write(str(result_text))
+    os.replace(temporary, output_path)
+
+# save results σε ολόκληρη μορφή αντί για κείμενο μόνο (tokens, pos_tags, κτλπ.): ένα JSON record ανά γραμμή (JSONL)
+# Κάθε record γράφεται μόλις παραχθεί, μέσα από buffer - δεν κρατιούνται όλα στη μνήμη μέχρι το τέλος.
+# Αν το path τελειώνει σε .gz, το αρχείο γράφεται ως gzip stream.
+def _json_default(value):
+    # TaggedSentence, array, numpy arrays κτλπ. -> list, LazyPreprocessingResult -> dict
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, Sequence):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonlWriter:
+
+    def __init__(self, output_path, buffer_size=1 << 20, offset=0):
+        # offset: συνέχεια διακοπτόμενου run - το αρχείο κόβεται στο offset του τελευταίου commit και συνεχίζει από εκεί
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self.path = output_path
+        self.count = 0
+        self._buffer_size = buffer_size
+        self._compressed = output_path.endswith('.gz')
+        if offset and os.path.exists(output_path) and os.path.getsize(output_path) >= offset:
+            self._raw = open(output_path, 'r+b', buffering=0)
+            self._raw.truncate(offset)
+            self._raw.seek(offset)
+        else:
+            self._raw = open(output_path, 'wb', buffering=0)
+        self._open_stream()
+
+    def _open_stream(self):
+        stream = self._raw
+        self._stream_start = self._raw.tell()  # αρχή του τρέχοντος gzip member
+        if self._compressed:
+            # το buffer μπροστά από το gzip: ο compressor δέχεται μεγάλα κομμάτια αντί για μία κλήση ανά record
+            # compresslevel 6 (default του zlib): ~3x γρηγορότερο από το 9 του gzip.open με σχεδόν ίδιο μέγεθος
+            stream = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=6)
+        self._file = io.TextIOWrapper(io.BufferedWriter(stream, self._buffer_size), encoding='utf-8')
+        self._uncommitted = 0
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+        self.count += 1
+        self._uncommitted += 1
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
 
-# # save json to file - save results σε ολόκληρη μορφή αντί για κείμενο μόνο (tokens, pos_tags, κτλπ.)
-# def save_json(data, output_path): 
-#     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-#     with open(output_path, 'w', encoding='utf-8') as f:
-#         json.dump(data, f, indent=2, ensure_ascii=False)
+    def commit(self):
+        # Όλα τα records ως τώρα στον δίσκο -> offset για το journal. Στο .gz κλείνει το τρέχον gzip member
+        # (το αρχείο είναι multi-member gzip, όπως το διαβάζουν gzip.open / zcat) ώστε το offset να είναι έγκυρο τέλος.
+        if not self._compressed:
+            self._file.flush()
+            offset = self._raw.tell()
+        elif self._uncommitted:
+            self._file.close()  # flush + gzip trailer - το αρχείο (fileobj) μένει ανοιχτό
+            offset = self._raw.tell()
+            self._open_stream()
+        else:
+            offset = self._stream_start
+        os.fsync(self._raw.fileno())
+        self._uncommitted = 0
+        return offset
+
+    def close(self):
+        self._file.close()
+        self._raw.close()
+
+    def discard(self):
+        # Κλείσιμο χωρίς να γραφτούν τα records μετά το τελευταίο commit (το αρχείο το συνεχίζει άλλο process)
+        self._raw.close()
+        try:
+            self._file.close()
+        except ValueError:
+            pass  # το buffer δεν έχει πού να γραφτεί
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_jsonl(path):
+    # records ενός JSONL (.gz: και multi-member) ένα-ένα
+    with (gzip.open if path.endswith('.gz') else open)(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def partial_jsonl_path(path):
+    # Το JSONL ενός batch run γράφεται εδώ και αντικαθιστά το προηγούμενο στο τέλος: μέχρι τότε το προηγούμενο
+    # μένει ανέπαφο (από εκεί μεταφέρονται τα records των documents που δεν ξανατρέχουν). Ίδια κατάληξη (.gz).
+    return os.path.join(os.path.dirname(path), ".partial-" + os.path.basename(path))
+
+
+def jsonl_record_keys(path):
+    # {(document, pipeline)} όσων υπάρχουν records στο JSONL - χωρίς να κρατιούνται τα records
+    return {(record['document'], record['pipeline']) for record in read_jsonl(path)}
 
 # create dir if not exist
 def ensure_directories(): 
@@ -68,29 +237,57 @@ def ensure_directories():
         os.makedirs(directory, exist_ok=True)
 
 
+# ============================== RESULT MANIFEST ==============================
+# Hash έκδοσης κάθε pipeline: όλος ο κώδικας του package του (μοντέλα και ρυθμίσεις είναι σταθερές μέσα στον κώδικα),
+# οπότε μια αλλαγή στο pipeline ξαναϋπολογίζει τα αποτελέσματά του ενώ οι υπόλοιπες έξοδοι μένουν ως έχουν.
+_config_hashes = {}
+
+def pipeline_config_hash(pipeline):
+    if pipeline not in _config_hashes:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        if pipeline == 'sentence':
+            package_dir = os.path.join(base_dir, "sentence_pipeline")
+        else:
+            package_dir = os.path.join(base_dir, *TEXT_PIPELINE_MODULES[pipeline].split('.')[:-1])
+        sources = glob.glob(os.path.join(package_dir, "**", "*.py"), recursive=True)
+        _config_hashes[pipeline] = hash_sources(sources, settings=(pipeline,))
+    return _config_hashes[pipeline]
+
+
 # ============================== SENTENCE PIPELINE (1A) ==============================
 
-def run_sentence_pipeline():
+def run_sentence_pipeline(force=False):
+    # force=True: ξαναϋπολογισμός ακόμα κι αν το manifest λέει ότι τα αποτελέσματα είναι ενημερωμένα
     print("\n" + "█" * 82)
     print("                    SENTENCE PIPELINE - DELIVERABLE 1A                         ")
     print("  1 (Preprocessing)  |  2 (Syntactic Analysis)  |  3 (Grammatical Correction)  ")
     print("█" * 82 + "\n")
 
     try:
-        sentences = {
-            'sentence1': load_file(SENTENCE1_FILE),
-            'sentence2': load_file(SENTENCE2_FILE)
-        } # Load sentences into dictionary
+        sentence_files = {
+            'sentence1': SENTENCE1_FILE,
+            'sentence2': SENTENCE2_FILE
+        }
+        sentences = {name: load_file(path) for name, path in sentence_files.items()} # Load sentences into dictionary
 
         print(f"✓ Loaded sentence1: {sentences['sentence1']}" )
         print(f"✓ Loaded sentence2: {sentences['sentence2']}" )
 
         results = {}  # Process and store results in dictionary
+        manifest = ResultManifest(RESULTS_MANIFEST)
+        config_hash = pipeline_config_hash('sentence')
         
         for name, sentence in sentences.items():
             print("\n" + "█" * 82)
             print(f"{name.upper()}")
 
+            input_hash = manifest.input_hash(sentence_files[name])
+            summary_path = os.path.join(SENTENCE_RESULTS_DIR, f"{name}_summary.txt")
+            if not force and manifest.is_up_to_date('sentence', name, input_hash, config_hash):
+                print(f"\n✓ Unchanged since the last run - skipped ({summary_path})")
+                results[name] = {'original': sentence, 'skipped': True, 'summary': load_file(summary_path)}
+                continue
+
             print("\n[1] Preprocessing...")
             preprocess = preprocess_pipeline(sentence, verbose=True)
 
@@ -107,20 +304,25 @@ def run_sentence_pipeline():
                 'syntactic': syntax,
                 'corrected': corrected
             }
+            summary = f"Original: {sentence}\n"
+            summary += f"Reconstructed: {syntax['reconstructed']}\n"
+            summary += f"Corrected: {corrected}"
+            save_result(summary, summary_path)
+            manifest.record('sentence', name, sentence_files[name], input_hash, config_hash, [summary_path])
 
             print("\n" + "=" * 82)
             print(f"✓ {name.upper()} complete")
             print("=" * 82)
         
+        manifest.save()
+
         for name in results:
-            # Save
-            summary = f"Original: {results[name]['original']}\n"
-            summary += f"Reconstructed: {results[name]['syntactic']['reconstructed']}\n"
-            summary += f"Corrected: {results[name]['corrected']}"
-            save_result(summary, os.path.join(SENTENCE_RESULTS_DIR, f"{name}_summary.txt"))
-        
             # Print
             print(f"\n{name.upper()}:")
+            if results[name].get('skipped'): # αποτέλεσμα προηγούμενου run
+                for line in results[name]['summary'].splitlines():
+                    print(f"  {line}")
+                continue
             print(f"  Original:      {results[name]['original']}")
             print(f"  Reconstructed: {results[name]['syntactic']['reconstructed']}")
             print(f"  Corrected:     {results[name]['corrected']}")
@@ -144,57 +346,202 @@ def run_sentence_pipeline():
         return None
 
 
+# Batch εκδοχή για πολλές προτάσεις (χωρίς εκτυπώσεις) - κάθε στάδιο δέχεται όλη τη λίστα
+def run_sentence_pipeline_batch(sentences):
+    # Δέχεται λίστα προτάσεων -> επιστρέφει λίστα αποτελεσμάτων (ίδια μορφή με το run_sentence_pipeline) στη σειρά εισόδου
+    # Κάθε διαφορετική πρόταση περνάει από τα στάδια μία φορά - οι επαναλήψεις παίρνουν το ίδιο αποτέλεσμα
+    if _model_client is not None:
+        return _model_client.call('sentence', sentences)
+    unique, ids = deduplicate(sentences)
+    # lazy: το lemmatization γίνεται μόνο αν διαβαστεί το 'preprocessing' (JSONL records) - το syntactic
+    # analysis και η διόρθωση χρειάζονται μόνο τα pos_tags
+    preprocessed = preprocess_pipeline_batch(unique, lazy=True)
+    syntax = syntactic_analysis_pipeline_batch(preprocessed)
+    corrected = grammatical_correction_pipeline_batch([s['reconstructed'] for s in syntax], syntactic_infos=syntax)
+
+    return [
+        {
+            'original': sentence,
+            'preprocessing': preprocessed[job_id],
+            'syntactic': syntax[job_id],
+            'corrected': corrected[job_id]
+        }
+        for sentence, job_id in zip(sentences, ids)
+    ]
+
+
+# Streaming preprocessing ενός (μεγάλου) αρχείου: yield ένα record ανά πρόταση
+def stream_preprocessed_sentences(filepath, keep_intermediate=False):
+    return preprocess_pipeline_stream(split_sentences_stream(load_file_stream(filepath)), keep_intermediate=keep_intermediate)
+
+
 # ============================== TEXT PIPELINE (1B) ==============================
 
-def run_text_pipeline():
+TEXT_PIPELINES = tuple(TEXT_PIPELINE_MODULES)
+TEXT_PIPELINE_LABELS = {'textblob': "TextBlob", 'embeddings': "Embeddings", 'transformer': "Transformer"}
+# φάκελος αποτελεσμάτων κάθε pipeline μέσα στο TEXT_RESULTS_DIR
+TEXT_RESULT_DIRS = {
+    'textblob': "pipeline_1_textblob",
+    'embeddings': "pipeline_2_embeddings",
+    'transformer': "pipeline_3_transformer",
+}
+
+
+# Concurrent εκτέλεση: τα τρία text pipelines είναι ανεξάρτητα, οπότε για κάθε κείμενο τρέχουν μαζί σε threads
+# αντί για το ένα μετά το άλλο. Ο transformer περνάει σχεδόν όλο τον χρόνο του μέσα στο torch, που αφήνει το GIL,
+# οπότε το TextBlob και τα embeddings προχωράνε όσο τρέχει το generation. Τα threads του torch περιορίζονται
+# ώστε να μένουν cores για τα άλλα δύο -> χρόνος ανά κείμενο ~ max των pipelines αντί για το άθροισμα.
+def default_transformer_threads(workers=1, other_pipelines=2):
+    # cores που αναλογούν σε κάθε worker, μείον ένα για κάθε pipeline που τρέχει δίπλα στον transformer
+    return max(1, (os.cpu_count() or 1) // max(1, workers) - other_pipelines)
+
+
+def _timed(function, text):
+    start = time.perf_counter()
+    result = function(text)
+    return result, time.perf_counter() - start
+
+
+def run_text_pipelines_concurrent(text, pipelines=TEXT_PIPELINES):
+    # Επιστρέφει (results, latencies): results[pipeline] = κείμενο,
+    # latencies[pipeline] = δευτερόλεπτα του pipeline, latencies['total'] = end-to-end χρόνος του κειμένου
+    # Το όριο στα threads του torch μπαίνει μία φορά ανά process από τον caller (limit_transformer_threads)
+    functions = {pipeline: text_pipeline_function(pipeline) for pipeline in pipelines}  # imports πριν τα threads
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(pipelines)) as pool:
+        futures = {pipeline: pool.submit(_timed, function, text) for pipeline, function in functions.items()}
+        results, latencies = {}, {}
+        for pipeline, future in futures.items():
+            results[pipeline], latencies[pipeline] = future.result()
+    latencies['total'] = time.perf_counter() - start
+    return results, latencies
+
+
+def cache_stats_delta(before, after):
+    # στατιστικά του sentence cache ανάμεσα σε δύο sentence_cache_stats()
+    return {
+        pipeline: {key: value - before.get(pipeline, {}).get(key, 0) for key, value in stats.items()}
+        for pipeline, stats in after.items()
+    }
+
+
+def add_cache_stats(total, stats):
+    for pipeline, values in stats.items():
+        pipeline_total = total.setdefault(pipeline, {})
+        for key, value in values.items():
+            pipeline_total[key] = pipeline_total.get(key, 0) + value
+    return total
+
+
+def format_cache_stats(stats):
+    # "textblob 120/130 hits (92.3%), 4.10s saved | ..."
+    parts = []
+    for pipeline in TEXT_PIPELINES:
+        if pipeline not in stats:
+            continue
+        hits, total = stats[pipeline]['hits'], stats[pipeline]['hits'] + stats[pipeline]['misses']
+        if total:
+            parts.append(f"{pipeline} {hits}/{total} hits ({100 * hits / total:.1f}%), "
+                         f"{stats[pipeline]['saved_seconds']:.2f}s saved")
+    return " | ".join(parts)
+
+
+def format_latencies(latencies):
+    # "textblob 0.41s | embeddings 1.20s | transformer 3.05s | end-to-end 3.10s (sum 4.66s)"
+    pipelines = [pipeline for pipeline in TEXT_PIPELINES if pipeline in latencies]
+    parts = [f"{pipeline} {latencies[pipeline]:.2f}s" for pipeline in pipelines]
+    parts.append(f"end-to-end {latencies['total']:.2f}s (sum {sum(latencies[p] for p in pipelines):.2f}s)")
+    return " | ".join(parts)
+
+
+def run_text_pipeline(concurrent=False, force=False, sentence_cache=True):
+    # concurrent=True: τα τρία pipelines τρέχουν ταυτόχρονα για κάθε κείμενο (run_text_pipelines_concurrent)
+    # force=True: ξαναϋπολογισμός ακόμα κι αν το manifest λέει ότι τα αποτελέσματα είναι ενημερωμένα
+    # sentence_cache=True: προτάσεις που έχουν ξαναϋπολογιστεί (σε προηγούμενο run) έρχονται από το RESULTS_SENTENCE_CACHE
     print("\n" + "█" * 82)
     print("                      TEXT PIPELINES - DELIVERABLE 1B                          ")
     print("            1 (TextBlob)     |     2 (Embeddings)     |     3 (Transformer)    ")
     print("█" * 82 + "\n")
 
     try:
-        texts = {
-            'text1': load_file(TEXT1_FILE),
-            'text2': load_file(TEXT2_FILE)
-        } # Load texts
+        text_files = {
+            'text1': TEXT1_FILE,
+            'text2': TEXT2_FILE
+        }
+        texts = {name: load_file(path) for name, path in text_files.items()} # Load texts
 
         print(f"✓ Loaded text1: {len(texts['text1'])} characters")
         print(f"✓ Loaded text2: {len(texts['text2'])} characters")
     
         results = {} # Process and store results in dictionary
+        manifest = ResultManifest(RESULTS_MANIFEST)
+        if sentence_cache:
+            open_sentence_cache(RESULTS_SENTENCE_CACHE)
 
         for name, text in texts.items():
             print("\n" + "█" * 82)
             print(f"{name.upper()}")
+
+            # μόνο τα pipelines που άλλαξαν (ή άλλαξε το κείμενο) ξανατρέχουν - τα υπόλοιπα από τα αρχεία του προηγούμενου run
+            input_hash = manifest.input_hash(text_files[name])
+            output_paths = {
+                pipeline: os.path.join(TEXT_RESULTS_DIR, TEXT_RESULT_DIRS[pipeline], f"{name}_result.txt")
+                for pipeline in TEXT_PIPELINES
+            }
+            stale = [
+                pipeline for pipeline in TEXT_PIPELINES
+                if force or not manifest.is_up_to_date(pipeline, name, input_hash, pipeline_config_hash(pipeline))
+            ]
+            reconstructed = {}
+            for pipeline in TEXT_PIPELINES:
+                if pipeline not in stale:
+                    print(f"\n✓ {TEXT_PIPELINE_LABELS[pipeline]} unchanged since the last run - skipped")
+                    reconstructed[pipeline] = load_file(output_paths[pipeline])
+            latencies = {}
+            cache_before = sentence_cache_stats()
     
-            print("\n[1] TextBlob...")
-            textblob_result = pipeline_textblob_1_main(text)
-    
-            print("\n[2] Embeddings...")
-            embeddings_result = pipeline_embeddings_2_main(text)
-    
-            print("\n[3] Transformer...")
-            transformer_result = pipeline_transformer_3_main(text)
+            if concurrent and stale:
+                labels = " | ".join(TEXT_PIPELINE_LABELS[pipeline] for pipeline in stale)
+                print(f"\n[{','.join(str(TEXT_PIPELINES.index(pipeline) + 1) for pipeline in stale)}] {labels} (concurrent)...")
+                if 'transformer' in stale:
+                    text_pipeline_module('transformer').limit_transformer_threads(default_transformer_threads(other_pipelines=len(stale) - 1))
+                fresh, latencies = run_text_pipelines_concurrent(text, stale)
+                for pipeline in stale:
+                    print(f"\n--- {pipeline} ---\n{fresh[pipeline]}")
+                reconstructed.update(fresh)
+            elif stale:
+                start = time.perf_counter()
+                for pipeline in stale:
+                    print(f"\n[{TEXT_PIPELINES.index(pipeline) + 1}] {TEXT_PIPELINE_LABELS[pipeline]}...")
+                    reconstructed[pipeline], latencies[pipeline] = _timed(text_pipeline_function(pipeline, verbose=True), text)
+                latencies['total'] = time.perf_counter() - start
+
+            # Individual pipeline results
+            for pipeline in stale:
+                save_result(reconstructed[pipeline], output_paths[pipeline])
+                manifest.record(pipeline, name, text_files[name], input_hash, pipeline_config_hash(pipeline), [output_paths[pipeline]])
     
             # Store results
             results[name] = {
                 'input': text,
-                'textblob': textblob_result,
-                'embeddings': embeddings_result,
-                'transformer': transformer_result
+                'textblob': reconstructed['textblob'],
+                'embeddings': reconstructed['embeddings'],
+                'transformer': reconstructed['transformer'],
+                'latencies': latencies
             }
     
             print("\n" + "=" * 82)
             print(f"✓ {name.upper()} complete")
+            if latencies:
+                print(f"  Latency: {format_latencies(latencies)}")
+            cache_stats = format_cache_stats(cache_stats_delta(cache_before, sentence_cache_stats()))
+            if cache_stats:
+                print(f"  Sentence cache: {cache_stats}")
             print("=" * 82)
+
+        manifest.save()
     
-        for name in results: # Save and print 
-            # Individual pipeline results
-            save_result(results[name]['textblob'], os.path.join(TEXT_RESULTS_DIR, "pipeline_1_textblob", f"{name}_result.txt"))
-            save_result(results[name]['embeddings'], os.path.join(TEXT_RESULTS_DIR, "pipeline_2_embeddings", f"{name}_result.txt"))
-            save_result(results[name]['transformer'], os.path.join(TEXT_RESULTS_DIR, "pipeline_3_transformer", f"{name}_result.txt"))
-    
-            # Summary
+        for name in results: # Summary
             summary = f"=== {name.upper()} RESULTS ===\n\n"
             summary += f"--- TextBlob ---\n{results[name]['textblob']}\n\n"
             summary += f"--- Embeddings ---\n{results[name]['embeddings']}\n\n"
@@ -222,6 +569,973 @@ def run_text_pipeline():
         return None
 
 
+# ============================== BATCH CLI ==============================
+# Μη-interactive εκτέλεση για batch scheduler (χωρίς input()):
+#   python main.py data/raw/texts "corpus/**/*.txt" --pipelines sentence,textblob --output-dir out --workers 4
+# Κάθε αρχείο εισόδου είναι ένα document. Τα documents μοιράζονται σε process pool, κάθε worker φορτώνει
+# τα μοντέλα των pipelines μία φορά στην αρχή (init_batch_worker) και τα ξαναχρησιμοποιεί για όλα του τα documents.
+
+BATCH_PIPELINES = ('sentence', 'textblob', 'embeddings', 'transformer')
+BATCH_PIPELINE_ALIASES = {
+    'all': BATCH_PIPELINES,
+    'text': ('textblob', 'embeddings', 'transformer'),
+}
+# φάκελος εξόδου κάθε pipeline μέσα στο --output-dir (ίδια δομή με το data/results)
+BATCH_OUTPUT_DIRS = {
+    'sentence': "sentence_pipeline",
+    'textblob': os.path.join("text_pipelines", "pipeline_1_textblob"),
+    'embeddings': os.path.join("text_pipelines", "pipeline_2_embeddings"),
+    'transformer': os.path.join("text_pipelines", "pipeline_3_transformer"),
+}
+
+
+def parse_pipelines(value):
+    # "sentence,textblob" / "text" / "all" -> tuple από pipelines στη σειρά του BATCH_PIPELINES
+    selected = set()
+    for name in value.split(','):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name in BATCH_PIPELINE_ALIASES:
+            selected.update(BATCH_PIPELINE_ALIASES[name])
+        elif name in BATCH_PIPELINES:
+            selected.add(name)
+        else:
+            choices = ', '.join(BATCH_PIPELINES + tuple(BATCH_PIPELINE_ALIASES))
+            raise argparse.ArgumentTypeError(f"unknown pipeline '{name}' (choose from {choices})")
+    if not selected:
+        raise argparse.ArgumentTypeError("no pipeline selected")
+    return tuple(name for name in BATCH_PIPELINES if name in selected)
+
+
+def collect_input_files(inputs):
+    # inputs: αρχεία, φάκελοι (όλα τα *.txt, αναδρομικά) ή glob patterns
+    # Επιστρέφει λίστα από (path, name) - name: όνομα εξόδου χωρίς .txt, σχετικό με τον φάκελο εισόδου
+    files = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for root, dirs, filenames in os.walk(entry):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith('.txt'):
+                        path = os.path.join(root, filename)
+                        files.append((path, os.path.splitext(os.path.relpath(path, entry))[0]))
+        elif os.path.isfile(entry):
+            files.append((entry, os.path.splitext(os.path.basename(entry))[0]))
+        else:
+            matches = sorted(path for path in glob.glob(entry, recursive=True) if os.path.isfile(path))
+            if not matches:
+                raise FileNotFoundError(f"No input files match: {entry}")
+            files.extend((path, os.path.splitext(os.path.basename(path))[0]) for path in matches)
+
+    seen = {}
+    for path, name in files:
+        if name in seen and os.path.abspath(seen[name]) != os.path.abspath(path):
+            raise ValueError(f"Two inputs map to the same output name '{name}': {seen[name]} and {path}")
+        seen[name] = path
+    # κάθε αρχείο μία φορά (π.χ. αν δόθηκε και ως αρχείο και μέσα σε φάκελο)
+    return list({os.path.abspath(path): (path, name) for path, name in files}.values())
+
+
+def batch_output_path(output_dir, pipeline, name):
+    return os.path.join(output_dir, BATCH_OUTPUT_DIRS[pipeline], f"{name}_result.txt")
+
+
+def init_batch_worker(pipelines, transformer_threads=None, sentence_cache_path=None, server_path=None):
+    # Τρέχει μία φορά σε κάθε worker process: φόρτωση μοντέλων / δεδομένων πριν το πρώτο document
+    # server_path: τα pipelines τρέχουν στον model server - κανένα μοντέλο δεν φορτώνεται εδώ
+    if server_path:
+        connect_model_server(server_path)
+        return
+    if sentence_cache_path and any(pipeline in TEXT_PIPELINE_MODULES for pipeline in pipelines):
+        open_sentence_cache(sentence_cache_path)
+    if 'transformer' in pipelines and transformer_threads:
+        text_pipeline_module('transformer').limit_transformer_threads(transformer_threads)
+    if 'sentence' in pipelines:
+        run_sentence_pipeline_batch(["Warm up the sentence pipeline."])  # tagger, lemmatizer, tokenizers
+    if 'embeddings' in pipelines:
+        text_pipeline_module('embeddings').load_embeddings_model()
+    if 'transformer' in pipelines:
+        text_pipeline_module('transformer').load_transformer_reconstructor()
+
+
+def process_document(path, name, pipelines, output_dir, concurrent_text=False, structured=False):
+    # Ένα document από όλα τα επιλεγμένα pipelines -> ένα αρχείο αποτελέσματος ανά pipeline
+    # concurrent_text: τα text pipelines του document τρέχουν ταυτόχρονα (run_text_pipelines_concurrent)
+    # structured: επιστρέφει και τα πλήρη αποτελέσματα ως records για το JSONL (ένα ανά πρόταση / ανά text pipeline)
+    # Επιστρέφει (name, αριθμός προτάσεων, δευτερόλεπτα, latencies των text pipelines, records,
+    #            στατιστικά του sentence cache για το document)
+    start = time.perf_counter()
+    cache_before = sentence_cache_stats()
+    text = load_file(path)
+    sentence_count = 0
+    results = {}
+    records = []
+
+    if 'sentence' in pipelines:
+        sentences = list(split_sentences_stream([text]))
+        sentence_count = len(sentences)
+        corrected = run_sentence_pipeline_batch(sentences) if sentences else []
+        results['sentence'] = "\n".join(result['corrected'] for result in corrected)
+        if structured:
+            records.extend(
+                {'document': name, 'pipeline': 'sentence', 'index': index, **result}
+                for index, result in enumerate(corrected)
+            )
+
+    text_pipelines = [pipeline for pipeline in pipelines if pipeline in TEXT_PIPELINE_MODULES]
+    latencies = {}
+    if text_pipelines and not text:
+        results.update((pipeline, "") for pipeline in text_pipelines)
+    elif concurrent_text and len(text_pipelines) > 1:
+        # τα threads του torch έχουν οριστεί ήδη στο init_batch_worker
+        reconstructed, latencies = run_text_pipelines_concurrent(text, text_pipelines)
+        results.update(reconstructed)
+    elif text_pipelines:
+        text_start = time.perf_counter()
+        for pipeline in text_pipelines:
+            results[pipeline], latencies[pipeline] = _timed(text_pipeline_function(pipeline), text)
+        latencies['total'] = time.perf_counter() - text_start
+
+    for pipeline in pipelines:
+        save_result(results[pipeline], batch_output_path(output_dir, pipeline, name))
+    if structured:
+        records.extend(
+            {'document': name, 'pipeline': pipeline, 'input': path, 'output': results[pipeline],
+             'latency': latencies.get(pipeline)}
+            for pipeline in text_pipelines
+        )
+
+    cache_stats = cache_stats_delta(cache_before, sentence_cache_stats())
+    return name, sentence_count, time.perf_counter() - start, latencies, records, cache_stats
+
+
+# ---------- Dedup του sentence pipeline σε επίπεδο corpus (--dedup) ----------
+# Οι προτάσεις όλων των documents μαζεύονται πρώτα: κάθε μοναδική πρόταση περνάει από το sentence pipeline
+# μία φορά (σε chunks, μοιρασμένα στους workers) και το αποτέλεσμα γράφεται σε κάθε εμφάνισή της. Κάθε document
+# γράφεται (και γίνεται commit στο journal) μόλις υπολογιστούν όλες οι προτάσεις του, όχι στο τέλος του σταδίου.
+# Στη μνήμη μένουν οι μοναδικές προτάσεις και τα job IDs κάθε document (όχι τα κείμενα) - το αποτέλεσμα μιας
+# πρότασης μόνο μέχρι να γραφτεί το τελευταίο document που την περιέχει.
+# Τα text pipelines δεν χρειάζονται ξεχωριστό στάδιο: το sentence cache είναι κοινό για όλα τα documents.
+DEDUP_CHUNK_SIZE = 256
+
+
+def process_sentence_chunk(sentences, structured=False):
+    # Μοναδικές προτάσεις -> (corrected ανά πρόταση, πλήρη αποτελέσματα αν structured, δευτερόλεπτα)
+    start = time.perf_counter()
+    results = run_sentence_pipeline_batch(sentences)
+    corrected = [result['corrected'] for result in results]
+    return corrected, results if structured else None, time.perf_counter() - start
+
+
+def run_sentence_dedup(documents, pool=None, structured=False):
+    # documents: [(path, name)] -> (deduplicator, generator των documents, stats)
+    # Ο generator δίνει (name, job IDs, corrected, results, error) για κάθε document, στη σειρά των documents, μόλις
+    # υπολογιστούν όλες οι προτάσεις του. Τα job IDs μοιράζονται στη σειρά των documents και τα chunks τρέχουν στη
+    # σειρά των job IDs, οπότε τα πρώτα documents είναι έτοιμα (και γίνονται commit) ενώ τρέχουν ακόμα τα επόμενα chunks.
+    # error: η exception της πρώτης πρότασης που απέτυχε (None: όλες πέτυχαν)
+    # stats['seconds']: χρόνος στις μοναδικές προτάσεις (ενημερώνεται όσο τρέχει ο generator)
+    deduplicator = SentenceDeduplicator()
+    document_ids = []
+    for path, name in documents:
+        ids = deduplicator.add_all(split_sentences_stream([load_file(path)]))
+        # τα IDs ενός document είναι < όσες μοναδικές προτάσεις υπάρχουν μετά από αυτό
+        document_ids.append((name, ids, len(deduplicator)))
+    stats = {'seconds': 0.0}
+    return deduplicator, _dedup_documents(deduplicator.sentences, document_ids, pool, structured, stats), stats
+
+
+def _dedup_documents(unique, document_ids, pool, structured, stats):
+    # corrected / results: job ID -> αποτέλεσμα, μόνο για όσα job IDs χρειάζονται ακόμα (τα υπόλοιπα σβήνονται μόλις
+    # δοθεί το τελευταίο document που τα περιέχει - last_use)
+    corrected = {}
+    results = {}
+    errors = {}
+    last_use = array('I', bytes(4 * len(unique)))
+    for index, (_, ids, _) in enumerate(document_ids):
+        for job_id in ids:
+            last_use[job_id] = index
+    finished = set()  # offsets των chunks που ολοκληρώθηκαν εκτός σειράς
+    computed = 0      # όλα τα job IDs < computed έχουν υπολογιστεί
+    next_document = 0
+
+    def store(offset, chunk_result):
+        chunk_corrected, chunk_results, chunk_seconds = chunk_result
+        corrected.update(enumerate(chunk_corrected, offset))
+        if structured:
+            results.update(enumerate(chunk_results, offset))
+        stats['seconds'] += chunk_seconds
+
+    def retry_sentences(offset):
+        # ένα chunk απέτυχε: οι προτάσεις του ξανατρέχουν μία-μία, ώστε να αποτύχουν μόνο τα documents που τις περιέχουν
+        for job_id in range(offset, min(offset + DEDUP_CHUNK_SIZE, len(unique))):
+            try:
+                store(job_id, process_sentence_chunk([unique[job_id]], structured))
+            except Exception as e:
+                errors[job_id] = e
+
+    def completed_chunks():
+        # offset κάθε chunk μόλις ολοκληρωθεί (με pool: με τη σειρά που τελειώνουν)
+        offsets = range(0, len(unique), DEDUP_CHUNK_SIZE)
+        if pool is None:
+            for offset in offsets:
+                try:
+                    store(offset, process_sentence_chunk(unique[offset:offset + DEDUP_CHUNK_SIZE], structured))
+                except Exception:
+                    retry_sentences(offset)
+                yield offset
+            return
+        futures = {
+            pool.submit(process_sentence_chunk, unique[offset:offset + DEDUP_CHUNK_SIZE], structured): offset
+            for offset in offsets
+        }
+        for future in as_completed(futures):
+            try:
+                store(futures[future], future.result())
+            except Exception:
+                retry_sentences(futures[future])
+            yield futures[future]
+
+    def ready_documents():
+        nonlocal next_document
+        while next_document < len(document_ids) and document_ids[next_document][2] <= computed:
+            index = next_document
+            name, ids, _ = document_ids[index]
+            document_ids[index] = None
+            next_document += 1
+            error = next((errors[job_id] for job_id in ids if job_id in errors), None)
+            if error is not None:
+                yield name, ids, None, None, error
+            else:
+                yield (name, ids, [corrected[job_id] for job_id in ids],
+                       [results[job_id] for job_id in ids] if structured else None, None)
+            for job_id in ids:
+                if last_use[job_id] == index:
+                    corrected.pop(job_id, None)
+                    results.pop(job_id, None)
+
+    yield from ready_documents()  # documents χωρίς νέες προτάσεις
+    for offset in completed_chunks():
+        finished.add(offset)
+        while computed in finished:
+            finished.discard(computed)
+            computed = min(computed + DEDUP_CHUNK_SIZE, len(unique))
+        yield from ready_documents()
+
+
+def format_dedup_stats(deduplicator, seconds):
+    # π.χ. "12000 sentences -> 3000 unique (ratio 0.25), 30.1s on unique sentences, ~90.3s saved"
+    # (saved: οι επαναλήψεις επί τον μέσο χρόνο μιας μοναδικής πρότασης)
+    unique = len(deduplicator)
+    saved = deduplicator.duplicates * seconds / unique if unique else 0.0
+    return (f"{deduplicator.total} sentences -> {unique} unique (ratio {deduplicator.ratio():.2f}), "
+            f"{seconds:.2f}s on unique sentences, ~{saved:.2f}s saved")
+
+
+def run_batch(files, pipelines, output_dir, workers=1, concurrent_text=False, transformer_threads=None, force=False,
+              jsonl_path=None, sentence_cache=True, dedup=False, journal=False, server_path=None, claim=None):
+    # Επεξεργασία όλων των documents - με workers > 1 σε process pool
+    # concurrent_text: τα text pipelines κάθε document τρέχουν ταυτόχρονα (βλ. run_text_pipelines_concurrent)
+    # transformer_threads: threads του torch ανά worker (None: όσα cores αναλογούν στον worker μείον τα άλλα text pipelines)
+    # force: αγνοεί το manifest και ξαναϋπολογίζει όλα τα documents
+    # jsonl_path: structured αποτελέσματα σε JSONL (JsonlWriter) - τα records κάθε document γράφονται μόλις
+    # ολοκληρωθεί, οπότε στη μνήμη υπάρχουν το πολύ τα records ενός document
+    # sentence_cache: τα text pipelines κρατάνε αποτελέσματα ανά πρόταση στο output_dir (κοινό για όλους τους workers)
+    # dedup: το sentence pipeline τρέχει μία φορά ανά μοναδική πρόταση όλου του corpus (run_sentence_dedup)
+    # journal: κάθε ολοκληρωμένο document γίνεται commit στο log του manifest (μαζί με το offset του JSONL) - μετά
+    # από crash / kill η ίδια εντολή συνεχίζει από το τελευταίο commit
+    # server_path: τα pipelines τρέχουν στον model server (με το δικό του sentence cache) - βλ. check_model_server
+    # claim: Heartbeat του shard (work queue) - αν το claim χαθεί, το run σταματάει με ClaimLost πριν από το επόμενο
+    # write / commit και δεν αγγίζει πια το JSONL και το journal (τα συνεχίζει ο worker που πήρε το shard)
+    # Επιστρέφει λίστα από (path, exception) για όσα documents απέτυχαν
+    failures = []
+    total_sentences = 0
+    # άθροισμα latencies ανά text pipeline και end-to-end ('total') σε όλα τα documents
+    total_latencies = {}
+    total_cache_stats = {}
+    sentence_cache_path = os.path.join(output_dir, SENTENCE_CACHE_FILENAME) if sentence_cache and not server_path else None
+    start = time.perf_counter()
+
+    # Manifest στο output_dir: ένα document ξανατρέχει μόνο στα pipelines όπου άλλαξε η είσοδος ή ο κώδικας
+    # του pipeline (ή λείπει η έξοδος) - τα documents χωρίς αλλαγές δεν φτάνουν καν στους workers
+    manifest = ResultManifest(os.path.join(output_dir, MANIFEST_FILENAME), journal=journal)
+    if manifest.resumed:
+        print(f"Resuming an interrupted run: {len(manifest.resumed)} results already committed")
+    config_hashes = {pipeline: pipeline_config_hash(pipeline) for pipeline in pipelines}
+
+    # JSONL: γράφεται στο partial_jsonl_path και αντικαθιστά το προηγούμενο στο τέλος. Τα records των documents
+    # που δεν ξανατρέχουν μεταφέρονται από το προηγούμενο αρχείο: ένα αποτέλεσμα δεν ξανατρέχει αν το manifest
+    # λέει ότι τα records αυτής της έκδοσης γράφτηκαν σε αυτό το JSONL και υπάρχουν πράγματι στο αρχείο.
+    # Συνέχεια με journal: το partial αρχείο κόβεται στο τελευταίο commit και έχει ήδη τα records που μεταφέρθηκαν
+    # (αν η διακοπή έγινε πριν ολοκληρωθεί η μεταφορά, το partial ξαναφτιάχνεται).
+    partial_path = partial_jsonl_path(jsonl_path) if jsonl_path else None
+    resume_offset = None
+    recorded = set()  # (document, pipeline) με records στο αρχείο από όπου συνεχίζει το run
+    if jsonl_path:
+        offset = manifest.checkpoint.get('offset', 0)
+        if (manifest.checkpoint.get('jsonl') == os.path.abspath(partial_path) and manifest.checkpoint.get('carried')
+                and os.path.exists(partial_path) and os.path.getsize(partial_path) >= offset):
+            os.truncate(partial_path, offset)
+            resume_offset = offset
+            recorded = jsonl_record_keys(partial_path)
+        else:
+            # ό,τι έγινε commit σε διακοπτόμενο run είχε records μόνο στο partial, που ξαναφτιάχνεται
+            manifest.forget_records(manifest.resumed)
+            recorded = jsonl_record_keys(jsonl_path) if os.path.exists(jsonl_path) else set()
+
+    def has_records(pipeline, name):
+        # ένα document χωρίς προτάσεις δεν έχει records του sentence pipeline (η έξοδός του είναι κενή)
+        return manifest.has_records(pipeline, name, jsonl_path) and (
+            (name, pipeline) in recorded
+            or (pipeline == 'sentence' and os.path.getsize(batch_output_path(output_dir, pipeline, name)) == 0))
+
+    def plan():
+        jobs = []  # (path, name, pipelines προς εκτέλεση, input hash)
+        for path, name in files:
+            input_hash = manifest.input_hash(path)
+            stale = tuple(
+                pipeline for pipeline in pipelines
+                if not manifest.is_up_to_date(pipeline, name, input_hash, config_hashes[pipeline])
+                or (force and not manifest.was_resumed(pipeline, name))
+                or (jsonl_path and not has_records(pipeline, name))
+            )
+            if stale:
+                jobs.append((path, name, stale, input_hash))
+        return jobs
+
+    jobs = plan()
+    if resume_offset is not None and any((name, pipeline) in recorded for _, name, stale, _ in jobs for pipeline in stale):
+        # κάτι που έγινε commit ξανατρέχει (π.χ. άλλαξε η είσοδος μετά τη διακοπή) - τα records του δεν
+        # αφαιρούνται από το partial αρχείο, οπότε το JSONL ξαναφτιάχνεται από το προηγούμενο (όπως παραπάνω)
+        resume_offset = None
+        manifest.forget_records(manifest.resumed)
+        recorded = jsonl_record_keys(jsonl_path) if os.path.exists(jsonl_path) else set()
+        jobs = plan()
+    if len(jobs) < len(files):
+        print(f"{len(files) - len(jobs)} documents unchanged since the last run - skipped")
+    # μόνο τα μοντέλα των pipelines που θα τρέξουν πράγματι φορτώνονται στους workers
+    active = tuple(pipeline for pipeline in pipelines if any(pipeline in stale for _, _, stale, _ in jobs))
+
+    if 'transformer' in active and transformer_threads is None and not server_path:
+        other_pipelines = sum(1 for pipeline in active if pipeline in TEXT_PIPELINE_MODULES) - 1 if concurrent_text else 0
+        transformer_threads = default_transformer_threads(workers, other_pipelines)
+
+    # Τα μεγαλύτερα αρχεία ξεκινάνε πρώτα, ώστε κανένας worker να μη μείνει τελευταίος με ένα μεγάλο document
+    jobs.sort(key=lambda job: os.path.getsize(job[0]), reverse=True)
+
+    writer = None
+    # χωρίς δουλειά (π.χ. ξανά μετά από ολοκληρωμένο run) το JSONL μένει όπως είναι
+    if jsonl_path and (jobs or resume_offset is not None):
+        writer = JsonlWriter(partial_path, offset=resume_offset or 0)
+    documents = len(jobs)
+    dedup_stats = None
+    carried = 0
+    # το partial αρχείο έχει όλα τα records που μεταφέρθηκαν - μετά από διακοπή χωρίς journal μπαίνει στη θέση
+    # του προηγούμενου (τα documents που δεν ολοκληρώθηκαν δεν έχουν records και ξανατρέχουν στο επόμενο run)
+    carried_over = resume_offset is not None
+
+    def check_claim():
+        if claim is not None and not claim.alive():
+            raise ClaimLost(f"lost the claim on {output_dir}")
+
+    def commit():
+        # το document είναι πλήρες στον δίσκο (έξοδοι, records) -> μία γραμμή στο log
+        check_claim()
+        if journal:
+            checkpoint = None
+            if writer is not None:
+                checkpoint = {'jsonl': os.path.abspath(partial_path), 'offset': writer.commit(), 'carried': carried_over}
+            manifest.commit(checkpoint)
+
+    if writer is not None and resume_offset is None:
+        commit()  # ένα checkpoint από προηγούμενο run δεν ισχύει πια για το partial αρχείο
+
+    def carry_records():
+        # records του προηγούμενου JSONL για τα (document, pipeline) του run που δεν ξανατρέχουν
+        nonlocal carried, carried_over
+        if not carried_over and os.path.exists(jsonl_path):
+            # has_records: ό,τι δεν ξανατρέχει έχει records στο προηγούμενο αρχείο
+            names = {name for _, name in files}
+            rerun = {(name, pipeline) for _, name, stale, _ in jobs for pipeline in stale}
+            previous = None
+            for record in read_jsonl(jsonl_path):
+                key = (record['document'], record['pipeline'])
+                if key[0] in names and key[1] in pipelines and key not in rerun:
+                    if key != previous:
+                        check_claim()
+                        previous = key
+                    writer.write(record)
+                    carried += 1
+        carried_over = True
+        commit()
+
+    def report(done, job, result):
+        path, name, stale, input_hash = job
+        _, sentence_count, seconds, latencies, records, cache_stats = result
+        add_cache_stats(total_cache_stats, cache_stats)
+        check_claim()
+        if writer is not None:
+            writer.write_all(records)
+        for pipeline in stale:
+            manifest.record(pipeline, name, path, input_hash, config_hashes[pipeline],
+                            [batch_output_path(output_dir, pipeline, name)], jsonl_path if writer else None)
+        commit()
+        line = f"[{done}/{len(jobs)}] {name}: "
+        if 'sentence' in stale:
+            line += f"{sentence_count} sentences, "
+        line += f"{seconds:.2f}s"
+        if latencies:
+            line += f" | {format_latencies(latencies)}"
+            for pipeline, latency in latencies.items():
+                total_latencies[pipeline] = total_latencies.get(pipeline, 0.0) + latency
+        print(line)
+        return sentence_count
+
+    def report_failure(done, job, error):
+        failures.append((job[0], error))
+        print(f"[{done}/{len(jobs)}] {job[1]}: FAILED ({type(error).__name__})")
+
+    def fan_out_sentences(pool):
+        # Dedup στάδιο: τα αποτελέσματα των μοναδικών προτάσεων γράφονται σε κάθε document, στη σειρά του κειμένου -
+        # κάθε document γράφεται και γίνεται commit μόλις το δώσει το run_sentence_dedup (όχι στο τέλος του σταδίου).
+        # Επιστρέφει τα jobs που μένουν για τα text pipelines.
+        nonlocal dedup_stats, total_sentences
+        sentence_jobs = [job for job in jobs if 'sentence' in job[2]]
+        deduplicator, documents, stats = run_sentence_dedup(
+            [(path, name) for path, name, _, _ in sentence_jobs], pool, writer is not None)
+        for done, (job, document) in enumerate(zip(sentence_jobs, documents), 1):
+            path, name, _, input_hash = job
+            _, ids, corrected, results, error = document
+            if error is not None:
+                failures.append((path, error))
+                print(f"[dedup {done}/{len(sentence_jobs)}] {name}: FAILED ({type(error).__name__})")
+                continue
+            check_claim()
+            output_path = batch_output_path(output_dir, 'sentence', name)
+            save_result("\n".join(corrected), output_path)
+            if writer is not None:
+                # το 'original' κάθε εμφάνισης μένει όπως ήταν στο document (μπορεί να διαφέρει σε κενά)
+                sentences = split_sentences_stream([load_file(path)])
+                writer.write_all(
+                    {'document': name, 'pipeline': 'sentence', 'index': index, **result, 'original': sentence}
+                    for index, (sentence, result) in enumerate(zip(sentences, results))
+                )
+            manifest.record('sentence', name, path, input_hash, config_hashes['sentence'], [output_path],
+                            jsonl_path if writer else None)
+            commit()
+            total_sentences += len(ids)
+            print(f"[dedup {done}/{len(sentence_jobs)}] {name}: {len(ids)} sentences")
+        dedup_stats = format_dedup_stats(deduplicator, stats['seconds'])
+        failed = {path for path, _ in failures}
+        return [
+            (path, name, tuple(pipeline for pipeline in stale if pipeline != 'sentence'), input_hash)
+            for path, name, stale, input_hash in jobs
+            if path not in failed and any(pipeline != 'sentence' for pipeline in stale)
+        ]
+
+    pool = None
+    completed = False
+    try:
+        if jobs and workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                       initargs=(active, transformer_threads, sentence_cache_path, server_path))
+        elif jobs:
+            init_batch_worker(active, transformer_threads, sentence_cache_path, server_path)
+        if writer is not None:
+            carry_records()
+        if dedup and 'sentence' in active:
+            jobs = fan_out_sentences(pool)
+
+        if jobs and pool is None:
+            for done, job in enumerate(jobs, 1):
+                path, name, stale, _ = job
+                check_claim()  # πριν γράψει τις εξόδους του document στο shard
+                try:
+                    result = process_document(path, name, stale, output_dir, concurrent_text, writer is not None)
+                except Exception as e:
+                    report_failure(done, job, e)
+                    continue
+                total_sentences += report(done, job, result)
+        elif jobs:
+            futures = {
+                pool.submit(process_document, path, name, stale, output_dir, concurrent_text, writer is not None):
+                    (path, name, stale, input_hash)
+                for path, name, stale, input_hash in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                # pop: το future (και τα records του) δεν μένει στη μνήμη μέχρι το τέλος του run
+                job = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report_failure(done, job, e)
+                    continue
+                total_sentences += report(done, job, result)
+        check_claim()
+        completed = True
+    finally:
+        if pool is not None:
+            # διακοπή (ή χαμένο claim): τα jobs που δεν ξεκίνησαν ακυρώνονται - αλλιώς οι workers θα συνέχιζαν να
+            # γράφουν εξόδους και sentence cache στο output_dir. Όσα τρέχουν ήδη τελειώνουν.
+            pool.shutdown(cancel_futures=not completed)
+        if writer is not None:
+            # πριν από το manifest: records χωρίς καταχώρηση στο manifest απλώς ξαναγράφονται στο επόμενο run
+            if not completed and claim is not None and claim.lost.is_set():
+                writer.discard()
+            else:
+                writer.close()
+                if completed or (carried_over and not journal):
+                    os.replace(partial_path, jsonl_path)
+        if journal and not completed:
+            # διακοπή: το log (με ό,τι έγινε commit) μένει για το επόμενο run
+            manifest.close_journal()
+        else:
+            # και σε διακοπή χωρίς journal: ό,τι ολοκληρώθηκε δεν ξανατρέχει στο επόμενο run
+            manifest.save()
+
+    elapsed = time.perf_counter() - start
+    failed_documents = len({path for path, _ in failures})
+    print(f"\n{documents - failed_documents}/{documents} documents processed ({len(files) - documents} up to date), "
+          f"{total_sentences} sentences in {elapsed:.2f}s with {workers} worker(s)")
+    if 'sentence' in active and elapsed > 0:
+        print(f"Sentence pipeline throughput: {total_sentences / elapsed:.1f} sentences/s")
+    if dedup_stats:
+        print(f"Sentence dedup: {dedup_stats}")
+    if total_latencies:
+        mode = "concurrent" if concurrent_text else "sequential"
+        print(f"Text pipelines ({mode}, all documents): {format_latencies(total_latencies)}")
+    if format_cache_stats(total_cache_stats):
+        print(f"Sentence cache: {format_cache_stats(total_cache_stats)}")
+    print(f"Results saved in: {output_dir}/")
+    if writer is not None:
+        line = f"{writer.count} structured records written to: {jsonl_path}"
+        if carried:
+            line += f" ({carried} carried over from the previous file)"
+        print(line)
+    return failures
+
+
+# ============================== WORK QUEUE ==============================
+# Πολλά μηχανήματα (ή processes) με κοινό μόνο ένα filesystem:
+#   python main.py corpus/ --queue /shared/q -p all      (σε κάθε κόμβο - ο πρώτος φτιάχνει την ουρά)
+#   python main.py --queue /shared/q --merge -o out      (μία φορά, όταν ολοκληρωθούν όλα τα shards)
+# Κάθε shard τρέχει με το run_batch σε δικό του output φάκελο (shards/<shard>/), με journal, οπότε ένα shard
+# που ξαναμπήκε στην ουρά μετά από crash συνεχίζει από το τελευταίο document. Το sentence cache είναι ανά shard
+# (το SQLite με WAL δεν δουλεύει αξιόπιστα σε network filesystems).
+
+QUEUE_SHARDS_DIR = "shards"
+QUEUE_FAILURES_FILENAME = "failures.json"
+DEFAULT_SHARD_SIZE = 100
+DEFAULT_STALE_AFTER = 600  # δευτερόλεπτα χωρίς heartbeat μέχρι ένα claim να θεωρηθεί ορφανό
+
+
+def shard_output_dir(queue, filename):
+    return os.path.join(queue.directory, QUEUE_SHARDS_DIR, queue.shard_name(filename))
+
+
+def shard_records_path(queue, filename):
+    records = queue.config.get('records')
+    return os.path.join(shard_output_dir(queue, filename), records) if records else None
+
+
+def create_queue(queue, files, pipelines, shard_size=DEFAULT_SHARD_SIZE, jsonl_path=None):
+    # Documents ταξινομημένα κατά όνομα -> shards των shard_size. Με jsonl_path κάθε shard γράφει και records
+    # (συμπιεσμένα αν το jsonl_path τελειώνει σε .gz). Επιστρέφει True αν την ουρά τη δημιούργησε αυτό το process.
+    items = [[os.path.abspath(path), name] for path, name in sorted(files, key=lambda file: file[1])]
+    shards = [items[start:start + shard_size] for start in range(0, len(items), shard_size)]
+    records = None
+    if jsonl_path:
+        records = "records.jsonl.gz" if jsonl_path.endswith('.gz') else "records.jsonl"
+    return queue.create(shards, {'pipelines': list(pipelines), 'records': records})
+
+
+def run_queue_worker(queue, workers=1, concurrent_text=False, transformer_threads=None, sentence_cache=True,
+                     dedup=False, stale_after=DEFAULT_STALE_AFTER, server_path=None):
+    # Παίρνει shards μέχρι να ολοκληρωθεί η ουρά. Όταν δεν μένει pending αλλά άλλοι workers έχουν ακόμα shards,
+    # περιμένει: όσα claims μείνουν stale_after δευτερόλεπτα χωρίς heartbeat (worker που έπεσε) ξαναμπαίνουν
+    # στην ουρά και τα παίρνει. Επιστρέφει (shards που ολοκλήρωσε, failures).
+    pipelines = tuple(queue.config['pipelines'])
+    heartbeat = min(HEARTBEAT_SECONDS, stale_after / 4)
+    completed = 0
+    failures = []
+    waiting = False
+    while True:
+        claimed = queue.claim()
+        if claimed is None:
+            requeued = queue.requeue_stale(stale_after)
+            if requeued:
+                print(f"Requeued {len(requeued)} abandoned shard(s): {', '.join(map(queue.shard_name, requeued))}")
+                continue
+            if not queue.shards('claimed'):
+                break
+            if not waiting:
+                print(f"Waiting for {len(queue.shards('claimed'))} shard(s) claimed by other workers")
+                waiting = True
+            time.sleep(heartbeat)
+            continue
+        waiting = False
+        filename, items = claimed
+        output_dir = shard_output_dir(queue, filename)
+        print(f"\n{worker_id()}: {queue.shard_name(filename)} ({len(items)} documents)")
+        with Heartbeat(queue, filename, interval=heartbeat) as shard_claim:
+            try:
+                shard_failures = run_batch([tuple(item) for item in items], pipelines, output_dir, workers,
+                                           concurrent_text, transformer_threads, False,
+                                           shard_records_path(queue, filename), sentence_cache, dedup, journal=True,
+                                           server_path=server_path, claim=shard_claim)
+            except ClaimLost:
+                # το shard θεωρήθηκε stale και το συνεχίζει άλλος worker από το journal του
+                print(f"{worker_id()}: lost the claim on {queue.shard_name(filename)}, abandoning it")
+                continue
+        save_result(json.dumps([[path, f"{type(error).__name__}: {error}"] for path, error in shard_failures]),
+                    os.path.join(output_dir, QUEUE_FAILURES_FILENAME))
+        failures.extend(shard_failures)
+        if queue.complete(filename):
+            completed += 1
+    return completed, failures
+
+
+def merge_queue(queue, output_dir, jsonl_path=None):
+    # Όλα τα shards (σε σειρά shard και document) -> ίδια δομή με ένα batch run στο output_dir.
+    # Τα records ενός shard ταξινομούνται (document, pipeline, πρόταση), ώστε το JSONL να είναι ίδιο σε κάθε merge
+    # ανεξάρτητα από το ποιος worker / με ποια σειρά τα έγραψε. Στη μνήμη είναι το πολύ τα records ενός shard.
+    # Επιστρέφει τα failures όλων των shards ως [(path, μήνυμα)].
+    counts = queue.counts()
+    if counts['pending'] or counts['claimed']:
+        raise ValueError(f"{counts['pending'] + counts['claimed']} of {queue.config['shards']} shards are not done yet")
+    if jsonl_path and not queue.config.get('records'):
+        raise ValueError("the queue was created without --jsonl, so the shards have no structured records")
+    pipelines = queue.config['pipelines']
+    failures = []
+    documents = 0
+    writer = JsonlWriter(jsonl_path) if jsonl_path else None
+    try:
+        for filename in queue.shards('done'):
+            with open(os.path.join(queue.directory, 'done', filename), 'r', encoding='utf-8') as f:
+                items = json.load(f)
+            shard_dir = shard_output_dir(queue, filename)
+            for _, name in items:
+                for pipeline in pipelines:
+                    source = batch_output_path(shard_dir, pipeline, name)
+                    if os.path.exists(source):  # τα documents που απέτυχαν δεν έχουν έξοδο
+                        target = batch_output_path(output_dir, pipeline, name)
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        shutil.copyfile(source, target)
+            documents += len(items)
+            with open(os.path.join(shard_dir, QUEUE_FAILURES_FILENAME), 'r', encoding='utf-8') as f:
+                failures.extend(tuple(failure) for failure in json.load(f))
+            records_path = shard_records_path(queue, filename)
+            if writer is not None and os.path.exists(records_path):
+                order = {name: position for position, (_, name) in enumerate(items)}
+                with (gzip.open if records_path.endswith('.gz') else open)(records_path, 'rt', encoding='utf-8') as f:
+                    records = [json.loads(line) for line in f]
+                records.sort(key=lambda record: (order[record['document']], BATCH_PIPELINES.index(record['pipeline']),
+                                                 record.get('index', -1)))
+                writer.write_all(records)
+    finally:
+        if writer is not None:
+            writer.close()
+    print(f"Merged {queue.config['shards']} shards ({documents} documents, {len(failures)} failed) into: {output_dir}/")
+    if writer is not None:
+        print(f"{writer.count} structured records written to: {jsonl_path}")
+    return failures
+
+
+def queue_main(args):
+    # --queue: worker (φτιάχνει την ουρά αν δεν υπάρχει) ή --merge
+    queue = WorkQueue(args.queue)
+    if args.merge:
+        if not queue.initialized:
+            print(f"Error: no work queue in {args.queue}", file=sys.stderr)
+            return 2
+        try:
+            failures = merge_queue(queue, args.output_dir, args.jsonl)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        for path, error in failures:
+            print(f"Failed: {path}: {error}", file=sys.stderr)
+        return 1 if failures else 0
+
+    if not queue.initialized:
+        if not args.inputs:
+            print(f"Error: no work queue in {args.queue} - give the input files to create it", file=sys.stderr)
+            return 2
+        try:
+            files = collect_input_files(args.inputs)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        if create_queue(queue, files, args.pipelines, args.shard_size, args.jsonl):
+            print(f"Created work queue {args.queue}: {len(files)} documents in {queue.config['shards']} shards")
+    error = check_model_server(args.server, queue.config['pipelines'])
+    if error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    counts = queue.counts()
+    print(f"Work queue {args.queue}: {counts['pending']} pending, {counts['claimed']} claimed, {counts['done']} done "
+          f"| pipelines: {', '.join(queue.config['pipelines'])} | worker: {worker_id()}")
+    completed, failures = run_queue_worker(queue, args.workers, args.concurrent_text, args.transformer_threads,
+                                           args.sentence_cache, args.dedup, args.stale_after, args.server)
+    print(f"\n{worker_id()}: {completed} shard(s) completed, the queue is done")
+    for path, error in failures:
+        print(f"Failed: {path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+# ============================== MODEL SERVER ==============================
+# Κάθε εκτέλεση του main.py πληρώνει τη φόρτωση των μοντέλων (GloVe, flan-t5, NLTK data) πριν κάνει οτιδήποτε.
+# Ο model server τα φορτώνει μία φορά και μένει ανοιχτός:
+#   python main.py --serve -p all                      (σε ένα terminal)
+#   python main.py corpus/ -p all --server             (οι batch εκτελέσεις στέλνουν τα pipelines στον server)
+# Ταυτόχρονα requests (π.χ. από πολλούς workers) ενώνονται σε micro-batches (model_server.MicroBatcher).
+
+MODEL_SERVER_SOCKET = os.path.join(RESULTS_DIR, "model_server.sock")
+
+
+def model_server_endpoints(pipelines):
+    # pipeline -> batched συνάρτηση (λίστα items -> λίστα outputs) για τον server
+    endpoints = {}
+    for pipeline in pipelines:
+        if pipeline == 'sentence':
+            endpoints[pipeline] = run_sentence_pipeline_batch
+        elif pipeline in TEXT_PIPELINE_BATCH_FUNCTIONS:
+            endpoints[pipeline] = getattr(text_pipeline_module(pipeline), TEXT_PIPELINE_BATCH_FUNCTIONS[pipeline])
+        else:
+            reconstruct = text_pipeline_function(pipeline)
+            endpoints[pipeline] = lambda texts, reconstruct=reconstruct: [reconstruct(text) for text in texts]
+    return endpoints
+
+
+def check_model_server(server_path, pipelines):
+    # --server: σύνδεση στον server -> μήνυμα λάθους ή None (και None χωρίς --server)
+    if not server_path:
+        return None
+    try:
+        endpoints = connect_model_server(server_path)
+    except OSError as e:
+        return f"no model server at {server_path} ({type(e).__name__}) - start one with: python main.py --serve"
+    missing = [pipeline for pipeline in pipelines if pipeline not in endpoints]
+    if missing:
+        return f"the model server at {server_path} does not serve: {', '.join(missing)}"
+    return None
+
+
+def run_model_server(socket_path, pipelines, max_batch, max_wait, transformer_threads=None, sentence_cache=True):
+    # Φορτώνει τα μοντέλα των pipelines και εξυπηρετεί requests μέχρι Ctrl+C / SIGTERM
+    from model_server import serve  # asyncio: μόνο για τον server, όχι στην εκκίνηση του menu
+
+    text_pipelines = [pipeline for pipeline in pipelines if pipeline in TEXT_PIPELINE_MODULES]
+    if 'transformer' in pipelines and transformer_threads is None:
+        # τα endpoints τρέχουν ταυτόχρονα, ένα thread το καθένα
+        transformer_threads = default_transformer_threads(1, len(text_pipelines) - 1)
+    start = time.perf_counter()
+    init_batch_worker(pipelines, transformer_threads, RESULTS_SENTENCE_CACHE if sentence_cache else None)
+    print(f"Models for {', '.join(pipelines)} loaded in {time.perf_counter() - start:.2f}s")
+
+    stats = serve(model_server_endpoints(pipelines), socket_path, max_batch, max_wait, _json_default,
+                  ready=lambda: print(f"Model server listening on {socket_path} "
+                                      f"(micro-batches of up to {max_batch} items, {max_wait * 1000:.0f}ms max wait)"))
+    print(f"\nModel server stopped after {stats['uptime']:.0f}s")
+    for endpoint, endpoint_stats in stats['endpoints'].items():
+        if endpoint_stats['batches']:
+            print(f"  {endpoint}: {endpoint_stats['requests']} requests, {endpoint_stats['items']} items in "
+                  f"{endpoint_stats['batches']} batches ({endpoint_stats['items'] / endpoint_stats['batches']:.1f} "
+                  f"items/batch), {endpoint_stats['seconds']:.2f}s")
+    return 0
+
+
+# ============================== STARTUP BENCHMARK ==============================
+# Κόστος εκκίνησης ανά επιλογή του menu: χρόνος imports και μέγιστη μνήμη (RSS), κάθε επιλογή σε καινούριο interpreter.
+#   python main.py --startup-benchmark
+# Λειτουργεί και ως guard: exit code 1 αν το menu ή το sentence pipeline φορτώνει κάποιο από τα HEAVY_MODULES.
+
+HEAVY_MODULES = ('torch', 'transformers', 'gensim')
+# βιβλιοθήκες που φορτώνει κάθε text pipeline την πρώτη φορά που τρέχει
+TEXT_PIPELINE_DEPENDENCIES = {
+    'textblob': ('textblob',),
+    'embeddings': ('gensim.downloader',),
+    'transformer': ('transformers', 'torch'),
+}
+MENU_OPTION_PIPELINES = {
+    'menu': (),
+    '1': ('sentence',),
+    '2': TEXT_PIPELINES,
+    '3': ('sentence',) + TEXT_PIPELINES,
+    '4': TEXT_PIPELINES,
+}
+# επιλογές που δεν πρέπει να φορτώνουν τα HEAVY_MODULES
+LIGHT_MENU_OPTIONS = ('menu', '1')
+
+_STARTUP_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+import main
+main.import_pipeline_dependencies(main.MENU_OPTION_PIPELINES[sys.argv[1]])
+seconds = time.perf_counter() - start
+try:
+    import resource
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB στο Linux
+except ImportError:
+    rss_mb = None
+print(json.dumps({'seconds': seconds, 'rss_mb': rss_mb, 'heavy': [m for m in main.HEAVY_MODULES if m in sys.modules]}))
+"""
+
+
+def import_pipeline_dependencies(pipelines):
+    # Ό,τι θα φόρτωνε η πρώτη εκτέλεση των pipelines (χωρίς μοντέλα) - τα modules του sentence pipeline είναι ήδη φορτωμένα
+    for pipeline in pipelines:
+        if pipeline in TEXT_PIPELINE_MODULES:
+            text_pipeline_module(pipeline)
+            for dependency in TEXT_PIPELINE_DEPENDENCIES[pipeline]:
+                importlib.import_module(dependency)
+
+
+def measure_startup(option):
+    # Τρέχει το _STARTUP_PROBE σε νέο interpreter -> dict με seconds, rss_mb, heavy (ή error)
+    completed = subprocess.run(
+        [sys.executable, "-c", _STARTUP_PROBE, option],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f"exit code {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_startup_benchmark():
+    # Επιστρέφει exit code: 0 αν καμία από τις LIGHT_MENU_OPTIONS δεν φορτώνει HEAVY_MODULES, αλλιώς 1
+    print(f"{'option':<8}{'pipelines':<46}{'import s':>10}{'max RSS MB':>12}   heavy modules")
+    guard_failures = []
+    for option, pipelines in MENU_OPTION_PIPELINES.items():
+        result = measure_startup(option)
+        label = ', '.join(pipelines) or "(menu only)"
+        if 'error' in result:
+            print(f"{option:<8}{label:<46}   failed: {result['error']}")
+            if option in LIGHT_MENU_OPTIONS:
+                guard_failures.append((option, result['error']))
+            continue
+        rss = f"{result['rss_mb']:.1f}" if result['rss_mb'] is not None else "-"
+        print(f"{option:<8}{label:<46}{result['seconds']:>10.2f}{rss:>12}   {', '.join(result['heavy']) or '-'}")
+        if option in LIGHT_MENU_OPTIONS and result['heavy']:
+            guard_failures.append((option, f"imports {', '.join(result['heavy'])}"))
+
+    for option, problem in guard_failures:
+        print(f"GUARD FAILED: option {option} {problem}", file=sys.stderr)
+    return 1 if guard_failures else 0
+
+
+def parse_batch_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="NLP 2025 pipelines in batch mode. Run without arguments for the interactive menu.",
+    )
+    parser.add_argument('inputs', nargs='*',
+                        help="input files, directories (all *.txt files, recursively) or glob patterns")
+    parser.add_argument('-p', '--pipelines', type=parse_pipelines, default=('sentence',),
+                        help="comma-separated: sentence, textblob, embeddings, transformer, "
+                             "'text' (the three text pipelines) or 'all' (default: sentence)")
+    parser.add_argument('-o', '--output-dir', default=os.path.join(RESULTS_DIR, "batch"),
+                        help="directory for the results (default: %(default)s)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="worker processes; each loads its models once (default: 1)")
+    parser.add_argument('-c', '--concurrent-text', action='store_true',
+                        help="run the selected text pipelines of each document at the same time "
+                             "instead of one after another")
+    parser.add_argument('--transformer-threads', type=int, default=None,
+                        help="torch threads per worker for the transformer pipeline (default: the worker's "
+                             "share of the cores minus one per text pipeline running next to it)")
+    parser.add_argument('--jsonl', metavar='PATH', default=None,
+                        help="also stream full structured results (tokens, tags, noun phrases, SVO, problems fixed, "
+                             "...) as one JSON record per sentence / text pipeline output to PATH; "
+                             "gzip-compressed when PATH ends with .gz")
+    parser.add_argument('--no-sentence-cache', dest='sentence_cache', action='store_false',
+                        help="do not use the per-sentence cache of the text pipelines in the output directory")
+    parser.add_argument('--dedup', action='store_true',
+                        help="run the sentence pipeline once per unique sentence of the whole corpus and copy the "
+                             "result to every repeat (keeps the unique sentences and their results in memory)")
+    parser.add_argument('--journal', action='store_true',
+                        help="commit each finished document to a progress log next to the manifest; after a crash "
+                             "or kill, re-running the same command resumes after the last committed document")
+    parser.add_argument('-f', '--force', action='store_true',
+                        help="recompute every document, even those the manifest in the output directory "
+                             "records as up to date")
+    parser.add_argument('--queue', metavar='DIR', default=None,
+                        help="work-queue mode for several machines sharing a filesystem: the first worker splits "
+                             "the inputs into shards in DIR, every worker claims and processes shards until none "
+                             "are left")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help="documents per shard when creating a queue (default: %(default)s)")
+    parser.add_argument('--stale-after', type=float, default=DEFAULT_STALE_AFTER,
+                        help="seconds without a heartbeat after which a claimed shard is returned to the queue "
+                             "(default: %(default)s)")
+    parser.add_argument('--merge', action='store_true',
+                        help="with --queue: merge the outputs of all shards into --output-dir (and --jsonl)")
+    parser.add_argument('--serve', action='store_true',
+                        help="run the warm-model server for the selected --pipelines on the --server socket "
+                             "until Ctrl+C")
+    parser.add_argument('--server', metavar='SOCKET', nargs='?', const=MODEL_SERVER_SOCKET, default=None,
+                        help="send the pipelines to a running model server instead of loading the models in this "
+                             f"process (default socket: {MODEL_SERVER_SOCKET})")
+    parser.add_argument('--max-batch', type=int, default=32,
+                        help="with --serve: most items (sentences / texts) per micro-batch (default: %(default)s)")
+    parser.add_argument('--max-wait-ms', type=float, default=10.0,
+                        help="with --serve: how long a request waits for others to join its micro-batch "
+                             "(default: %(default)s)")
+    parser.add_argument('--startup-benchmark', action='store_true',
+                        help="measure import time and memory of each menu option and exit; fails if the "
+                             "menu or the sentence pipeline loads torch, transformers or gensim")
+    args = parser.parse_args(argv)
+    if not args.inputs and not (args.startup_benchmark or args.queue or args.serve):
+        parser.error("the following arguments are required: inputs")
+    if args.merge and not args.queue:
+        parser.error("--merge requires --queue")
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+    if args.max_batch < 1:
+        parser.error("--max-batch must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.transformer_threads is not None and args.transformer_threads < 1:
+        parser.error("--transformer-threads must be at least 1")
+    return args
+
+
+def batch_main(argv):
+    # Entry point του batch CLI - επιστρέφει exit code (0: όλα ok, 1: κάποιο document απέτυχε, 2: λάθος είσοδος)
+    args = parse_batch_args(argv)
+    if args.startup_benchmark:
+        return run_startup_benchmark()
+    if args.serve:
+        return run_model_server(args.server or MODEL_SERVER_SOCKET, args.pipelines, args.max_batch,
+                                args.max_wait_ms / 1000, args.transformer_threads, args.sentence_cache)
+    if args.queue:
+        return queue_main(args)
+    try:
+        files = collect_input_files(args.inputs)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    if not files:
+        print("Error: no input files found", file=sys.stderr)
+        return 2
+    error = check_model_server(args.server, args.pipelines)
+    if error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+
+    print(f"{len(files)} documents | pipelines: {', '.join(args.pipelines)} | workers: {args.workers}"
+          + (" | concurrent text pipelines" if args.concurrent_text else "")
+          + (" | sentence dedup" if args.dedup else "")
+          + (f" | model server: {args.server}" if args.server else ""))
+    failures = run_batch(files, args.pipelines, args.output_dir, args.workers,
+                         args.concurrent_text, args.transformer_threads, args.force, args.jsonl,
+                         args.sentence_cache, args.dedup, args.journal, args.server)
+    for path, error in failures:
+        print(f"Failed: {path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+
 # ============================== MENU SYSTEM ==============================
 
 def display_menu():
@@ -239,18 +1553,25 @@ def display_menu():
 
     [3] Run Both Pipelines
 
+    [4] Text Pipelines - concurrent
+          TextBlob | Embeddings | Transformer at the same time for each text
+
     [0] Exit
     """)
     print("=" * 82)
 
     while True:
-        choice = input("\nEnter your choice (0-3): ").strip()
-        if choice in ['0', '1', '2', '3']:
+        choice = input("\nEnter your choice (0-4): ").strip()
+        if choice in ['0', '1', '2', '3', '4']:
             return choice
-        print("Invalid choice. Please enter 0, 1, 2, or 3.")
+        print("Invalid choice. Please enter 0, 1, 2, 3, or 4.")
+
 
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv: # ορίσματα -> batch mode χωρίς menu
+        sys.exit(batch_main(argv))
 
-def main():
     ensure_directories() # Ensure all directories exist
 
     while True:
@@ -285,6 +1606,10 @@ def main():
             print("★" * 82)
             input("\nPress Enter to return to menu...")
 
+        elif choice == '4':
+            run_text_pipeline(concurrent=True)
+            input("\nPress Enter to return to menu...")
+
 
 # ============================== ENTRY POINT ==============================
 
@@ -0,0 +1,69 @@
+# Thin client του model server (model_server.py) - μόνο stdlib, χωρίς μοντέλα
+# Ένα connection ανά thread (και ανά process, όπως το sentence cache): τα text pipelines καλούνται και από
+# threads (run_text_pipelines_concurrent) και από πολλούς workers, και ο server ενώνει όλα αυτά τα requests σε batches.
+import itertools
+import json
+import os
+import socket
+import threading
+
+
+class ModelServerError(RuntimeError):
+    # το endpoint του server απέτυχε (το μήνυμα έχει τον τύπο και το μήνυμα του exception στον server)
+    pass
+
+
+class ModelClient:
+
+    def __init__(self, socket_path, timeout=None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._ids = itertools.count()
+
+    def _connection(self):
+        if os.getpid() != self._pid:
+            # μετά από fork: το socket του parent δεν χρησιμοποιείται στο child
+            self._local = threading.local()
+            self._pid = os.getpid()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            connection = (sock, sock.makefile('rb'))
+            self._local.connection = connection
+        return connection
+
+    def call(self, endpoint, items=()):
+        # items -> outputs του endpoint (ίδια σειρά)
+        sock, reader = self._connection()
+        request = {'id': next(self._ids), 'endpoint': endpoint, 'items': list(items)}
+        try:
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode('utf-8') + b"\n")
+            line = reader.readline()
+        except OSError:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise ConnectionError(f"the model server at {self.socket_path} closed the connection")
+        response = json.loads(line)
+        if 'error' in response:
+            raise ModelServerError(response['error'])
+        return response['outputs']
+
+    def ping(self):
+        # -> τα endpoints του server (ConnectionError / FileNotFoundError αν δεν τρέχει)
+        return self.call('ping')
+
+    def stats(self):
+        return self.call('stats')
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and os.getpid() == self._pid:
+            connection[1].close()
+            connection[0].close()
+        self._local = threading.local()
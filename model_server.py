@@ -0,0 +1,190 @@
+# Τοπικός server που κρατάει τα μοντέλα φορτωμένα (warm) ανάμεσα στις εκτελέσεις του main.py
+# asyncio πάνω σε Unix socket, ένα JSON ανά γραμμή:
+#   request:  {"id": 1, "endpoint": "sentence", "items": [...]}
+#   response: {"id": 1, "outputs": [...]}  ή  {"id": 1, "error": "..."}
+# Τα ταυτόχρονα requests ενός endpoint (από πολλούς clients / workers) ενώνονται σε micro-batches: ένα batch
+# κλείνει όταν φτάσει max_batch items ή όταν περάσει max_wait από το πρώτο request του, και τότε η batched
+# συνάρτηση του endpoint τρέχει σε thread (τα μοντέλα μπλοκάρουν). Ένα request που δεν χωράει στο batch ανοίγει
+# το επόμενο (μόνο ένα request με περισσότερα από max_batch items τρέχει μόνο του σε μεγαλύτερο batch).
+# Όσο τρέχει ένα batch, τα νέα requests μαζεύονται για το επόμενο. Τα endpoints (όνομα -> συνάρτηση λίστας items -> λίστα outputs) τα δίνει η main.
+import asyncio
+import json
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_BATCH = 32
+DEFAULT_MAX_WAIT = 0.01  # δευτερόλεπτα
+# όριο μεγέθους μιας γραμμής (ένα request με ολόκληρο document)
+STREAM_LIMIT = 1 << 26
+
+
+class MicroBatcher:
+
+    def __init__(self, function, executor, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT):
+        self.function = function
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self._held = None  # request που δεν χώρεσε στο προηγούμενο batch - ανοίγει το επόμενο
+        self.stats = {'requests': 0, 'items': 0, 'batches': 0, 'seconds': 0.0}
+
+    async def submit(self, items):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((items, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [self._held if self._held is not None else await self.queue.get()]
+            self._held = None
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                if self.queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    request = self.queue.get_nowait()  # ήδη στην ουρά (π.χ. ήρθε όσο έτρεχε το προηγούμενο batch)
+                if size + len(request[0]) > self.max_batch:
+                    self._held = request
+                    break
+                batch.append(request)
+                size += len(request[0])
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch):
+        items = [item for request_items, _ in batch for item in request_items]
+        start = time.perf_counter()
+        try:
+            outputs = await asyncio.get_running_loop().run_in_executor(self.executor, self.function, items)
+            if len(outputs) != len(items):
+                # αλλιώς κάθε request θα έπαιρνε outputs άλλων requests
+                raise ValueError(f"{len(outputs)} outputs for {len(items)} items")
+        except Exception as e:
+            if len(batch) > 1:
+                # ένα request χάλασε το batch: κάθε request ξανατρέχει μόνο του, ώστε να αποτύχει μόνο αυτό
+                for request in batch:
+                    await self._run_batch([request])
+            elif not batch[0][1].done():
+                batch[0][1].set_exception(e)
+            return
+        self.stats['requests'] += len(batch)
+        self.stats['items'] += len(items)
+        self.stats['batches'] += 1
+        self.stats['seconds'] += time.perf_counter() - start
+        offset = 0
+        for request_items, future in batch:
+            if not future.done():  # ο client μπορεί να έχει αποσυνδεθεί
+                future.set_result(outputs[offset:offset + len(request_items)])
+            offset += len(request_items)
+
+
+class ModelServer:
+
+    def __init__(self, endpoints, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT, json_default=None):
+        # ένα thread ανά endpoint: διαφορετικά pipelines τρέχουν ταυτόχρονα, το καθένα ένα batch τη φορά
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(endpoints)), thread_name_prefix="model-server")
+        self.batchers = {name: MicroBatcher(function, self.executor, max_batch, max_wait)
+                         for name, function in endpoints.items()}
+        self.json_default = json_default
+        self.started = time.time()
+
+    def stats(self):
+        return {'uptime': time.time() - self.started,
+                'endpoints': {name: dict(batcher.stats) for name, batcher in self.batchers.items()}}
+
+    async def _respond(self, request, writer, lock):
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if isinstance(request, ValueError):
+                raise ValueError(f"invalid request: {request}")
+            endpoint = request['endpoint']
+            if endpoint == 'ping':
+                outputs = list(self.batchers)
+            elif endpoint == 'stats':
+                outputs = self.stats()
+            elif endpoint in self.batchers:
+                outputs = await self.batchers[endpoint].submit(list(request['items']))
+            else:
+                raise KeyError(f"unknown endpoint {endpoint!r} (available: {', '.join(self.batchers)})")
+            response = {'id': request_id, 'outputs': outputs}
+        except Exception as e:
+            response = {'id': request_id, 'error': f"{type(e).__name__}: {e}"}
+        data = json.dumps(response, ensure_ascii=False, default=self.json_default).encode('utf-8') + b"\n"
+        async with lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def handle(self, reader, writer):
+        # Ένα connection: κάθε request τρέχει ως ξεχωριστό task, οπότε ένας client μπορεί να στείλει πολλά
+        # requests χωρίς να περιμένει (οι απαντήσεις ξεχωρίζουν από το id)
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    request = e
+                task = asyncio.create_task(self._respond(request, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path, ready=None):
+        for batcher in self.batchers.values():
+            asyncio.create_task(batcher.run())
+        server = await asyncio.start_unix_server(self.handle, path=socket_path, limit=STREAM_LIMIT)
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        if ready is not None:
+            ready()
+        async with server:
+            await stop.wait()
+
+
+def server_running(socket_path):
+    if not os.path.exists(socket_path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+            return True
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+
+
+def serve(endpoints, socket_path, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT, json_default=None,
+          ready=None):
+    # Τρέχει μέχρι Ctrl+C / SIGTERM. Ένα socket αρχείο που έμεινε από server που έπεσε αντικαθίσταται.
+    if server_running(socket_path):
+        raise RuntimeError(f"a model server is already listening on {socket_path}")
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    if os.path.dirname(socket_path):
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    server = ModelServer(endpoints, max_batch, max_wait, json_default)
+    try:
+        asyncio.run(server.serve(socket_path, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=False, cancel_futures=True)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+    return server.stats()
@@ -0,0 +1,187 @@
+# Manifest των αποτελεσμάτων για επανεκτελέσεις
+# Για κάθε (pipeline, input) κρατάει το hash του περιεχομένου της εισόδου, το hash της έκδοσης/ρυθμίσεων
+# του pipeline και τα αρχεία εξόδου. Σε νέα εκτέλεση ό,τι έχει ίδια είσοδο, ίδιο pipeline και υπάρχουσες
+# εξόδους παραλείπεται - ξαναϋπολογίζεται μόνο ό,τι άλλαξε.
+# Το manifest αποθηκεύεται ως JSON μέσα στον φάκελο των αποτελεσμάτων, με σχετικά paths για τις εξόδους.
+# Journal (για μεγάλα runs): κάθε ολοκληρωμένο document γράφεται αμέσως ως μία γραμμή σε append-only log δίπλα
+# στο manifest. Μετά από crash / kill το επόμενο run διαβάζει το log και συνεχίζει από το τελευταίο commit.
+# Το save ενσωματώνει το log στο manifest και το σβήνει.
+import hashlib
+import json
+import os
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_sources(paths, settings=()):
+    # Hash έκδοσης ενός pipeline: ο κώδικάς του (αρχεία .py) + ρυθμίσεις που δεν είναι μέσα στον κώδικα
+    digest = hashlib.sha256()
+    for setting in settings:
+        digest.update(repr(setting).encode('utf-8') + b'\0')
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class ResultManifest:
+
+    def __init__(self, path, journal=False):
+        # journal: κάθε commit() γράφει τα records από το τελευταίο commit στο log (αλλιώς μόνο το save τα γράφει)
+        self.path = path
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self.journal_path = os.path.splitext(path)[0] + ".journal"
+        self.journal = journal
+        self.inputs = {}   # abspath εισόδου -> {'size', 'mtime_ns', 'hash'}
+        self.results = {}  # "pipeline:name" -> {'input', 'input_hash', 'config_hash', 'outputs'[, 'records']}
+        self.resumed = set()  # keys που ολοκληρώθηκαν σε διακοπτόμενο run (από το log)
+        self.checkpoint = {}  # επιπλέον κατάσταση του τελευταίου commit (π.χ. offset του JSONL)
+        self._pending = {}
+        self._journal_file = None
+        self._journal_end = 0  # τέλος της τελευταίας πλήρους γραμμής του log
+        if os.path.exists(path):
+            self.load()
+        if os.path.exists(self.journal_path):
+            self.replay_journal()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # χαλασμένο manifest: όλα θεωρούνται αλλαγμένα και το αρχείο ξαναγράφεται στο save
+            print(f"Warning: ignoring unreadable manifest {self.path} ({type(e).__name__})")
+            return self
+        if data.get('version') == MANIFEST_VERSION:
+            self.inputs = data.get('inputs', {})
+            self.results = data.get('results', {})
+        return self
+
+    def replay_journal(self):
+        # Ένα διακοπτόμενο run άφησε log: τα commits του προστίθενται στο manifest. Η τελευταία γραμμή μπορεί
+        # να είναι μισή (kill την ώρα του write) - αγνοείται και το document της ξανατρέχει.
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    commit = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    commit = None
+                if commit is None:
+                    break
+                self.inputs.update(commit['inputs'])
+                self.results.update(commit['results'])
+                self.resumed.update(commit['results'])
+                self.checkpoint = commit.get('checkpoint', {})
+                self._journal_end += len(line)
+        return self
+
+    def commit(self, checkpoint=None):
+        # Ό,τι καταγράφηκε από το τελευταίο commit -> μία γραμμή στο log, στον δίσκο (fsync) πριν επιστρέψει.
+        # Καλείται αφού γραφτούν οι έξοδοι του document, οπότε ό,τι είναι στο log υπάρχει και στον δίσκο.
+        if not self.journal or not (self._pending or checkpoint):
+            return
+        if self._journal_file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            if os.path.exists(self.journal_path):
+                os.truncate(self.journal_path, self._journal_end)  # χωρίς τη μισή γραμμή ενός crash
+            self._journal_file = open(self.journal_path, 'ab')
+        inputs = {entry['input']: self.inputs[entry['input']] for entry in self._pending.values()
+                  if entry['input'] in self.inputs}
+        line = json.dumps({'inputs': inputs, 'results': self._pending, 'checkpoint': checkpoint or {}},
+                          sort_keys=True)
+        self._journal_file.write(line.encode('utf-8') + b"\n")
+        self._journal_file.flush()
+        os.fsync(self._journal_file.fileno())
+        self._pending = {}
+
+    def close_journal(self):
+        # διακοπή: το log μένει για το επόμενο run (ό,τι δεν έγινε commit δεν καταγράφεται)
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        self._pending = {}
+
+    def save(self):
+        # write σε προσωρινό αρχείο + os.replace, ώστε ένα διακοπτόμενο run να μην αφήνει μισό manifest
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'inputs': self.inputs, 'results': self.results},
+                      f, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+        # το log έχει πλέον ενσωματωθεί (αν σβηστεί πριν χαθεί, το replay του είναι idempotent)
+        self.close_journal()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_end = 0
+        self.resumed = set()
+        self.checkpoint = {}
+
+    def input_hash(self, path):
+        # Hash περιεχομένου - αν size και mtime δεν άλλαξαν από το προηγούμενο run, δεν ξαναδιαβάζεται το αρχείο
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        cached = self.inputs.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['hash']
+        digest = hash_file(path)
+        self.inputs[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': digest}
+        return digest
+
+    def _output_path(self, relative):
+        return os.path.join(self.directory, relative)
+
+    def is_up_to_date(self, pipeline, name, input_hash, config_hash):
+        entry = self.results.get(f"{pipeline}:{name}")
+        return (
+            entry is not None
+            and entry['input_hash'] == input_hash
+            and entry['config_hash'] == config_hash
+            and all(os.path.exists(self._output_path(output)) for output in entry['outputs'])
+        )
+
+    def outputs(self, pipeline, name):
+        entry = self.results.get(f"{pipeline}:{name}")
+        return [self._output_path(output) for output in entry['outputs']] if entry else []
+
+    def has_records(self, pipeline, name, records_path):
+        # τα structured records αυτής της έκδοσης γράφτηκαν στο records_path (JSONL του batch run)
+        entry = self.results.get(f"{pipeline}:{name}")
+        return entry is not None and entry.get('records') == self._relative(records_path)
+
+    def forget_records(self, keys):
+        # τα records αυτών των keys χάθηκαν (π.χ. το JSONL ενός διακοπτόμενου run δεν συνεχίζεται)
+        for key in keys:
+            if key in self.results:
+                self.results[key].pop('records', None)
+
+    def was_resumed(self, pipeline, name):
+        # ολοκληρώθηκε σε προηγούμενο, διακοπτόμενο run αυτού του job (ισχύει και με force)
+        return f"{pipeline}:{name}" in self.resumed
+
+    def _relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.directory)
+
+    def record(self, pipeline, name, input_path, input_hash, config_hash, outputs, records=None):
+        # records: το JSONL όπου γράφτηκαν τα structured records του αποτελέσματος (None: δεν γράφτηκαν)
+        key = f"{pipeline}:{name}"
+        self.results[key] = {
+            'input': os.path.abspath(input_path),
+            'input_hash': input_hash,
+            'config_hash': config_hash,
+            'outputs': [self._relative(output) for output in outputs],
+        }
+        if records:
+            self.results[key]['records'] = self._relative(records)
+        if self.journal:
+            self._pending[key] = self.results[key]
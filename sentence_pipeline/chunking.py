@@ -0,0 +1,102 @@
+# Chunking με compiled regex πάνω σε κωδικοποιημένα POS tags
+# Κάθε Penn tag γίνεται ένας χαρακτήρας, η πρόταση γίνεται ένα string και τα patterns των noun phrases
+# και verb groups τρέχουν ως regex - ένα scan ανά πρόταση αντί για while-loops με συγκρίσεις λιστών.
+# Δίνει ακριβώς τα ίδια spans με τα identify_noun_phrases / find_verb_groups.
+import re
+
+# βοηθητικά ρήματα
+AUXILIARY_VERBS = {
+    'be', 'am', 'is', 'are', 'was', 'were', 'been', 'being',
+    'have', 'has', 'had', 'having',
+    'do', 'does', 'did', 'doing',
+    'will', 'would', 'shall', 'should', 'may', 'might', 'must',
+    'can', 'could', 'ought'
+}
+
+# ============== TAG ENCODING ==============
+
+# Penn Treebank tag -> ένας χαρακτήρας
+TAG_CODES = {
+    'CC': 'a', 'CD': 'c', 'DT': 'd', 'EX': 'e', 'FW': 'f', 'IN': 'i',
+    'JJ': 'j', 'JJR': 'k', 'JJS': 'l', 'LS': 'h', 'MD': 'm',
+    'NN': 'n', 'NNS': 's', 'NNP': 'p', 'NNPS': 'q', 'PDT': 't', 'POS': 'o',
+    'PRP': 'r', 'PRP$': 'u', 'RB': 'w', 'RBR': 'x', 'RBS': 'y', 'RP': 'g', 'SYM': 'z',
+    'TO': '2', 'UH': '3', 'WDT': '4', 'WP': '5', 'WP$': '6', 'WRB': '7',
+    ',': ',', '.': '.', ':': ':', '$': '$', '#': '#', '``': '`', "''": '"', '(': '(', ')': ')',
+}
+# Τα VB* παίρνουν δύο κωδικούς: ένα για κύριο ρήμα και ένα όταν η λέξη είναι βοηθητικό ρήμα,
+# γιατί τα verb groups εξαρτώνται και από τη λέξη, όχι μόνο από το tag
+VERB_CODES = {'VB': 'b', 'VBD': 'D', 'VBG': 'G', 'VBN': 'N', 'VBP': 'P', 'VBZ': 'Z'}
+AUXILIARY_VERB_CODES = {'VB': 'B', 'VBD': 'E', 'VBG': 'H', 'VBN': 'I', 'VBP': 'J', 'VBZ': 'K'}
+UNKNOWN_CODE = '?'  # tags εκτός Penn (π.χ. από άλλο tagger)
+
+# character classes για τα patterns
+_DETERMINER = '[du]'         # DT, PRP$
+_PRONOUN = 'r'               # PRP
+_ADJECTIVE = '[jkl]'         # JJ, JJR, JJS
+_NOUN = '[nspq]'             # NN, NNS, NNP, NNPS
+_MAIN_VERB = '[bDGNPZ]'      # VB* με κύριο ρήμα
+_AUX_VERB = '[BEHIJK]'       # VB* με βοηθητικό ρήμα
+_MODAL_OR_AUX = '[mBEHIJK]'  # MD ή βοηθητικό ρήμα
+_PARTICLE = 'g'              # RP
+
+# NP: PRP μόνο του | (DT|PRP$)? JJ* NN
+NOUN_PHRASE_PATTERN = re.compile(f'{_PRONOUN}|{_DETERMINER}?{_ADJECTIVE}*{_NOUN}')
+# Verb group: (MD|AUX) VB RP? | (MD|AUX) μόνο του | VB RP?
+# Το is_main κρίνεται από το αν υπάρχει το group 'main' (κύριο ρήμα μετά από aux) ή 'lone' (κύριο ρήμα χωρίς aux)
+VERB_GROUP_PATTERN = re.compile(
+    f'{_MODAL_OR_AUX}(?:(?P<main>{_MAIN_VERB})|{_AUX_VERB}){_PARTICLE}?'
+    f'|{_MODAL_OR_AUX}'
+    f'|(?P<lone>{_MAIN_VERB}){_PARTICLE}?'
+)
+
+
+def _verb_code(token, tag):
+    # VB* (και μη τυπικά VB* tags, που μετράνε ως VB όπως στο find_verb_groups) ή άγνωστο tag
+    if not tag.startswith('VB'):
+        return UNKNOWN_CODE
+    if token.lower() in AUXILIARY_VERBS:
+        return AUXILIARY_VERB_CODES.get(tag, 'B')
+    return VERB_CODES.get(tag, 'b')
+
+
+def encode_tags(pos_tags):
+    # [(token, tag), ...] -> string με έναν χαρακτήρα ανά token
+    if hasattr(pos_tags, 'encoded'):
+        # TaggedSentence (sentence_pipeline/tagged_sentence.py): vectorized από τα tag IDs
+        return pos_tags.encoded()
+    get_code = TAG_CODES.get
+    return ''.join([get_code(tag) or _verb_code(token, tag) for token, tag in pos_tags])
+
+
+# ============== CHUNKING ==============
+
+def _token_list(pos_tags):
+    if hasattr(pos_tags, 'tokens'):
+        return pos_tags.tokens()  # TaggedSentence
+    return [token for token, _ in pos_tags]
+
+
+def chunk_noun_phrases(pos_tags, encoded=None):
+    # Ίδιο με identify_noun_phrases: List[Tuple[start_idx, end_idx, tokens]]
+    if encoded is None:
+        encoded = encode_tags(pos_tags)
+    tokens = _token_list(pos_tags)
+    noun_phrases = []
+    for match in NOUN_PHRASE_PATTERN.finditer(encoded):
+        start, end = match.span()
+        noun_phrases.append((start, end, tokens[start:end]))
+    return noun_phrases
+
+
+def chunk_verb_groups(pos_tags, encoded=None):
+    # Ίδιο με find_verb_groups: List of (start_idx, end_idx, tokens, is_main_verb)
+    if encoded is None:
+        encoded = encode_tags(pos_tags)
+    tokens = _token_list(pos_tags)
+    verb_groups = []
+    for match in VERB_GROUP_PATTERN.finditer(encoded):
+        start, end = match.span()
+        is_main = match.group('main') is not None or match.group('lone') is not None
+        verb_groups.append((start, end, tokens[start:end], is_main))
+    return verb_groups
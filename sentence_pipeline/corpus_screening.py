@@ -0,0 +1,86 @@
+# Έλεγχος κανόνων σε επίπεδο corpus
+# Τα tag IDs όλων των προτάσεων μπαίνουν σε έναν πίνακα (pack_tag_matrix) και κάθε pattern
+# ελέγχεται με μετατοπισμένες συγκρίσεις πάνω σε ολόκληρο τον πίνακα, όχι πρόταση-πρόταση σε Python.
+# Το αποτέλεσμα είναι ένα flag ανά πρόταση: False σημαίνει ότι ο αντίστοιχος Python κανόνας σίγουρα
+# δεν βρίσκει/αλλάζει τίποτα, οπότε τα pipelines τον παραλείπουν. True σημαίνει "ίσως" - η πρόταση
+# περνάει από τον κανονικό κώδικα (ο έλεγχος είναι υπερσύνολο, ποτέ δεν χάνει περίπτωση).
+import numpy as np
+
+from sentence_pipeline.tagged_sentence import ADJECTIVE_TAGS, NOUN_TAGS, TAG_VOCABULARY, pack_tag_matrix
+
+SUBJECT_TAGS = NOUN_TAGS | {'PRP'}
+START_MODIFIER_TAGS = {'JJ', 'RB', 'RBR', 'RBS'}
+
+# ίδιες κατηγορίες χρόνου με το get_main_verb_tense του grammatical_correction4
+TENSE_CLASSES = {'VBD': 1, 'VBZ': 2, 'VBP': 2, 'VBG': 2, 'VB': 3}
+
+# προτάσεις ανά block - ταξινομημένες κατά μήκος, ώστε το padding κάθε block να είναι μικρό
+BLOCK_SIZE = 4096
+
+
+def _shift_right(mask, k):
+    # shifted[:, i] = mask[:, i-k] (False για i < k)
+    shifted = np.zeros_like(mask)
+    if k < mask.shape[1]:
+        shifted[:, k:] = mask[:, :-k]
+    return shifted
+
+
+def _screen(pos_tags_list, check_block, pad_columns, vocabulary=TAG_VOCABULARY):
+    # Τρέχει το check_block(matrix, lengths) -> bool ανά γραμμή σε blocks παρόμοιου μήκους
+    # και επιστρέφει τα flags στη σειρά εισόδου
+    flags = np.zeros(len(pos_tags_list), dtype=bool)
+    order = sorted(range(len(pos_tags_list)), key=lambda i: len(pos_tags_list[i]))
+    for block_start in range(0, len(order), BLOCK_SIZE):
+        block = order[block_start:block_start + BLOCK_SIZE]
+        matrix, lengths = pack_tag_matrix([pos_tags_list[i] for i in block], vocabulary, pad_columns)
+        flags[block] = check_block(matrix, lengths, vocabulary)
+    return flags
+
+
+# ============== detect_and_fix_problems ==============
+
+def _structural_problems_block(matrix, lengths, vocabulary):
+    is_in = vocabulary.table(lambda tag: tag == 'IN')[matrix]
+    is_adj = vocabulary.table(lambda tag: tag in ADJECTIVE_TAGS)[matrix]
+    is_noun = vocabulary.table(lambda tag: tag in NOUN_TAGS)[matrix]
+    is_subject = vocabulary.table(lambda tag: tag in SUBJECT_TAGS)[matrix]
+    # κάθε verb group ξεκινάει από MD ή VB*
+    is_verb_start = vocabulary.table(lambda tag: tag == 'MD' or tag.startswith('VB'))[matrix]
+    is_start_modifier = vocabulary.table(lambda tag: tag in START_MODIFIER_TAGS)[matrix]
+
+    # Problem 1: IN, JJ*, χωρίς NN στο i+2 (το padding μετράει ως "όχι NN")
+    problem_1 = (is_in[:, :-2] & is_adj[:, 1:-1] & ~is_noun[:, 2:]).any(axis=1)
+
+    # Problem 2: ρήμα σε θέση > 0 χωρίς NN/PRP στα 3 προηγούμενα tokens
+    # (υπερσύνολο: όλα τα MD/VB* αντί μόνο για αρχές main verb groups)
+    subject_before = _shift_right(is_subject, 1) | _shift_right(is_subject, 2) | _shift_right(is_subject, 3)
+    problem_2 = (is_verb_start & ~subject_before)[:, 1:].any(axis=1)
+
+    # Problem 3: JJ/RB στην αρχή χωρίς NN/PRP αμέσως μετά (ή πρόταση < 3 tokens)
+    problem_3 = is_start_modifier[:, 0] & ((lengths < 3) | ~is_subject[:, 1])
+
+    return problem_1 | problem_2 | problem_3
+
+
+def flag_structural_problems(pos_tags_list, vocabulary=TAG_VOCABULARY):
+    # Για κάθε πρόταση: True αν το detect_and_fix_problems μπορεί να βρει πρόβλημα.
+    # False -> το detect_and_fix_problems θα επέστρεφε (list(pos_tags), [])
+    return _screen(pos_tags_list, _structural_problems_block, pad_columns=2, vocabulary=vocabulary)
+
+
+# ============== apply_morphological_consistency ==============
+
+def _tense_conflicts_block(matrix, lengths, vocabulary):
+    tense = vocabulary.table(lambda tag: TENSE_CLASSES.get(tag, 0), dtype=np.int8)[matrix]
+    has_tense = tense > 0
+    # χρόνος του πρώτου ρήματος με γνωστό χρόνο (όπως το get_main_verb_tense)
+    first = has_tense.argmax(axis=1)
+    main_tense = tense[np.arange(len(tense)), first]
+    return (has_tense & (tense != main_tense[:, None])).any(axis=1)
+
+
+def flag_tense_conflicts(pos_tags_list, vocabulary=TAG_VOCABULARY):
+    # Για κάθε πρόταση: True αν υπάρχει ρήμα με διαφορετικό χρόνο από το κύριο ρήμα,
+    # δηλαδή αν το apply_morphological_consistency μπορεί να αλλάξει κάτι
+    return _screen(pos_tags_list, _tense_conflicts_block, pad_columns=1, vocabulary=vocabulary)
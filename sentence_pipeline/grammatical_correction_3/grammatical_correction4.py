@@ -1,139 +1,121 @@
 import re
 
+from sentence_pipeline.chunking import chunk_noun_phrases
+from sentence_pipeline.corpus_screening import flag_tense_conflicts
+from sentence_pipeline.grammatical_correction_3.rule_engine import Rule, RuleSet, TokenList, TokenPattern
+from sentence_pipeline.grammatical_correction_3.spelling_dictionary import SpellingDictionary
+from sentence_pipeline.grammatical_correction_3.token_edits import TokenEdits
+from sentence_pipeline.tagged_sentence import ADJECTIVE_TAGS, NOUN_TAGS
+
 # ============================== STEP 1: SPELLING CORRECTION ==============================
 
-def apply_spelling_correction(text):
+# Dictionary με κοινά ορθογραφικά → σωστές φόρμες (έχει μόνο πολύ συνηθισμένα λάθη)
+# Μεγαλύτερες λίστες φορτώνονται από αρχείο με τη load_spelling_dictionary
+SPELLING_CORRECTIONS = {
+    # συχνά typos
+    'recieve': 'receive',
+    'occured': 'occurred',
+    'seperate': 'separate',
+    'definately': 'definitely',
+    'wierd': 'weird',
+    'neccessary': 'necessary',
+    'occasion': 'occasion',
+    'publically': 'publicly',
+    'thier': 'their',
+    'beleive': 'believe',
+    'beggining': 'beginning',
+    'commited': 'committed',
+    'existance': 'existence',
+    'consious': 'conscious',
+    'fourty': 'forty',
+    'untill': 'until',
+    
+    # συντομεύσεις χωρίς απόστροφο
+    'cant': "can't",
+    'dont': "don't",
+    'didnt': "didn't",
+    'isnt': "isn't",
+    'arent': "aren't",
+    'wasnt': "wasn't",
+    'werent': "weren't",
+    'hasnt': "hasn't",
+    'havent': "haven't",
+    'hadnt': "hadn't",
+    'wont': "won't",
+    'wouldnt': "wouldn't",
+    'shouldnt': "shouldn't",
+    'couldnt': "couldn't",
+    
+    # πιο συγκεκριμένα
+    'alot': 'a lot',
+    'their are': 'there are',
+    'your welcome': "you're welcome",
+}
+
+_spelling_dictionary = None
+
+
+def get_spelling_dictionary():
+    # Το dictionary χτίζεται μία φορά (όχι σε κάθε κλήση) και μοιράζεται από όλες τις διορθώσεις
+    global _spelling_dictionary
+    if _spelling_dictionary is None:
+        _spelling_dictionary = SpellingDictionary(SPELLING_CORRECTIONS)
+    return _spelling_dictionary
+
+
+def load_spelling_dictionary(path, encoding='utf-8'):
+    # Προσθήκη εγγραφών από αρχείο ("misspelling<TAB>correction" ή "misspelling->correction")
+    # στο κοινό dictionary - οι εγγραφές του αρχείου υπερισχύουν των ενσωματωμένων
+    return get_spelling_dictionary().load(path, encoding)
+
+
+def apply_spelling_correction(text, dictionary=None):
     # απλή ορθογραφική διόρθωση με χρήση dictionary.
-    # αντικατάσταση από προκαθορισμένο dictionary
-    
-    # Dictionary με κοινά ορθογραφικά → σωστές φόρμες (έχει μόνο πολύ συνηθισμένα λάθη)
-    spelling_corrections = {
-        # συχνά typos
-        r'\brecieve\b': 'receive',
-        r'\boccured\b': 'occurred',
-        r'\bseperate\b': 'separate',
-        r'\bdefinately\b': 'definitely',
-        r'\bwierd\b': 'weird',
-        r'\bneccessary\b': 'necessary',
-        r'\boccasion\b': 'occasion',
-        r'\bpublically\b': 'publicly',
-        r'\bthier\b': 'their',
-        r'\bbeleive\b': 'believe',
-        r'\bbeggining\b': 'beginning',
-        r'\bcommited\b': 'committed',
-        r'\bexistance\b': 'existence',
-        r'\bconsious\b': 'conscious',
-        r'\bfourty\b': 'forty',
-        r'\buntill\b': 'until',
-        
-        # συντομεύσεις χωρίς απόστροφο
-        r'\bcant\b': "can't",
-        r'\bdont\b': "don't",
-        r'\bdidnt\b': "didn't",
-        r'\bisnt\b': "isn't",
-        r'\barent\b': "aren't",
-        r'\bwasnt\b': "wasn't",
-        r'\bwerent\b': "weren't",
-        r'\bhasnt\b': "hasn't",
-        r'\bhavent\b': "haven't",
-        r'\bhadnt\b': "hadn't",
-        r'\bwont\b': "won't",
-        r'\bwouldnt\b': "wouldn't",
-        r'\bshouldnt\b': "shouldn't",
-        r'\bcouldnt\b': "couldn't",
-        
-        # πιο συγκεκριμένα
-        r'\balot\b': 'a lot',
-        r'\btheir are\b': 'there are',
-        r'\byour welcome\b': "you're welcome",
-    }
-    
-    corrected_text = text
-    for pattern, replacement in spelling_corrections.items():
-        corrected_text = re.sub(pattern, replacement, corrected_text, flags=re.IGNORECASE)
-    
-    return corrected_text
+    # αντικατάσταση από προκαθορισμένο dictionary - ένα πέρασμα πάνω στις λέξεις του κειμένου,
+    # διατηρεί κεφαλαία (Recieve -> Receive, DONT -> DON'T)
+    if dictionary is None:
+        dictionary = get_spelling_dictionary()
+    return dictionary.correct(text)
 
 # ============================== STEP 2: SURFACE GRAMMAR RULES ==============================
 
-def apply_surface_grammar_rules(text, pos_tags):
+# Οι κανόνες 1-7 δηλωμένοι ως patterns (rule_engine.py): ένα scan ανά πρόταση, με τη σειρά τους ως προτεραιότητα
+SURFACE_GRAMMAR_RULES = RuleSet([
+    # Rule 1: αφαίρεση διπλών προσδιορισμών (the the, a a) - φεύγει ο πρώτος
+    Rule('duplicate_determiner',
+         [TokenPattern(tags={'DT'}), TokenPattern(tags={'DT'}, same_word_as=0)], 'trim', keep=1),
+    # Rule 2: αφαίρεση "ορφανών" επιθέτων στο τέλος (επίθετο που δεν ακολουθείται από ουσιαστικό)
+    Rule('trailing_adjective', [TokenPattern(tags=ADJECTIVE_TAGS)], 'drop', at_end=True),
+    # Rule 3: επιφανειακός έλεγχος για διπλότυπες λέξεις -> διατήρηση μιας
+    Rule('repeated_word', [TokenPattern(), TokenPattern(same_word_as=0)], 'keep_first'),
+    # Rule 4: αφαίρεση ορφανών προσδιοριστών στο τέλος
+    Rule('trailing_determiner', [TokenPattern(tags={'DT'})], 'drop', at_end=True),
+    # Rule 5: αφαίρεση υπερβολικών διαδοχικών επιθέτων (σφάλμα ανακατασκευής) - αν >3, κράτα 2
+    Rule('adjective_run', [TokenPattern(tags=ADJECTIVE_TAGS, min_count=4, max_count=None)], 'trim', keep=2),
+    # Rule 6: Remove orphan prepositions at end
+    Rule('trailing_preposition', [TokenPattern(tags={'IN'})], 'drop', at_end=True),
+    # Rule 7: Remove consecutive prepositions (in to with → keep first)
+    Rule('double_preposition', [TokenPattern(tags={'IN'}), TokenPattern(tags={'IN'})], 'keep_first'),
+])
+
+
+def apply_surface_grammar_rules(text, pos_tags, rules=SURFACE_GRAMMAR_RULES):
     # Επιφανειακοί γραμματικοί κανόνες
     # χρήση POS tags για αφαίρεση επιθέτων, καθαρισμό διπλών προσδιοριστικών, επαναλαμβανόμενων tokens
     # Δεν δημιουργούνται νέες ετικέτες, εφαρμόζονται οι κανόνες μόνο αν POS tags παρέχονται από προηγούμενο στάδιο επεξεργασίας
     # Δεν έχουμε: Deep syntax, dependency parsing, subject-verb agreement, POS generation
     # Δέχεται κείμενο και POS tags από προηγούμενη επεξεργασία και το επιστρέφει καθαρισμένο
+    # rules: RuleSet με τους κανόνες (default οι Rules 1-7 του SURFACE_GRAMMAR_RULES)
     # Πληροφορίες: Natural Language Processing Recipes - Chapter 4 (Grammatical Normalization)    
     
     # Αν δεν υπάρχουν POS tags, χρησιμοποίησε μόνο καθαρισμένο σε επίπεδο συμβολοσειράς
     if pos_tags is None or len(pos_tags) == 0:
         return apply_string_level_cleanup(text)
     
-    tokens = pos_tags
-    cleaned_tokens = []
-    i = 0
-    
-    while i < len(tokens):
-        word, pos = tokens[i]
-        
-        # Rule 1: αφαίρεση διπλών προσδιορισμών (the the, a a)
-        if pos == 'DT' and i + 1 < len(tokens):
-            next_word, next_pos = tokens[i + 1]
-            if next_pos == 'DT' and word.lower() == next_word.lower():
-                # παράλειψη διπλότυπου προσδιοριστή
-                i += 1
-                continue
-        
-        # Rule 2: αφαίρεση "ορφανών" επιθέτων στο τέλος (επίθετο που δεν ακολουθείται από ουσιαστικό)
-        if pos in ['JJ', 'JJR', 'JJS'] and i == len(tokens) - 1:
-            i += 1 # τελευταία λέξη επίθετο -> αφαίρεση
-            continue
-        
-        # Rule 3: επιφανειακός έλεγχος για διπλότυπες λέξεις
-        if i + 1 < len(tokens):
-            next_word, _ = tokens[i + 1]
-            if word.lower() == next_word.lower():
-                cleaned_tokens.append(word) # Διπλύτυπη λέξη -> διατήρηση μιας
-                i += 2
-                continue
-        
-        # Rule 4: αφαίρεση ορφανών προσδιοριστών στο τέλος
-        if pos == 'DT' and i == len(tokens) - 1:
-            i += 1 # προσδιοριστική τελευταία λέξη -> αφαίρεση
-            continue
-        
-        # Rule 5: αφαίρεση υπερβολικών διαδοχικών επιθέτων (σφάλμα ανακατασκευής)
-        if pos in ['JJ', 'JJR', 'JJS']:
-            adj_count = 1
-            j = i + 1
-            while j < len(tokens) and tokens[j][1] in ['JJ', 'JJR', 'JJS']:
-                adj_count += 1
-                j += 1
-            
-            if adj_count > 3: # If >3 διαδοχικά επίθετα, κράτα 2
-                i += adj_count - 2
-                continue
-
-        # Rule 6: Remove orphan prepositions at end
-        if pos == 'IN' and i == len(tokens) - 1:
-            # Last word is preposition → remove
-            i += 1
-            continue
-        
-        # Rule 7: Remove consecutive prepositions (in to with → keep first)
-        if pos == 'IN' and i + 1 < len(tokens):
-            next_word, next_pos = tokens[i + 1]
-            if next_pos == 'IN':
-                # Two prepositions in a row → skip second
-                cleaned_tokens.append(word)
-                i += 2
-                continue
-        
-        cleaned_tokens.append(word)
-        i += 1
-    
-    result = ' '.join(cleaned_tokens) # Ανακατασκευή κειμένου
+    cleaned_tokens = TokenList(token for token, _ in pos_tags)
+    rules.scan(pos_tags, cleaned_tokens)
     
-    return result
+    return cleaned_tokens.text() # Ανακατασκευή κειμένου
 
 
 def apply_string_level_cleanup(text):
@@ -178,6 +160,9 @@ VERB_AGREEMENT_MAP = {
     'do': 'does',
 }
 
+# Coordinating conjunctions before a verb whose tense is normalized (Rule 2)
+COORDINATING_CONJUNCTIONS = {'and', 'but', 'then', 'or'}
+
 # Singular determiners
 SINGULAR_DETERMINERS = {'a', 'an', 'this', 'that', 'every', 'each', 'either', 'neither'}
 
@@ -292,24 +277,40 @@ def apply_subject_verb_agreement(text, pos_tags, svo_components):
     - singular subject → is / has / does
     - plural subject → are / have / do
     """
+    edits = TokenEdits(text, pos_tags)
+    subject_verb_agreement_edits(edits, pos_tags, svo_components)
+    return edits.apply()
+
+
+def subject_verb_agreement_edits(edits, pos_tags, svo_components):
+    # Rule 1 πάνω σε TokenEdits: το ρήμα που διορθώνεται είναι η πρώτη εμφάνισή του μετά το
+    # υποκείμενο (ή η πρώτη στο κείμενο, αν το υποκείμενο δεν βρεθεί)
+    context = {'edits': edits, 'agreement': subject_verb_agreement_context(edits, pos_tags, svo_components)}
+    SYNTACTIC_GRAMMAR_RULES.scan(pos_tags, edits, context)
+
+
+def subject_verb_agreement_context(edits, pos_tags, svo_components):
+    # Rule 1, πριν το scan: ποια ρήματα του svo δεν συμφωνούν με το υποκείμενο, ο σωστός τύπος τους
+    # και πόσες διορθώσεις πάνε σε εμφανίσεις μετά / πριν το υποκείμενο (όπως find μετά το υποκείμενο
+    # με fallback στην πρώτη εμφάνιση). None αν ο κανόνας δεν έχει τίποτα να αλλάξει.
     if not svo_components or not pos_tags:
-        return text
+        return None
     
     subject = svo_components.get('subject', [])
     verb = svo_components.get('verb', [])
     
     if not subject or not verb:
-        return text
+        return None
     
     # Determine subject number using unified function
     subject_number = get_token_number(subject, pos_tags)
     
     if subject_number == 'unknown':
-        return text
-    
-    corrected_text = text
+        return None
     
     # Check each verb token for agreement
+    forms = {}
+    pending = {}
     for verb_token in verb:
         verb_lower = verb_token.lower()
         
@@ -324,14 +325,48 @@ def apply_subject_verb_agreement(text, pos_tags, svo_components):
                 # Preserve original case
                 if verb_token[0].isupper():
                     correct_form = correct_form.capitalize()
-                corrected_text = re.sub(
-                    r'\b' + re.escape(verb_token) + r'\b',
-                    correct_form,
-                    corrected_text,
-                    count=1
-                )
-    
-    return corrected_text
+                forms[verb_token] = correct_form
+                pending[verb_token] = pending.get(verb_token, 0) + 1
+    
+    if not forms:
+        return None
+    
+    subject_start = edits.find_sequence(subject)
+    search_from = subject_start + len(subject) if subject_start is not None else 0
+    after_subject = {}
+    for index in range(search_from, len(edits.tokens)):
+        token = edits.tokens[index]
+        if token in forms and edits.is_editable(index) and edits.is_whole_word(index):
+            after_subject[token] = after_subject.get(token, 0) + 1
+    
+    after = {token: min(count, after_subject.get(token, 0)) for token, count in pending.items()}
+    return {
+        'forms': forms,
+        'search_from': search_from,
+        'after': after,
+        'before': {token: count - after[token] for token, count in pending.items()},
+    }
+
+
+def _agreement_target(scan, start, end):
+    # Η εμφάνιση του ρήματος στο start είναι μία από αυτές που διορθώνει το Rule 1;
+    # (κρατάει και τον λογαριασμό των διορθώσεων που μένουν)
+    agreement = scan.context['agreement']
+    token = scan.tokens[start]
+    if token not in agreement['forms']:
+        return False
+    edits = scan.context['edits']
+    if not edits.is_editable(start) or not edits.is_whole_word(start):
+        return False
+    remaining = agreement['after'] if start >= agreement['search_from'] else agreement['before']
+    if not remaining[token]:
+        return False
+    remaining[token] -= 1
+    return True
+
+
+def _agreement_form(scan, start, end):
+    return scan.context['agreement']['forms'][scan.tokens[start]]
 
 
 def get_main_verb_tense(pos_tags):
@@ -359,18 +394,30 @@ def apply_morphological_consistency(text, pos_tags, verb_groups):
     """
     Rule 2: Morphological Consistency of Verbs
     Identifies the main verb tense and normalizes other verbs to maintain consistency.
-    Uses verb_groups from syntactic analysis and get_verb_base_form for normalization.
+    Uses verb_groups from syntactic analysis and the tense conversion maps.
     """
+    edits = TokenEdits(text, pos_tags)
+    morphological_consistency_edits(edits, pos_tags, verb_groups)
+    return edits.apply()
+
+
+def morphological_consistency_edits(edits, pos_tags, verb_groups):
+    # Rule 2 πάνω σε TokenEdits: κάθε εμφάνιση ρήματος με άλλο χρόνο αμέσως μετά από and/but/then/or
+    context = {'edits': edits, 'tense': morphological_consistency_context(pos_tags, verb_groups)}
+    SYNTACTIC_GRAMMAR_RULES.scan(pos_tags, edits, context)
+
+
+def morphological_consistency_context(pos_tags, verb_groups):
+    # Rule 2, πριν το scan: ο χρόνος του κύριου ρήματος και ποια ρήματα έχουν άλλο χρόνο
+    # None αν ο κανόνας δεν έχει τίποτα να αλλάξει
     if not verb_groups or not pos_tags:
-        return text
+        return None
     
     # Get main verb tense from current POS tags
     main_tense = get_main_verb_tense(pos_tags)
     
     if main_tense == 'unknown':
-        return text
-    
-    corrected_text = text
+        return None
     
     # Get conversion map for target tense
     if main_tense == 'past':
@@ -380,14 +427,13 @@ def apply_morphological_consistency(text, pos_tags, verb_groups):
     elif main_tense == 'base':
         conversion_map = TENSE_CONVERSION['to_base']
     else:
-        return text
+        return None
     
     # Find all verbs in the text that need conversion
-    # We check verbs that appear after conjunctions (coordinated clauses)
+    targets = set()
     for token, pos in pos_tags:
         if pos.startswith('VB'):
             token_lower = token.lower()
-            base_form = get_verb_base_form(token_lower)
             
             # Check if this verb's tense conflicts with main tense
             token_tense = 'unknown'
@@ -399,14 +445,25 @@ def apply_morphological_consistency(text, pos_tags, verb_groups):
                 token_tense = 'base'
             
             # Only convert if tenses don't match and we have a conversion
-            if token_tense != 'unknown' and token_tense != main_tense:
-                if token_lower in conversion_map:
-                    # Check if verb follows a conjunction (simple heuristic)
-                    pattern = r'\b(and|but|then|or)\s+' + re.escape(token) + r'\b'
-                    replacement = r'\1 ' + conversion_map[token_lower]
-                    corrected_text = re.sub(pattern, replacement, corrected_text, flags=re.IGNORECASE)
+            if token_tense != 'unknown' and token_tense != main_tense and token_lower in conversion_map:
+                targets.add(token_lower)
     
-    return corrected_text
+    if not targets:
+        return None
+    return {'conversion_map': conversion_map, 'targets': targets}
+
+
+def _coordinated_verb(scan, start, end):
+    # We check verbs that appear after conjunctions (coordinated clauses), in any case
+    if scan.lower_tokens[start] not in scan.context['tense']['targets']:
+        return False
+    edits = scan.context['edits']
+    gap = edits.gap_before(start)
+    return bool(gap) and gap.isspace() and edits.is_whole_word(start) and edits.is_whole_word(start - 1)
+
+
+def _tense_form(scan, start, end):
+    return scan.context['tense']['conversion_map'][scan.lower_tokens[start]]
 
 
 def identify_noun_phrases_from_tags(pos_tags):
@@ -415,47 +472,8 @@ def identify_noun_phrases_from_tags(pos_tags):
     This avoids index mismatch issues when text has been modified.
     Returns: List of (start_idx, end_idx, tokens)
     """
-    noun_phrases = []
-    i = 0
-    
-    while i < len(pos_tags):
-        phrase_start = i
-        phrase_tokens = []
-        
-        # Pronouns alone (PRP)
-        if pos_tags[i][1] == 'PRP':
-            noun_phrases.append((i, i+1, [pos_tags[i][0]]))
-            i += 1
-            continue
-        
-        # Determiners (DT) or Possessives (PRP$)
-        if pos_tags[i][1] in ['DT', 'PRP$']:
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-        
-        # Adjectives (JJ, JJR, JJS)
-        while i < len(pos_tags) and pos_tags[i][1] in ['JJ', 'JJR', 'JJS']:
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-        
-        # Nouns (NN, NNS, NNP, NNPS)
-        if i < len(pos_tags) and pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-            
-            if len(phrase_tokens) > 0:
-                noun_phrases.append((phrase_start, i, phrase_tokens))
-        else:
-            if len(phrase_tokens) == 0:
-                if i < len(pos_tags) and pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-                    noun_phrases.append((i, i+1, [pos_tags[i][0]]))
-                    i += 1
-                else:
-                    i = phrase_start + 1
-            else:
-                i = phrase_start + 1
-    
-    return noun_phrases
+    # ίδιοι κανόνες με το identify_noun_phrases - compiled regex πάνω στα κωδικοποιημένα tags
+    return chunk_noun_phrases(pos_tags)
 
 
 def apply_determiner_noun_consistency(text, pos_tags):
@@ -468,100 +486,87 @@ def apply_determiner_noun_consistency(text, pos_tags):
     if not pos_tags:
         return text
     
-    # Re-identify noun phrases from current tags (fixes index mismatch issue)
-    noun_phrases = identify_noun_phrases_from_tags(pos_tags)
-    
-    if not noun_phrases:
+    edits = TokenEdits(text, pos_tags)
+    if not determiner_noun_consistency_edits(edits, pos_tags):
         return text
+    return remove_orphan_determiners(edits.apply())
+
+
+def determiner_noun_consistency_edits(edits, pos_tags):
+    # Rule 3 πάνω σε TokenEdits: η αλλαγή γίνεται στο determiner του ίδιου του noun phrase
+    # Επιστρέφει False αν δεν υπάρχουν noun phrases (τότε δεν αφαιρούνται ούτε orphan determiners)
+    if not has_noun_phrases(pos_tags):
+        return False
+    SYNTACTIC_GRAMMAR_RULES.scan(pos_tags, edits, {'edits': edits, 'determiners': True})
+    return True
+
+
+# κάθε noun phrase τελειώνει σε ουσιαστικό ή είναι PRP (βλ. chunking.NOUN_PHRASE_PATTERN)
+NOUN_PHRASE_HEAD_TAGS = NOUN_TAGS | {'PRP'}
+
+def has_noun_phrases(pos_tags):
+    return bool(pos_tags) and any(tag in NOUN_PHRASE_HEAD_TAGS for _, tag in pos_tags)
+
+
+# Determiner -> αντικατάσταση ('' = αφαίρεση) όταν ο αριθμός του ουσιαστικού δεν ταιριάζει
+DETERMINERS_BEFORE_PLURAL = {'a': '', 'an': '', 'this': 'these', 'that': 'those'}  # Singular determiner with plural noun
+DETERMINERS_BEFORE_SINGULAR = {'these': 'this', 'those': 'that'}  # Plural determiner with singular noun
+
+def _determiner_form(scan, start, end):
+    # Το pattern του κανόνα είναι DT JJ* NN - το noun phrase με determiner όπως το βγάζει το chunking
+    first_token = scan.lower_tokens[start]
+    if first_token not in DETERMINERS_BEFORE_PLURAL and first_token not in DETERMINERS_BEFORE_SINGULAR:
+        return None
     
-    corrected_text = text
-    
-    # Check each noun phrase for determiner-noun consistency
-    for start_idx, end_idx, phrase_tokens in noun_phrases:
-        if len(phrase_tokens) < 2:
-            continue
-        
-        # Check if first token is a determiner
-        first_token = phrase_tokens[0].lower()
-        
-        # Get the determiner's POS tag
-        det_pos = None
-        if start_idx < len(pos_tags):
-            det_pos = pos_tags[start_idx][1]
-        
-        if det_pos != 'DT':
-            continue
-        
-        # Get noun number using unified function
-        noun_number = get_token_number(phrase_tokens[1:], pos_tags)
-        
-        if noun_number == 'unknown':
-            continue
-        
-        # Check for inconsistencies
-        if first_token in SINGULAR_DETERMINERS and noun_number == 'plural':
-            # Singular determiner with plural noun - problematic
-            phrase_str = ' '.join(phrase_tokens)
-            
-            if first_token in ['a', 'an']:
-                # Remove the article before plural noun
-                fixed_phrase = ' '.join(phrase_tokens[1:])
-                corrected_text = corrected_text.replace(phrase_str, fixed_phrase, 1)
-            elif first_token == 'this':
-                new_phrase = 'these ' + ' '.join(phrase_tokens[1:])
-                corrected_text = re.sub(
-                    r'\b' + re.escape(phrase_str) + r'\b',
-                    new_phrase,
-                    corrected_text,
-                    count=1,
-                    flags=re.IGNORECASE
-                )
-            elif first_token == 'that':
-                new_phrase = 'those ' + ' '.join(phrase_tokens[1:])
-                corrected_text = re.sub(
-                    r'\b' + re.escape(phrase_str) + r'\b',
-                    new_phrase,
-                    corrected_text,
-                    count=1,
-                    flags=re.IGNORECASE
-                )
-        
-        elif first_token in PLURAL_DETERMINERS and noun_number == 'singular':
-            # Plural determiner with singular noun
-            phrase_str = ' '.join(phrase_tokens)
-            
-            if first_token == 'these':
-                new_phrase = 'this ' + ' '.join(phrase_tokens[1:])
-                corrected_text = re.sub(
-                    r'\b' + re.escape(phrase_str) + r'\b',
-                    new_phrase,
-                    corrected_text,
-                    count=1,
-                    flags=re.IGNORECASE
-                )
-            elif first_token == 'those':
-                new_phrase = 'that ' + ' '.join(phrase_tokens[1:])
-                corrected_text = re.sub(
-                    r'\b' + re.escape(phrase_str) + r'\b',
-                    new_phrase,
-                    corrected_text,
-                    count=1,
-                    flags=re.IGNORECASE
-                )
+    # Get noun number using unified function
+    noun_number = get_token_number(scan.tokens[start + 1:end], scan.pos_tags)
     
+    if noun_number == 'plural':
+        return DETERMINERS_BEFORE_PLURAL.get(first_token)
+    if noun_number == 'singular':
+        return DETERMINERS_BEFORE_SINGULAR.get(first_token)
+    return None
+
+
+def remove_orphan_determiners(text):
     # Remove orphan determiners (determiners not followed by noun-like content)
-    corrected_text = re.sub(r'\b(a|an|the)\s+([.,!?;:])', r'\2', corrected_text)
-    
-    return corrected_text
+    return re.sub(r'\b(a|an|the)\s+([.,!?;:])', r'\2', text)
 
 
-def apply_syntactic_grammar_rules(text, pos_tags, syntactic_info):
+# Οι τρεις συντακτικοί κανόνες ως ένα rule set - ένα scan ανά πρόταση
+# Κάθε κανόνας τρέχει μόνο αν το context του (υπολογισμένο πριν το scan) δείχνει ότι έχει κάτι να κάνει
+SYNTACTIC_GRAMMAR_RULES = RuleSet([
+    # Rule 1: Subject-Verb Agreement
+    Rule('subject_verb_agreement', [TokenPattern(words=VERB_AGREEMENT_MAP)], 'replace',
+         condition=_agreement_target, replace=_agreement_form, requires='agreement'),
+    # Rule 2: Morphological Consistency of Verbs (ρήμα αμέσως μετά από and/but/then/or)
+    Rule('morphological_consistency',
+         [TokenPattern(words=set().union(*TENSE_CONVERSION.values()))], 'replace',
+         before=[TokenPattern(words=COORDINATING_CONJUNCTIONS)],
+         condition=_coordinated_verb, replace=_tense_form, requires='tense'),
+    # Rule 3: Determiner-Noun Consistency
+    Rule('determiner_noun_consistency',
+         [TokenPattern(tags={'DT'}),
+          TokenPattern(tags=ADJECTIVE_TAGS, min_count=0, max_count=None),
+          TokenPattern(tags=NOUN_TAGS)], 'replace',
+         replace=_determiner_form, requires='determiners'),
+])
+
+
+def apply_syntactic_grammar_rules(text, pos_tags, syntactic_info, check_tenses=True):
     """
     Apply grammar rules using syntactic analysis information.
     This function integrates all three required grammar rules:
     1. Subject-Verb Agreement
     2. Morphological Consistency of Verbs
     3. Determiner-Noun Consistency
+
+    The rules are declared in SYNTACTIC_GRAMMAR_RULES and run in one scan
+    over the re-tagged tokens. They record their fixes as token-level edits
+    on one shared token array (TokenEdits) and the text is rebuilt once.
+
+    check_tenses=False skips rule 2 when a corpus-level check (flag_tense_conflicts)
+    has already shown that no verb differs in tense from the main verb.
     """
     if not syntactic_info:
         return text
@@ -570,16 +575,18 @@ def apply_syntactic_grammar_rules(text, pos_tags, syntactic_info):
     verb_groups = syntactic_info.get('verb_groups', [])
     svo_components = syntactic_info.get('svo_components', {})
     
-    corrected_text = text
-    
-    # Rule 1: Subject-Verb Agreement
-    corrected_text = apply_subject_verb_agreement(corrected_text, pos_tags, svo_components)
-    
-    # Rule 2: Morphological Consistency of Verbs
-    corrected_text = apply_morphological_consistency(corrected_text, pos_tags, verb_groups)
+    edits = TokenEdits(text, pos_tags)
+    context = {
+        'edits': edits,
+        'agreement': subject_verb_agreement_context(edits, pos_tags, svo_components),
+        'tense': morphological_consistency_context(pos_tags, verb_groups) if check_tenses else None,
+        'determiners': has_noun_phrases(pos_tags),
+    }
+    SYNTACTIC_GRAMMAR_RULES.scan(pos_tags, edits, context)
     
-    # Rule 3: Determiner-Noun Consistency (re-identifies NPs internally)
-    corrected_text = apply_determiner_noun_consistency(corrected_text, pos_tags)
+    corrected_text = edits.apply()
+    if context['determiners']:
+        corrected_text = remove_orphan_determiners(corrected_text)
     
     return corrected_text
     
@@ -646,6 +653,100 @@ def retag_reconstructed_text(reconstructed_text):
     
     return new_pos_tags
 
+def retag_reconstructed_text_batch(texts):
+    # Όπως η retag_reconstructed_text για πολλά κείμενα μαζί: ένας tagger για όλη τη λίστα (pos_tag_sents)
+    # δέχεται λίστα από strings -> επιστρέφει λίστα από [(token, tag), ...] στη σειρά εισόδου
+    from nltk.tokenize import word_tokenize
+    from nltk import pos_tag_sents
+
+    return pos_tag_sents([word_tokenize(text) for text in texts])
+
+
+# Incremental re-tagging μετά τους επιφανειακούς κανόνες: οι κανόνες συνήθως δεν αλλάζουν τίποτα ή
+# αφαιρούν λίγα tokens, οπότε ξανατρέχει το tokenization (φθηνό) αλλά το pos_tag (ακριβό) μόνο σε ένα
+# παράθυρο γύρω από τα tokens που άλλαξαν. Τα tags έξω από το παράθυρο κρατιούνται από το πρώτο re-tag.
+# Ο perceptron tagger του nltk κοιτάει ±2 λέξεις και τα 2 προηγούμενα tags, γι' αυτό αλλάζουν
+# (RETAG_SPREAD) tokens γύρω από την αλλαγή και το παράθυρο έχει RETAG_CONTEXT tokens context σε κάθε πλευρά.
+RETAG_SPREAD = 2
+RETAG_CONTEXT = 3
+
+def retag_window(tokens, previous_tokens):
+    # Σύγκριση των νέων tokens με τα προηγούμενα (κοινό prefix / suffix)
+    # Επιστρέφει None αν δεν άλλαξε τίποτα, αλλιώς (window_start, window_end, core_start, core_end):
+    # το pos_tag τρέχει στο tokens[window_start:window_end] και κρατιούνται τα tags του [core_start:core_end]
+    if tokens == previous_tokens:
+        return None
+    limit = min(len(tokens), len(previous_tokens))
+    prefix = 0
+    while prefix < limit and tokens[prefix] == previous_tokens[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and tokens[-1 - suffix] == previous_tokens[-1 - suffix]:
+        suffix += 1
+
+    core_start = max(0, prefix - RETAG_SPREAD)
+    core_end = min(len(tokens), len(tokens) - suffix + RETAG_SPREAD)
+    window_start = max(0, core_start - RETAG_CONTEXT)
+    window_end = min(len(tokens), core_end + RETAG_CONTEXT)
+    # αν το παράθυρο πιάνει πάνω από το μισό κείμενο, full re-tag
+    if 2 * (window_end - window_start) >= len(tokens):
+        return 0, len(tokens), 0, len(tokens)
+    return window_start, window_end, core_start, core_end
+
+def merge_window_tags(previous_pos_tags, num_tokens, window, window_tags):
+    # Tags του παραθύρου + τα παλιά tags για το αμετάβλητο prefix / suffix
+    window_start, _, core_start, core_end = window
+    shift = len(previous_pos_tags) - num_tokens  # θέση του suffix στα παλιά tags
+    return (
+        list(previous_pos_tags[:core_start])
+        + window_tags[core_start - window_start:core_end - window_start]
+        + list(previous_pos_tags[core_end + shift:])
+    )
+
+def retag_mode(window, num_tokens):
+    # 'unchanged' (καθόλου pos_tag), 'window' ή 'full'
+    if window is None:
+        return 'unchanged'
+    return 'full' if window[:2] == (0, num_tokens) else 'window'
+
+def retag_incremental(text, previous_pos_tags):
+    # Όπως η retag_reconstructed_text, αλλά ξαναχρησιμοποιεί τα tags ενός προηγούμενου re-tag του ίδιου κειμένου
+    # δέχεται το νέο text και τα [(token, tag), ...] του προηγούμενου -> επιστρέφει (new POS tags, mode)
+    from nltk.tokenize import word_tokenize
+    from nltk import pos_tag
+
+    tokens = word_tokenize(text)
+    window = retag_window(tokens, [token for token, _ in previous_pos_tags])
+    mode = retag_mode(window, len(tokens))
+    if window is None:
+        return list(previous_pos_tags), mode
+    window_tags = pos_tag(tokens[window[0]:window[1]])
+    return merge_window_tags(previous_pos_tags, len(tokens), window, window_tags), mode
+
+def retag_incremental_batch(texts, previous_pos_tags_list, retag_stats=None):
+    # Batch εκδοχή της retag_incremental: όλα τα παράθυρα σε ένα pos_tag_sents
+    # retag_stats: (optional) dict που μετράει πόσα κείμενα ήταν 'unchanged' / 'window' / 'full'
+    from nltk.tokenize import word_tokenize
+    from nltk import pos_tag_sents
+
+    tokens_list = [word_tokenize(text) for text in texts]
+    windows = [
+        retag_window(tokens, [token for token, _ in previous_pos_tags])
+        for tokens, previous_pos_tags in zip(tokens_list, previous_pos_tags_list)
+    ]
+    if retag_stats is not None:
+        for tokens, window in zip(tokens_list, windows):
+            mode = retag_mode(window, len(tokens))
+            retag_stats[mode] = retag_stats.get(mode, 0) + 1
+
+    to_tag = [i for i, window in enumerate(windows) if window is not None]
+    tagged = pos_tag_sents([tokens_list[i][windows[i][0]:windows[i][1]] for i in to_tag])
+
+    new_pos_tags_list = [list(previous_pos_tags) for previous_pos_tags in previous_pos_tags_list]
+    for i, window_tags in zip(to_tag, tagged):
+        new_pos_tags_list[i] = merge_window_tags(previous_pos_tags_list[i], len(tokens_list[i]), windows[i], window_tags)
+    return new_pos_tags_list
+
 # ============================== MAIN GRAMMATICAL CORRECTION PIPELINE ==============================
 
 def grammatical_correction_pipeline(text, verbose, syntactic_info=None):
@@ -696,10 +797,12 @@ def grammatical_correction_pipeline(text, verbose, syntactic_info=None):
         print_correction_step(2, "After Surface Grammar Rules", f"{corrected}\n({changes})")
     
     # Step 2.5: Syntactic-based grammar rules
-    # Always re-tag after surface grammar rules since text may have changed
-    pos_tags = retag_reconstructed_text(corrected)
-    
     if syntactic_info:
+        # Re-tag μετά τους επιφανειακούς κανόνες - μόνο όσο χρειάζεται (incremental)
+        # Χωρίς syntactic_info τα νέα tags δεν χρησιμοποιούνται, οπότε δεν γίνεται καθόλου
+        pos_tags, retag = retag_incremental(corrected, pos_tags)
+        if verbose:
+            print(f"    Re-tag after surface rules: {retag}")
         before_syntactic = corrected
         
         corrected = apply_syntactic_grammar_rules(corrected, pos_tags, syntactic_info)
@@ -743,3 +846,50 @@ def grammatical_correction_simple(text, pos_tags=None, syntactic_info=None):
           POS tags are regenerated internally to ensure consistency.
     """
     return grammatical_correction_pipeline(text, verbose=False, syntactic_info=syntactic_info)
+
+
+def grammatical_correction_pipeline_batch(texts, syntactic_infos=None, retag_stats=None):
+    """
+    Batch εκδοχή του grammatical_correction_pipeline (χωρίς verbose output).
+    Κάνει τα ίδια βήματα, αλλά κάθε re-tagging γίνεται μία φορά για όλη τη λίστα.
+    
+    Args:
+        texts: λίστα κειμένων προς διόρθωση
+        syntactic_infos: (optional) λίστα με αποτελέσματα συντακτικής ανάλυσης, μία ανά κείμενο
+        retag_stats: (optional) dict που μετράει τα re-tags μετά τους επιφανειακούς κανόνες
+                     ('unchanged' / 'window' / 'full')
+    
+    Returns: λίστα διορθωμένων κειμένων στη σειρά εισόδου
+    """
+    if syntactic_infos is None:
+        syntactic_infos = [None] * len(texts)
+
+    corrected_texts = list(texts)
+    active = [i for i, text in enumerate(texts) if text and text.strip()]
+
+    # Step 0.5: tags για όλα τα κείμενα μαζί
+    first_pos_tags = dict(zip(active, retag_reconstructed_text_batch([texts[i] for i in active])))
+
+    # Step 1 + 2: ορθογραφία και επιφανειακοί κανόνες
+    for i in active:
+        corrected = apply_spelling_correction(texts[i])
+        corrected_texts[i] = apply_surface_grammar_rules(corrected, first_pos_tags[i])
+
+    # Step 2.5: re-tag μόνο όσων έχουν syntactic_info (μόνο εκεί χρησιμοποιούνται τα νέα tags),
+    # incremental πάνω στα tags του Step 0.5
+    with_syntax = [i for i in active if syntactic_infos[i]]
+    pos_tags_list = retag_incremental_batch(
+        [corrected_texts[i] for i in with_syntax], [first_pos_tags[i] for i in with_syntax], retag_stats
+    )
+    # ένας vectorized έλεγχος για όλο το batch - το Rule 2 τρέχει μόνο όπου υπάρχουν ρήματα με διαφορετικό χρόνο
+    tense_flags = flag_tense_conflicts(pos_tags_list).tolist()
+    for i, pos_tags, check_tenses in zip(with_syntax, pos_tags_list, tense_flags):
+        corrected_texts[i] = apply_syntactic_grammar_rules(
+            corrected_texts[i], pos_tags, syntactic_infos[i], check_tenses=check_tenses
+        )
+
+    # Step 3: Post-processing
+    for i in active:
+        corrected_texts[i] = apply_post_processing(corrected_texts[i])
+
+    return corrected_texts
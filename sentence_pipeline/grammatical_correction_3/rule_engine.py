@@ -0,0 +1,303 @@
+# Declarative μηχανή γραμματικών κανόνων
+# Κάθε κανόνας δηλώνεται ως pattern πάνω σε tags / λέξεις + action, όχι ως if-branch μέσα σε loop.
+# Οι κανόνες ενός RuleSet μεταγλωττίζονται σε έναν dispatch table με index το tag ID του πρώτου token
+# του pattern (anchor): σε κάθε θέση δοκιμάζονται μόνο οι κανόνες που μπορούν να ξεκινήσουν από αυτό
+# το tag, με τη σειρά δήλωσης, και ο πρώτος που ταιριάζει κερδίζει. Η πρόταση σαρώνεται μία φορά από
+# αριστερά προς τα δεξιά όσοι κανόνες κι αν υπάρχουν - νέος κανόνας δεν σημαίνει νέο πέρασμα.
+#
+# Οι κανόνες γράφουν σε ένα output με δύο μεθόδους, replace(index, replacement) και delete(index):
+# - TokenList: η πρόταση ξαναχτίζεται από τα tokens που έμειναν (' '.join, όπως οι επιφανειακοί κανόνες)
+# - TokenEdits (token_edits.py): αλλαγές πάνω στο αρχικό κείμενο, όπως οι συντακτικοί κανόνες
+from sentence_pipeline.tagged_sentence import TAG_VOCABULARY
+
+ACTIONS = ('drop', 'keep_first', 'trim', 'replace')
+
+
+class TokenPattern:
+    # Ένα στοιχείο του pattern: επιτρεπτά tags / λέξεις (lowercase), None = οποιοδήποτε
+    # same_word_as: θέση προηγούμενου στοιχείου του pattern με την ίδια λέξη (χωρίς διάκριση πεζών/κεφαλαίων)
+    # min_count / max_count: επανάληψη (greedy, χωρίς backtracking), max_count=None χωρίς όριο
+
+    def __init__(self, tags=None, words=None, same_word_as=None, min_count=1, max_count=1):
+        self.tags = frozenset(tags) if tags is not None else None
+        self.words = frozenset(words) if words is not None else None
+        self.same_word_as = same_word_as
+        self.min_count = min_count
+        self.max_count = max_count
+
+    def accepts(self, scan, index, starts):
+        if self.tags is not None and scan.tags[index] not in self.tags:
+            return False
+        if self.words is not None and scan.lower_tokens[index] not in self.words:
+            return False
+        if self.same_word_as is not None:
+            lower_tokens = scan.lower_tokens
+            return lower_tokens[index] == lower_tokens[starts[self.same_word_as]]
+        return True
+
+
+class Rule:
+    # name: για εμφάνιση / benchmarks
+    # pattern: λίστα από TokenPattern - το πρώτο είναι το anchor (η θέση του scan)
+    # action:
+    #   'drop'       αφαίρεση όλων των tokens του match
+    #   'keep_first' κρατιέται το πρώτο token, αφαιρούνται τα υπόλοιπα
+    #   'trim'       αφαιρούνται όλα εκτός από τα τελευταία `keep`, και το scan συνεχίζει από αυτά
+    #   'replace'    αλλαγή του anchor token με το replace (dict lowercase λέξη -> αντικατάσταση, ή
+    #                callable(scan, start, end) -> αντικατάσταση / None). '' σημαίνει διαγραφή
+    # before: TokenPattern για τα tokens αμέσως πριν το anchor (χωρίς επανάληψη)
+    # at_end: το match πρέπει να φτάνει ως το τελευταίο token της πρότασης
+    # condition: callable(scan, start, end) -> bool, για ό,τι δεν εκφράζεται με tags / λέξεις
+    # requires: κλειδί του scan.context - ο κανόνας τρέχει μόνο αν το context[requires] είναι truthy
+
+    def __init__(self, name, pattern, action, before=(), at_end=False, condition=None,
+                 replace=None, keep=1, requires=None):
+        if action not in ACTIONS:
+            raise ValueError(f"rule {name!r}: unknown action {action!r}, expected one of {ACTIONS}")
+        if action == 'replace' and replace is None:
+            raise ValueError(f"rule {name!r}: action 'replace' needs replace=")
+        if not pattern:
+            raise ValueError(f"rule {name!r}: empty pattern")
+        if pattern[0].min_count < 1:
+            # το dispatch γίνεται με το tag του anchor, οπότε το anchor πρέπει να υπάρχει πάντα
+            raise ValueError(f"rule {name!r}: the first pattern element must match at least one token")
+        self.name = name
+        self.pattern = list(pattern)
+        self.action = action
+        self.before = list(before)
+        self.at_end = at_end
+        self.condition = condition
+        self.replace = replace
+        self.keep = keep
+        self.requires = requires
+        # pattern χωρίς επαναλήψεις: σταθερό μήκος, οπότε το match ελέγχεται με ένα απλό loop
+        # (και τα at_end κανόνες απορρίπτονται αμέσως σε κάθε θέση εκτός από την τελευταία)
+        if all(p.min_count == p.max_count == 1 for p in self.pattern):
+            self._fixed = [(p.tags, p.words, p.same_word_as) for p in self.pattern]
+        else:
+            self._fixed = None
+
+    def __repr__(self):
+        return f"Rule({self.name!r})"
+
+    @property
+    def anchor_tags(self):
+        return self.pattern[0].tags
+
+    @property
+    def anchor_words(self):
+        return self.pattern[0].words
+
+    def match(self, scan, start):
+        # Τέλος (exclusive) του match που ξεκινάει στο start, ή None
+        if start < len(self.before):
+            return None
+        for offset, token_pattern in enumerate(self.before):
+            if not token_pattern.accepts(scan, start - len(self.before) + offset, ()):
+                return None
+
+        n = scan.length
+        if self._fixed is not None:
+            end = start + len(self._fixed)
+            if end > n or (self.at_end and end != n):
+                return None
+            tags, lower_tokens = scan.tags, scan.lower_tokens
+            index = start
+            for pattern_tags, words, same_word_as in self._fixed:
+                if pattern_tags is not None and tags[index] not in pattern_tags:
+                    return None
+                if words is not None and lower_tokens[index] not in words:
+                    return None
+                if same_word_as is not None and lower_tokens[index] != lower_tokens[start + same_word_as]:
+                    return None
+                index += 1
+            return end
+
+        position = start
+        starts = []
+        for token_pattern in self.pattern:
+            starts.append(position)
+            count = 0
+            while position < n and (token_pattern.max_count is None or count < token_pattern.max_count) \
+                    and token_pattern.accepts(scan, position, starts):
+                position += 1
+                count += 1
+            if count < token_pattern.min_count:
+                return None
+        if self.at_end and position != n:
+            return None
+        return position
+
+    @property
+    def end_length(self):
+        # μήκος των at_end κανόνων σταθερού μήκους (μπορούν να ταιριάξουν μόνο σε μία θέση), αλλιώς None
+        if self.at_end and self._fixed is not None:
+            return len(self._fixed)
+        return None
+
+    def fire(self, scan, start, end, output):
+        # Εφαρμογή μετά από match (start, end)
+        # Επιστρέφει τη θέση από την οποία συνεχίζει το scan, ή None αν ο κανόνας τελικά δεν εφαρμόζεται
+        if self.condition is not None and not self.condition(scan, start, end):
+            return None
+
+        action = self.action
+        if action == 'replace':
+            if callable(self.replace):
+                replacement = self.replace(scan, start, end)
+            else:
+                replacement = self.replace.get(scan.lower_tokens[start])
+            if replacement is None:
+                return None
+            done = output.delete(start) if replacement == '' else output.replace(start, replacement)
+            return start + 1 if done else None
+        if action == 'drop':
+            for index in range(start, end):
+                output.delete(index)
+            return end
+        if action == 'keep_first':
+            for index in range(start + 1, end):
+                output.delete(index)
+            return end
+        # trim
+        resume = max(end - self.keep, start + 1)
+        for index in range(start, resume):
+            output.delete(index)
+        return resume
+
+
+class SentenceScan:
+    # Ό,τι βλέπουν οι κανόνες για μία πρόταση: tokens, tags, tag IDs και context
+    # (γεγονότα σε επίπεδο πρότασης, π.χ. ο αριθμός του υποκειμένου, που υπολογίζονται πριν το scan)
+
+    def __init__(self, pos_tags, vocabulary=TAG_VOCABULARY, context=None):
+        self.pos_tags = pos_tags
+        if hasattr(pos_tags, 'tag_ids') and pos_tags.vocabulary is vocabulary:
+            # TaggedSentence: τα tag IDs υπάρχουν ήδη
+            self.tokens = pos_tags.tokens()
+            self.tags = pos_tags.tags()
+            self.tag_ids = pos_tags.tag_ids
+        else:
+            self.tokens = [token for token, _ in pos_tags]
+            self.tags = [tag for _, tag in pos_tags]
+            ids = vocabulary.ids
+            self.tag_ids = [ids[tag] if tag in ids else vocabulary.intern(tag) for tag in self.tags]
+        self.lower_tokens = [token.lower() for token in self.tokens]
+        self.length = len(self.tokens)
+        self.context = context if context is not None else {}
+
+
+class TokenList:
+    # Output που ξαναχτίζει την πρόταση από τα tokens που έμειναν (με τις αντικαταστάσεις)
+
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+        self._removed = set()
+
+    def replace(self, index, replacement):
+        if index in self._removed:
+            return False
+        self.tokens[index] = replacement
+        return True
+
+    def delete(self, index):
+        if index in self._removed:
+            return False
+        self._removed.add(index)
+        return True
+
+    def kept_tokens(self):
+        removed = self._removed
+        return [token for index, token in enumerate(self.tokens) if index not in removed]
+
+    def text(self):
+        return ' '.join(self.kept_tokens())
+
+
+class RuleSet:
+    # Λίστα κανόνων (η σειρά είναι η προτεραιότητα) + ο dispatch table τους
+
+    def __init__(self, rules=(), vocabulary=TAG_VOCABULARY):
+        self.rules = list(rules)
+        self.vocabulary = vocabulary
+        self._tables = {}  # ενεργοί κανόνες (tuple από indices) -> (vocabulary size, dispatch table)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def add(self, rule):
+        self.rules.append(rule)
+        self._tables = {}
+
+    def dispatch_table(self, active=None, remaining=None):
+        # Επιστρέφει (table, word_tables):
+        # table[tag_id] = tuple από κανόνες (σειρά δήλωσης) που το anchor τους δέχεται το tag
+        #                 χωρίς περιορισμό λέξης
+        # word_tables[tag_id][word] = το ίδιο για anchor token με λέξη word, μαζί με τους κανόνες
+        #                 που το anchor τους ζητάει αυτή τη λέξη (μόνο για λέξεις που ζητάει κάποιος κανόνας)
+        # active: indices των κανόνων που μετράνε (None = όλοι)
+        # remaining: None για θέσεις μακριά από το τέλος (χωρίς τους at_end κανόνες σταθερού μήκους),
+        # r για τη θέση με r tokens ως το τέλος (μαζί με τους at_end κανόνες μήκους r)
+        # Ξαναχτίζεται μόνο όταν το vocabulary αποκτήσει νέο tag ή προστεθεί κανόνας.
+        key = (tuple(range(len(self.rules))) if active is None else tuple(active), remaining)
+        size = len(self.vocabulary)
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+        rules = [
+            rule for rule in (self.rules[index] for index in key[0])
+            if rule.end_length is None or rule.end_length == remaining
+        ]
+        anchor_words = set().union(*(rule.anchor_words for rule in rules if rule.anchor_words is not None))
+        table = []
+        word_tables = []
+        for tag in self.vocabulary.tags:
+            tag_rules = [rule for rule in rules if rule.anchor_tags is None or tag in rule.anchor_tags]
+            table.append(tuple(rule for rule in tag_rules if rule.anchor_words is None))
+            word_tables.append({
+                word: tuple(rule for rule in tag_rules if rule.anchor_words is None or word in rule.anchor_words)
+                for word in anchor_words
+            })
+        self._tables[key] = (size, (table, word_tables))
+        return table, word_tables
+
+    def scan(self, pos_tags, output, context=None):
+        # Ένα πέρασμα πάνω στην πρόταση: σε κάθε θέση ο πρώτος κανόνας του dispatch table που
+        # εφαρμόζεται γράφει στο output και λέει από πού συνεχίζει το scan
+        # Επιστρέφει το SentenceScan (tokens / tags / context) για όποιον το χρειάζεται μετά
+        scan = SentenceScan(pos_tags, self.vocabulary, context)
+        active = [
+            index for index, rule in enumerate(self.rules)
+            if rule.requires is None or scan.context.get(rule.requires)
+        ]
+        if not active:
+            return scan
+        tables = self.dispatch_table(active)
+        end_tables = {
+            length: self.dispatch_table(active, length)
+            for length in {self.rules[index].end_length for index in active} - {None}
+        }
+        end_span = max(end_tables, default=0)
+
+        tag_ids = scan.tag_ids
+        lower_tokens = scan.lower_tokens
+        i = 0
+        n = scan.length
+        while i < n:
+            table, word_tables = tables if n - i > end_span else end_tables.get(n - i, tables)
+            tag_id = tag_ids[i]
+            candidates = word_tables[tag_id].get(lower_tokens[i]) or table[tag_id]
+            for rule in candidates:
+                end = rule.match(scan, i)
+                if end is None:
+                    continue
+                next_index = rule.fire(scan, i, end, output)
+                if next_index is not None:
+                    i = next_index
+                    break
+            else:
+                i += 1
+        return scan
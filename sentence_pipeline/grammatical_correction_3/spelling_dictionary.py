@@ -0,0 +1,129 @@
+# Ορθογραφική διόρθωση με dictionary που φορτώνεται μία φορά
+# Το κείμενο χωρίζεται σε λέξεις (\w+, ίδια όρια με το \b) μία φορά:
+# - μονολεκτικές εγγραφές: hash lookup ανά λέξη
+# - πολυλεκτικές εγγραφές ("their are"): trie πάνω σε λέξεις, longest match από κάθε θέση
+# Κόστος γραμμικό στο μήκος του κειμένου, ανεξάρτητο από το μέγεθος του dictionary.
+import re
+
+_WORD = re.compile(r'\w+')
+
+
+def _match_case(original, replacement):
+    # ΚΕΦΑΛΑΙΑ -> ΚΕΦΑΛΑΙΑ, Πρώτο κεφαλαίο -> Πρώτο κεφαλαίο, αλλιώς όπως είναι στο dictionary
+    if len(original) > 1 and original.isupper():
+        return replacement.upper()
+    if original[:1].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+class SpellingDictionary:
+    # misspelling -> correction, case-insensitive στο ταίριασμα
+
+    def __init__(self, corrections=None):
+        self.words = {}    # 'recieve' -> 'receive'
+        self.phrases = {}  # trie: 'their' -> {'are' -> {None: 'there are'}}
+        self.max_phrase_length = 0
+        if corrections:
+            self.update(corrections)
+
+    def __len__(self):
+        return len(self.words) + self._count_phrases(self.phrases)
+
+    def _count_phrases(self, node):
+        return sum(1 if key is None else self._count_phrases(child) for key, child in node.items())
+
+    def add(self, misspelling, correction):
+        words = _WORD.findall(misspelling.lower())
+        if not words:
+            return
+        if len(words) == 1:
+            self.words[words[0]] = correction
+            return
+        node = self.phrases
+        for word in words:
+            node = node.setdefault(word, {})
+        node[None] = correction
+        self.max_phrase_length = max(self.max_phrase_length, len(words))
+
+    def update(self, corrections):
+        for misspelling, correction in dict(corrections).items():
+            self.add(misspelling, correction)
+
+    @classmethod
+    def from_file(cls, path, encoding='utf-8'):
+        # Μία εγγραφή ανά γραμμή: "misspelling<TAB>correction" ή "misspelling->correction"
+        # Κενές γραμμές και γραμμές που ξεκινούν με # αγνοούνται
+        dictionary = cls()
+        dictionary.load(path, encoding)
+        return dictionary
+
+    def load(self, path, encoding='utf-8'):
+        with open(path, 'r', encoding=encoding) as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if '\t' in line:
+                    misspelling, correction = line.split('\t', 1)
+                elif '->' in line:
+                    misspelling, correction = line.split('->', 1)
+                else:
+                    raise ValueError(f"{path}:{line_number}: expected 'misspelling<TAB>correction' or 'misspelling->correction'")
+                self.add(misspelling.strip(), correction.strip())
+        return self
+
+    def correct(self, text):
+        matches = list(_WORD.finditer(text))
+        if not matches:
+            return text
+
+        # 1. μονολεκτικές διορθώσεις
+        words = self.words
+        corrected = [words.get(match.group().lower()) for match in matches]
+        if not self.phrases and all(correction is None for correction in corrected):
+            return text
+
+        pieces = []
+        last_end = 0
+        i = 0
+        while i < len(matches):
+            # 2. πολυλεκτικές: longest match στο trie πάνω στις (ήδη διορθωμένες) λέξεις,
+            # με ακριβώς ένα κενό ανάμεσα (όπως το pattern "their are")
+            phrase_end, phrase_correction = self._match_phrase(text, matches, corrected, i)
+            if phrase_correction is not None:
+                start = matches[i].start()
+                pieces.append(text[last_end:start])
+                pieces.append(_match_case(matches[i].group(), phrase_correction))
+                last_end = matches[phrase_end - 1].end()
+                i = phrase_end
+                continue
+
+            if corrected[i] is not None:
+                match = matches[i]
+                pieces.append(text[last_end:match.start()])
+                pieces.append(_match_case(match.group(), corrected[i]))
+                last_end = match.end()
+            i += 1
+
+        if not pieces:
+            return text
+        pieces.append(text[last_end:])
+        return ''.join(pieces)
+
+    def _match_phrase(self, text, matches, corrected, i):
+        # Επιστρέφει (index μετά την τελευταία λέξη, correction) του μεγαλύτερου phrase από τη λέξη i, ή (i, None)
+        node = self.phrases
+        best_end, best_correction = i, None
+        j = i
+        while j < len(matches) and j - i < self.max_phrase_length:
+            if j > i and text[matches[j - 1].end():matches[j].start()] != ' ':
+                break
+            word = (corrected[j] if corrected[j] is not None else matches[j].group()).lower()
+            node = node.get(word)
+            if node is None:
+                break
+            j += 1
+            if None in node:
+                best_end, best_correction = j, node[None]
+        return best_end, best_correction
@@ -0,0 +1,109 @@
+# Λίστα αλλαγών σε επίπεδο token για τους γραμματικούς κανόνες
+# Οι κανόνες δεν ξαναγράφουν όλο το κείμενο με re.sub / str.replace για κάθε αλλαγή: καταγράφουν
+# αλλαγές σε θέσεις tokens (όπως τα βγάζει το re-tagging) και όλες εφαρμόζονται μαζί σε ένα πέρασμα.
+# Κάθε αλλαγή πάει στο token που εντόπισε ο κανόνας (όχι στην πρώτη εμφάνιση της λέξης στο κείμενο),
+# και ένα token αλλάζει το πολύ μία φορά - ο πρώτος κανόνας που το διορθώνει κερδίζει.
+import re
+
+_WORD_CHAR = re.compile(r'\w')
+
+# το word_tokenize γράφει τα " ως `` και ''
+_QUOTE_TOKENS = {'``': '"', "''": '"'}
+
+
+def align_tokens(text, tokens):
+    # Θέση (start, end) κάθε token μέσα στο text, ή None για όσα δεν βρίσκονται αυτούσια
+    spans = []
+    position = 0
+    for token in tokens:
+        start = text.find(token, position)
+        if start == -1 and token in _QUOTE_TOKENS:
+            token = _QUOTE_TOKENS[token]
+            start = text.find(token, position)
+        # ανάμεσα σε δύο tokens επιτρέπονται μόνο κενά
+        if start == -1 or text[position:start].strip():
+            spans.append(None)
+            continue
+        spans.append((start, start + len(token)))
+        position = start + len(token)
+    return spans
+
+
+class TokenEdits:
+    # Κοινός πίνακας tokens για ένα κείμενο + οι αλλαγές που ζήτησαν οι κανόνες
+
+    def __init__(self, text, pos_tags):
+        self.text = text
+        self.tokens = [token for token, _ in pos_tags]
+        self.lower_tokens = [token.lower() for token in self.tokens]
+        self.spans = align_tokens(text, self.tokens)
+        self._edits = {}  # token index -> (start, end, replacement)
+
+    def __len__(self):
+        return len(self._edits)
+
+    def is_editable(self, index):
+        return self.spans[index] is not None and index not in self._edits
+
+    def is_whole_word(self, index):
+        # όπως το \b...\b: χωρίς γράμμα/ψηφίο αμέσως πριν ή μετά το token στο κείμενο
+        start, end = self.spans[index]
+        return not (start > 0 and _WORD_CHAR.match(self.text, start - 1)) \
+            and not (end < len(self.text) and _WORD_CHAR.match(self.text, end))
+
+    def gap_before(self, index):
+        # το κείμενο ανάμεσα στο token index-1 και στο index (None αν κάποιο δεν έχει θέση)
+        if index == 0 or self.spans[index] is None or self.spans[index - 1] is None:
+            return None
+        return self.text[self.spans[index - 1][1]:self.spans[index][0]]
+
+    def find(self, token, start=0):
+        # πρώτο token == token (case-sensitive), ολόκληρη λέξη και χωρίς αλλαγή ακόμα, από το start και μετά
+        tokens = self.tokens
+        for index in range(start, len(tokens)):
+            if tokens[index] == token and self.is_editable(index) and self.is_whole_word(index):
+                return index
+        return None
+
+    def find_sequence(self, tokens):
+        # αρχή της πρώτης εμφάνισης της ακολουθίας tokens (χωρίς διάκριση πεζών/κεφαλαίων), ή None
+        if not tokens:
+            return None
+        wanted = [token.lower() for token in tokens]
+        lower_tokens = self.lower_tokens
+        for index in range(len(lower_tokens) - len(wanted) + 1):
+            if lower_tokens[index] == wanted[0] and lower_tokens[index:index + len(wanted)] == wanted:
+                return index
+        return None
+
+    def replace(self, index, replacement):
+        if not self.is_editable(index):
+            return False
+        start, end = self.spans[index]
+        self._edits[index] = (start, end, replacement)
+        return True
+
+    def delete(self, index):
+        # αφαίρεση του token μαζί με τα κενά που ακολουθούν
+        if not self.is_editable(index):
+            return False
+        start, end = self.spans[index]
+        while end < len(self.text) and self.text[end].isspace():
+            end += 1
+        self._edits[index] = (start, end, '')
+        return True
+
+    def apply(self):
+        # Ένα πέρασμα πάνω στο κείμενο με τις αλλαγές ταξινομημένες κατά θέση
+        if not self._edits:
+            return self.text
+        pieces = []
+        last_end = 0
+        for start, end, replacement in sorted(self._edits.values()):
+            if start < last_end:
+                continue
+            pieces.append(self.text[last_end:start])
+            pieces.append(replacement)
+            last_end = end
+        pieces.append(self.text[last_end:])
+        return ''.join(pieces)
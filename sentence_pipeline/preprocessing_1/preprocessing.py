@@ -1,18 +1,40 @@
+import difflib
 import re
 import string
+from collections.abc import Mapping
 import contractions
 from nltk.tokenize import word_tokenize
-from nltk.tag import pos_tag
+from nltk.tag import pos_tag, pos_tag_sents
 from nltk.stem import WordNetLemmatizer
 from nltk.corpus import wordnet
 
+from sentence_pipeline.tagged_sentence import TaggedSentence
+
 # ================ HELPER FUNCTIONS ================
 # βοηθητικές συναρτήσεις / βήματα του preprocessing
 
 def expand_contractions(text):
-    # Ανάπτυξη των συντομευμένων λέξεων στην πλήρη μορφή τους με τη χρήση της contractions library
+    # Ανάπτυξη των συντομευμένων λέξεων στην πλήρη μορφή τους με το dictionary της contractions library
     # Επιστρέφει string με το κείμενο - Παράδειγμα "I didn't see it" -> "I did not see it"
-    return contractions.fix(text)
+    # Ίδιο αποτέλεσμα με contractions.fix αλλά με ένα compiled trie regex (βλ. _get_contraction_matcher)
+    # και ένα γραμμικό πέρασμα ανά κείμενο
+    pattern, expansions = _get_contraction_matcher()
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # χαρακτήρες που αλλάζουν μήκος στο lower() - οι θέσεις δεν αντιστοιχούν
+        return contractions.fix(text)
+
+    parts = []
+    position = 0
+    for match in pattern.finditer(lowered):
+        start, end = match.span()
+        parts.append(text[position:start])
+        parts.append(_apply_case(text[start:end], expansions[match.group()]))
+        position = end
+    if position == 0:
+        return text
+    parts.append(text[position:])
+    return ''.join(parts)
 
 
 def apply_lowercasing(text): # Μετατροπή κειμένου σε πεζά 
@@ -84,6 +106,153 @@ def apply_lemmatization(pos_tags):
     
     return lemmatized_tokens
 
+# ================ FUSED NORMALIZATION (Steps 1-4) ================
+# Τα βήματα 1-4 του preprocess_pipeline κάνουν το καθένα πλήρες αντίγραφο του κειμένου και το
+# remove_punctuation_and_special_chars κάνει ~35 διαδοχικά str.replace (ένα ανά χαρακτήρα).
+# Εδώ: ένας precompiled contraction matcher + ένας πίνακας str.translate για τη στίξη,
+# με ακριβώς το ίδιο αποτέλεσμα (ίδια tokens) με τα βήματα 1-4 στη σειρά.
+
+# ίδιοι χαρακτήρες με τη remove_punctuation_and_special_chars ('—…''""' == '—…""')
+_SPECIAL_CHARS = '—…''""'
+_PUNCTUATION_TABLE = str.maketrans({char: ' ' for char in string.punctuation + _SPECIAL_CHARS})
+# Το str.translate είναι γρήγορο μόνο για ASCII κείμενο - για μη-ASCII (π.χ. '—', '…', ’) ένα
+# regex κάνει μαζί στίξη -> κενό και συμπίεση κενών (Steps 3 + 4)
+_SEPARATOR_RUN = re.compile('[\\s' + re.escape(string.punctuation + _SPECIAL_CHARS) + ']+')
+
+# χαρακτήρες που ορίζουν τα όρια λέξης στο contractions.fix (textsearch ALPHANUM)
+_WORD_BOUND_CHARS = 'A-Za-z0-9_'
+
+_contraction_matcher = None  # (compiled regex, dict lowercase key -> expansion), φτιάχνεται μία φορά
+
+
+def _trie_to_regex(node):
+    # Μετατροπή trie (dict χαρακτήρα -> υπο-trie, '' = τέλος λέξης) σε regex χωρίς backtracking
+    # ανάμεσα σε εκατοντάδες εναλλακτικές: κοινά προθέματα ελέγχονται μία φορά
+    is_end = '' in node
+    branches = [re.escape(char) + _trie_to_regex(child) for char, child in sorted(node.items()) if char != '']
+    if not branches:
+        return ''
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    group = '(?:' + '|'.join(branches) + ')'
+    # greedy '?': πρώτα δοκιμάζεται το μεγαλύτερο κλειδί, όπως στο contractions.fix
+    return group + '?' if is_end else group
+
+
+def _apply_case(matched, expansion):
+    # Η πεζότητα του contraction στο κείμενο περνάει στο expansion, όπως στο contractions.fix:
+    # "DON'T" -> "DO NOT", "Don't" -> "Do not", "don't" -> "do not", ανάμικτα -> ως έχει
+    if matched == matched.upper():
+        return expansion.upper()
+    if matched == matched.title():
+        return expansion.title()
+    if matched == matched.lower():
+        return expansion.lower()
+    if matched == matched[0].upper() + matched[1:].lower():
+        return expansion[0].upper() + expansion[1:].lower() if expansion else expansion
+    return expansion
+
+
+def _get_contraction_matcher():
+    # Χτίζει (μία φορά) ένα regex με όλα τα κλειδιά που χρησιμοποιεί το contractions.fix
+    # (contractions + leftovers + slang) οργανωμένα σε trie
+    global _contraction_matcher
+    if _contraction_matcher is None:
+        expansions = {}
+        for source in (contractions.contractions_dict, contractions.leftovers_dict, contractions.slang_dict):
+            for key, value in source.items():
+                expansions[key.lower()] = value
+
+        trie = {}
+        for key in expansions:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        pattern = re.compile(
+            rf'(?<![{_WORD_BOUND_CHARS}])(?:{_trie_to_regex(trie)})(?![{_WORD_BOUND_CHARS}])'
+        )
+        _contraction_matcher = (pattern, expansions)
+    return _contraction_matcher
+
+
+def _expand_with_offsets(text):
+    # Step 1 (ίδιο αποτέλεσμα με την expand_contractions) κρατώντας για κάθε χαρακτήρα εξόδου τη θέση του
+    # στο αρχικό κείμενο - τα expansions δείχνουν στην αρχή του contraction
+    pattern, expansions = _get_contraction_matcher()
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # όπως η expand_contractions: contractions.fix, και οι θέσεις από τη σύγκριση με το αρχικό κείμενο
+        expanded = contractions.fix(text)
+        offsets = []
+        for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, text, expanded, autojunk=False).get_opcodes():
+            offsets.extend(range(i1, i2) if tag == 'equal' else [min(i1, len(text) - 1)] * (j2 - j1))
+        return expanded, offsets
+
+    parts = []
+    offsets = []
+    position = 0
+    for match in pattern.finditer(lowered):
+        start, end = match.span()
+        expansion = _apply_case(text[start:end], expansions[match.group()])
+        parts.append(text[position:start])
+        parts.append(expansion)
+        offsets.extend(range(position, start))
+        offsets.extend([start] * len(expansion))
+        position = end
+    parts.append(text[position:])
+    offsets.extend(range(position, len(text)))
+    return ''.join(parts), offsets
+
+
+def _normalize_with_offsets(text):
+    # Ίδια βήματα με τη normalize_text αλλά χαρακτήρα-χαρακτήρα, κρατώντας για κάθε χαρακτήρα
+    # εξόδου τη θέση του στο αρχικό κείμενο
+    # Step 1 + 2: contractions και πεζά σε όλο το κείμενο, όπως η apply_lowercasing (π.χ. τελικό σίγμα)
+    expanded, offsets = _expand_with_offsets(text)
+    chars = expanded.lower()
+    if len(chars) != len(expanded):
+        # χαρακτήρες που γίνονται περισσότεροι στο lower() - όλοι δείχνουν στη θέση του αρχικού
+        offsets = [offset for char, offset in zip(expanded, offsets) for _ in range(len(char.lower()))]
+
+    # Step 3 + 4: στίξη -> κενό και συμπίεση κενών σε ένα, χωρίς κενά στην αρχή/τέλος
+    normalized = []
+    normalized_offsets = []
+    pending_space = None
+    for char, offset in zip(chars, offsets):
+        char = char.translate(_PUNCTUATION_TABLE)
+        if char.isspace():
+            if pending_space is None and normalized:
+                pending_space = offset
+            continue
+        if pending_space is not None:
+            normalized.append(' ')
+            normalized_offsets.append(pending_space)
+            pending_space = None
+        normalized.append(char)
+        normalized_offsets.append(offset)
+
+    return ''.join(normalized), normalized_offsets
+
+
+def normalize_text(text, return_offsets=False):
+    # Τα βήματα 1-4 (contractions, πεζά, στίξη, κενά) μαζί, αντί για ~40 περάσματα
+    # Δέχεται text (str) -> επιστρέφει το κανονικοποιημένο κείμενο, ίδιο με:
+    #   clean_whitespace(remove_punctuation_and_special_chars(apply_lowercasing(expand_contractions(text))))
+    # Με return_offsets=True επιστρέφει (κείμενο, offsets) όπου offsets[i] είναι η θέση του
+    # i-οστού χαρακτήρα εξόδου στο αρχικό κείμενο
+    if return_offsets:
+        return _normalize_with_offsets(text)
+
+    # Steps 1 + 2 ακριβώς όπως στο preprocess_pipeline: το lower() μετά το expansion, ώστε να ισχύουν ίδια
+    # τα context-dependent πεζά (τελικό σίγμα) και το fallback της expand_contractions
+    text = expand_contractions(text).lower()
+    if text.isascii():
+        return ' '.join(text.translate(_PUNCTUATION_TABLE).split())
+    return _SEPARATOR_RUN.sub(' ', text).strip()
+
+
 # ================ PRINT STEPS ================
 # Εκτύπωση preprocessing βήματος για debugging/ visualization
 def print_step(step_number, step_name, content): 
@@ -100,25 +269,8 @@ def print_step(step_number, step_name, content):
         print(content)
 
 
-# ================ MAIN PREPROCESSING PIPELINE ================
-
-def preprocess_pipeline(text, verbose):        
-    # Επιστρέφει Dictionary που περιέχει:
-    # - 'original': προτότυπο κείμενο
-    # - 'after_contractions': διευρημένες συντομογραφίες
-    # - 'after_lowercasing': όλα πεζά
-    # - 'after_punctuation': χωρίς σημεία στίξης
-    # - 'after_whitespace': καθαρισμένα κενά
-    # - 'tokens': tokenization
-    # - 'pos_tags': ετικέτες Part-Of-Speech
-    # - 'lemmatized_tokens': Final lemmatized tokens
-    
-    results = {}
-    
-    # αποθήκευση πρωτότυπου
-    results['original'] = text
-    if verbose: print_step(0, "Original Text", text)
-    
+# Steps 1-4 ένα-ένα, με αποθήκευση κάθε ενδιάμεσου κειμένου στο results
+def _normalize_step_by_step(text, results, verbose=False):
     # Step 1: διεύρυνση contractions
     text = expand_contractions(text)
     results['after_contractions'] = text
@@ -139,6 +291,38 @@ def preprocess_pipeline(text, verbose):
     results['after_whitespace'] = text
     if verbose: print_step(4, "After Cleaning Whitespace", text)
     
+    return text
+
+
+# ================ MAIN PREPROCESSING PIPELINE ================
+
+def preprocess_pipeline(text, verbose, fused=False):
+    # fused=True: τα βήματα 1-4 γίνονται μαζί με τη normalize_text (ίδια tokens) και δεν
+    # αποθηκεύονται τα 'after_contractions', 'after_lowercasing', 'after_punctuation'
+    # Επιστρέφει Dictionary που περιέχει:
+    # - 'original': προτότυπο κείμενο
+    # - 'after_contractions': διευρημένες συντομογραφίες
+    # - 'after_lowercasing': όλα πεζά
+    # - 'after_punctuation': χωρίς σημεία στίξης
+    # - 'after_whitespace': καθαρισμένα κενά
+    # - 'tokens': tokenization
+    # - 'pos_tags': ετικέτες Part-Of-Speech
+    # - 'lemmatized_tokens': Final lemmatized tokens
+    
+    results = {}
+    
+    # αποθήκευση πρωτότυπου
+    results['original'] = text
+    if verbose: print_step(0, "Original Text", text)
+    
+    if fused:
+        # Steps 1-4 μαζί
+        text = normalize_text(text)
+        results['after_whitespace'] = text
+        if verbose: print_step("1-4", "After Fused Normalization", text)
+    else:
+        text = _normalize_step_by_step(text, results, verbose)
+    
     # Step 5: Tokenization
     tokens = tokenize_text(text)
     results['tokens'] = tokens
@@ -157,4 +341,204 @@ def preprocess_pipeline(text, verbose):
     results['lemmatized_tokens'] = lemmatized_tokens
     if verbose: print_step(7, "After Lemmatization (FINAL)", lemmatized_tokens)
     
-    return results
\ No newline at end of file
+    return results
+
+
+# ================ BATCH PREPROCESSING ================
+# Για χιλιάδες προτάσεις: ένας tagger για όλη τη λίστα (pos_tag_sents) και ένας κοινός
+# lemmatizer με cache ανά (λέξη, POS) αντί για νέο WordNetLemmatizer ανά πρόταση
+
+def apply_lemmatization_batch(pos_tags_list):
+    # Δέχεται λίστα από pos_tags (μία ανά πρόταση) -> επιστρέφει λίστα από lemmatized tokens
+    lemmatizer = WordNetLemmatizer()
+    lemma_cache = {}
+
+    lemmatized_list = []
+    for pos_tags in pos_tags_list:
+        lemmatized_tokens = []
+        for word, tag in pos_tags:
+            key = (word, get_wordnet_pos(tag))
+            lemma = lemma_cache.get(key)
+            if lemma is None:
+                lemma = lemmatizer.lemmatize(*key)
+                lemma_cache[key] = lemma
+            lemmatized_tokens.append(lemma)
+        lemmatized_list.append(lemmatized_tokens)
+
+    return lemmatized_list
+
+
+def preprocess_pipeline_batch(texts, fused=True, compact=False, lazy=False):
+    # Batch εκδοχή του preprocess_pipeline (χωρίς verbose)
+    # Δέχεται λίστα κειμένων -> επιστρέφει λίστα από dictionaries με τα ίδια πεδία, στη σειρά εισόδου
+    # fused=True: τα βήματα 1-4 με τη normalize_text (μόνο 'after_whitespace' από τα ενδιάμεσα)
+    # compact=True: τα 'pos_tags' γίνονται TaggedSentence (interned tag IDs, ένα buffer για τα tokens) -
+    # ~6x λιγότερη μνήμη για μεγάλα corpora, διαβάζονται όπως πριν σαν list από (token, tag)
+    # lazy=True: LazyPreprocessingResult αντί για dict - το lemmatization γίνεται μόνο για όσα αποτελέσματα
+    # το ζητήσουν (το syntactic analysis διαβάζει μόνο τα 'pos_tags')
+    results_list = []
+    for text in texts:
+        results = {'original': text}
+        if fused:
+            results['after_whitespace'] = normalize_text(text)
+        else:
+            _normalize_step_by_step(text, results)
+        results_list.append(results)
+
+    # Step 5: Tokenization
+    token_lists = [tokenize_text(results['after_whitespace']) for results in results_list]
+
+    # Step 6: POS tagging όλων των προτάσεων με έναν tagger
+    pos_tags_list = pos_tag_sents(token_lists)
+    if compact:
+        pos_tags_list = [TaggedSentence.from_pos_tags(pos_tags) for pos_tags in pos_tags_list]
+    if lazy:
+        fields = _BATCH_FIELDS if fused else None
+        return [
+            LazyPreprocessingResult(results['original'], {**results, 'tokens': tokens, 'pos_tags': pos_tags}, fields)
+            for results, tokens, pos_tags in zip(results_list, token_lists, pos_tags_list)
+        ]
+
+    # Step 7: Lemmatization με κοινό lemmatizer/cache
+    lemmatized_list = apply_lemmatization_batch(pos_tags_list)
+
+    for results, tokens, pos_tags, lemmatized_tokens in zip(results_list, token_lists, pos_tags_list, lemmatized_list):
+        results['tokens'] = tokens
+        results['pos_tags'] = pos_tags
+        results['lemmatized_tokens'] = lemmatized_tokens
+
+    return results_list
+
+
+# πεδία του fused batch (χωρίς τα ενδιάμεσα κείμενα των βημάτων 1-3)
+_BATCH_FIELDS = ('original', 'after_whitespace', 'tokens', 'pos_tags', 'lemmatized_tokens')
+
+
+# ================ LAZY PREPROCESSING ================
+# Το syntactic_analysis_pipeline διαβάζει μόνο τα 'pos_tags' - το lemmatization και τα ενδιάμεσα
+# κείμενα υπολογίζονται χωρίς λόγο. Εδώ κάθε πεδίο υπολογίζεται την πρώτη φορά που ζητείται
+# (και μόνο με όσα πεδία χρειάζεται), και μετά κρατιέται.
+
+class LazyPreprocessingResult(Mapping):
+    # Ίδια πεδία με το dictionary του preprocess_pipeline, διαβάζεται όπως dict (result['pos_tags'], .get, in, dict(result))
+
+    # πεδίο -> συνάρτηση που το υπολογίζει από τα υπόλοιπα
+    # το 'after_whitespace' βγαίνει απευθείας από το 'original' με τη normalize_text (ίδιο αποτέλεσμα),
+    # ώστε τα 'after_contractions' κτλ. να μη φτιάχνονται αν δεν ζητηθούν
+    _STAGES = {
+        'after_contractions': lambda r: expand_contractions(r['original']),
+        'after_lowercasing': lambda r: apply_lowercasing(r['after_contractions']),
+        'after_punctuation': lambda r: remove_punctuation_and_special_chars(r['after_lowercasing']),
+        'after_whitespace': lambda r: normalize_text(r['original']),
+        'tokens': lambda r: tokenize_text(r['after_whitespace']),
+        'pos_tags': lambda r: apply_pos_tagging(r['tokens']),
+        'lemmatized_tokens': lambda r: apply_lemmatization(r['pos_tags']),
+    }
+    _FIELDS = ('original',) + tuple(_STAGES)
+
+    def __init__(self, text, values=None, fields=None):
+        # values: πεδία που έχουν ήδη υπολογιστεί (π.χ. από το preprocess_pipeline_batch)
+        # fields: τα πεδία του αποτελέσματος, default όλα (το fused batch δεν έχει τα ενδιάμεσα των βημάτων 1-3)
+        self._values = {'original': text, **(values or {})}
+        self._fields = self._FIELDS if fields is None else tuple(fields)
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key not in self._fields:
+                raise KeyError(key)
+            self._values[key] = self._STAGES[key](self)
+        return self._values[key]
+
+    def __contains__(self, key):
+        # χωρίς υπολογισμό (το Mapping.__contains__ καλεί το __getitem__)
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __reduce__(self):
+        # pickle (π.χ. αποτέλεσμα από worker process): τα πεδία υπολογίζονται εδώ και φτάνουν ως dict,
+        # ώστε το lemmatization να μη γίνει στο process που τα παραλαμβάνει
+        return dict, (dict(self),)
+
+    def computed(self):
+        # Τα πεδία που έχουν ήδη υπολογιστεί
+        return list(self._values)
+
+    def __repr__(self):
+        return f"LazyPreprocessingResult(computed={self.computed()})"
+
+
+def preprocess_pipeline_lazy(text):
+    # Lazy εκδοχή του preprocess_pipeline (χωρίς verbose): επιστρέφει LazyPreprocessingResult
+    # π.χ. syntactic_analysis_pipeline(preprocess_pipeline_lazy(text), verbose=False) κάνει μόνο tokenization + tagging
+    return LazyPreprocessingResult(text)
+
+
+# ================ STREAMING PREPROCESSING ================
+# Για μεγάλα αρχεία: το κείμενο διαβάζεται σε κομμάτια, χωρίζεται σε προτάσεις και κάθε πρόταση
+# επιστρέφεται (yield) μόλις επεξεργαστεί - η μνήμη δεν εξαρτάται από το μέγεθος του corpus
+
+# όριο πρότασης: κενό μετά από . ! ? ή αλλαγή γραμμής
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n')
+# μέγιστο μήκος πρότασης σε χαρακτήρες: κείμενο χωρίς όρια (π.χ. ένα αρχείο χωρίς στίξη) κόβεται εκεί,
+# ώστε η μνήμη να μην εξαρτάται από το μέγεθος του αρχείου
+MAX_SENTENCE_LENGTH = 10000
+
+
+def split_sentences_stream(chunks, max_length=MAX_SENTENCE_LENGTH):
+    # Δέχεται iterable από κομμάτια κειμένου (π.χ. main.load_file_stream) -> yield μία πρόταση τη φορά
+    # Κρατάει στη μνήμη μόνο την τελευταία μισή πρόταση κάθε κομματιού (το πολύ max_length χαρακτήρες)
+    buffer = ''
+    for chunk in chunks:
+        # το buffer δεν έχει όριο πρότασης (ελέγχθηκε στο προηγούμενο κομμάτι): το scan ξεκινάει από το νέο
+        # κομμάτι, έναν χαρακτήρα πίσω για το lookbehind
+        start = max(len(buffer) - 1, 0)
+        buffer += chunk
+        last = 0
+        for match in _SENTENCE_BOUNDARY.finditer(buffer, start):
+            sentence = buffer[last:match.start()].strip()
+            if sentence:
+                yield sentence
+            last = match.end()
+        while len(buffer) - last > max_length:
+            # πρόταση χωρίς όριο μεγαλύτερη από max_length: κόβεται στο τελευταίο κενό (ή στο max_length)
+            cut = buffer.rfind(' ', last + 1, last + max_length)
+            if cut < 0:
+                cut = last + max_length
+            sentence = buffer[last:cut].strip()
+            if sentence:
+                yield sentence
+            last = cut
+        buffer = buffer[last:]
+
+    sentence = buffer.strip()
+    if sentence:
+        yield sentence
+
+
+def preprocess_pipeline_stream(sentences, keep_intermediate=False, batch_size=256):
+    # Streaming εκδοχή του preprocess_pipeline: δέχεται iterable από προτάσεις -> yield ένα record ανά πρόταση
+    # Κάθε record έχει 'original', 'tokens', 'pos_tags', 'lemmatized_tokens'
+    # keep_intermediate=True: κρατάει και τα ενδιάμεσα κείμενα ('after_contractions', ..., 'after_whitespace')
+    # Οι προτάσεις επεξεργάζονται σε ομάδες των batch_size (preprocess_pipeline_batch), άρα στη μνήμη
+    # υπάρχει το πολύ μία ομάδα
+    batch = []
+    for sentence in sentences:
+        batch.append(sentence)
+        if len(batch) >= batch_size:
+            yield from _preprocess_stream_batch(batch, keep_intermediate)
+            batch = []
+
+    if batch:
+        yield from _preprocess_stream_batch(batch, keep_intermediate)
+
+
+def _preprocess_stream_batch(batch, keep_intermediate):
+    for results in preprocess_pipeline_batch(batch, fused=not keep_intermediate):
+        if not keep_intermediate:
+            del results['after_whitespace']
+        yield results
@@ -1,8 +1,13 @@
 # Συντακτική ανακατασκευή χρησιμοποιώντας ετικέτες POS, εξαγωγή ουσιαστικών (noun),
 # string transformation με βάση κανόνες και pattern matching
 import re
+from bisect import bisect_left, bisect_right
 from typing import List, Tuple, Dict
 
+# τα βοηθητικά ρήματα ορίζονται στο chunking μαζί με την κωδικοποίηση των tags
+from sentence_pipeline.chunking import AUXILIARY_VERBS, encode_tags, chunk_noun_phrases, chunk_verb_groups
+from sentence_pipeline.corpus_screening import flag_structural_problems
+
 # ============== CONSTANTS ==============
 
 # συνδετικές λέξεις
@@ -11,15 +16,6 @@ SUBORDINATE_CONJUNCTIONS = {
     'unless', 'until', 'whereas', 'though', 'after', 'before', 'as'
 }
 
-# βοηθητικά ρήματα
-AUXILIARY_VERBS = {
-    'be', 'am', 'is', 'are', 'was', 'were', 'been', 'being',
-    'have', 'has', 'had', 'having',
-    'do', 'does', 'did', 'doing',
-    'will', 'would', 'shall', 'should', 'may', 'might', 'must', 
-    'can', 'could', 'ought'
-}
-
 
 # ΝΝ = common noun
 # NNS = common noun plural
@@ -48,6 +44,82 @@ AUXILIARY_VERBS = {
 
 
 
+# ============== ANALYSIS CONTEXT ==============
+
+class AnalysisContext:
+    # Κοινά αποτελέσματα chunking για μία ακολουθία POS tags: noun phrases και verb groups
+    # υπολογίζονται μία φορά (την πρώτη που ζητούνται) και ξαναϋπολογίζονται μόνο αν αλλάξουν τα tags.
+    # Το μοιράζονται detect_and_fix_problems, extract_svo_components, handle_clauses και το pipeline
+    # αντί να ξανατρέχει το καθένα identify_noun_phrases / find_verb_groups.
+
+    def __init__(self, pos_tags):
+        self.pos_tags = pos_tags
+        self._encoded = None
+        self._noun_phrases = None
+        self._verb_groups = None
+        self._noun_phrase_bounds = None
+
+    def update(self, pos_tags):
+        # Νέα tags - τα cached αποτελέσματα πετιούνται μόνο αν διαφέρουν από τα τρέχοντα
+        if pos_tags is not self.pos_tags and pos_tags != self.pos_tags:
+            self._encoded = None
+            self._noun_phrases = None
+            self._verb_groups = None
+            self._noun_phrase_bounds = None
+        self.pos_tags = pos_tags
+
+    def encoded(self):
+        # ένας χαρακτήρας ανά tag - κοινό για noun phrases και verb groups
+        if self._encoded is None:
+            self._encoded = encode_tags(self.pos_tags)
+        return self._encoded
+
+    def noun_phrases(self):
+        if self._noun_phrases is None:
+            self._noun_phrases = chunk_noun_phrases(self.pos_tags, self.encoded())
+        return self._noun_phrases
+
+    def verb_groups(self):
+        if self._verb_groups is None:
+            self._verb_groups = chunk_verb_groups(self.pos_tags, self.encoded())
+        return self._verb_groups
+
+    def noun_phrase_bounds(self):
+        # (starts, ends) των noun phrases για binary search (βλ. _noun_phrase_bounds)
+        if self._noun_phrase_bounds is None:
+            self._noun_phrase_bounds = _noun_phrase_bounds(self.noun_phrases())
+        return self._noun_phrase_bounds
+
+    def sub_context(self, start, end):
+        # Context για το τμήμα pos_tags[start:end] (π.χ. μία πρόταση από το handle_clauses).
+        # Αν κανένα chunk δεν διασχίζει τα όρια start/end, τα chunks του τμήματος είναι ακριβώς αυτά
+        # της ολόκληρης ακολουθίας μέσα στο [start, end) - αλλιώς υπολογίζονται από την αρχή
+        sub = AnalysisContext(self.pos_tags[start:end])
+        if self._encoded is not None:
+            sub._encoded = self._encoded[start:end]
+        sub._noun_phrases = _slice_spans(self.noun_phrases(), start, end)
+        sub._verb_groups = _slice_spans(self.verb_groups(), start, end)
+        return sub
+
+
+def _slice_spans(spans, start, end):
+    # spans: [(span_start, span_end, ...)] ταξινομημένα -> ίδια spans μετατοπισμένα στο [start, end) ή None
+    sliced = []
+    for span in spans:
+        span_start, span_end = span[0], span[1]
+        if span_start < start < span_end or span_start < end < span_end:
+            return None
+        if span_start >= start and span_end <= end:
+            sliced.append((span_start - start, span_end - start) + tuple(span[2:]))
+    return sliced
+
+
+def _noun_phrase_bounds(noun_phrases):
+    # Τα noun phrases είναι ταξινομημένα και δεν επικαλύπτονται, οπότε και τα starts και τα ends
+    # είναι αύξουσες λίστες -> bisect για "τελευταίο NP πριν από" / "πρώτο NP μετά από" μία θέση
+    return [span[0] for span in noun_phrases], [span[1] for span in noun_phrases]
+
+
 # ============== STEP 1: POS PATTERN DETECTION ==============
 
 def identify_noun_phrases(pos_tags):
@@ -58,85 +130,14 @@ def identify_noun_phrases(pos_tags):
     # - NN(S)? alone
     # - PRP alone
     # Επιστρέφει: List[Tuple[start_idx, end_idx, tokens]]
-    noun_phrases = []
-    i = 0
-    
-    while i < len(pos_tags):
-        phrase_start = i
-        phrase_tokens = []
-        
-        # Pronouns alone (PRP)
-        if pos_tags[i][1] == 'PRP':
-            noun_phrases.append((i, i+1, [pos_tags[i][0]]))
-            i += 1
-            continue
-        
-        # Determiners (DT) or Possessives (PRP$)
-        if pos_tags[i][1] in ['DT', 'PRP$']:
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-        
-        # Adjectives (JJ, JJR, JJS)
-        while i < len(pos_tags) and pos_tags[i][1] in ['JJ', 'JJR', 'JJS']:
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-        
-        # Nouns (NN, NNS, NNP, NNPS)
-        if i < len(pos_tags) and pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-            
-            # We have a noun phrase
-            if len(phrase_tokens) > 0:
-                noun_phrases.append((phrase_start, i, phrase_tokens))
-        else:
-            # Not a complete noun phrase
-            if len(phrase_tokens) == 0:
-                # Check if standalone noun
-                if i < len(pos_tags) and pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-                    noun_phrases.append((i, i+1, [pos_tags[i][0]]))
-                    i += 1
-                else:
-                    i = phrase_start + 1
-            else:
-                i = phrase_start + 1
-    
-    return noun_phrases
+    # Τρέχει ως compiled regex πάνω στα κωδικοποιημένα tags (βλ. sentence_pipeline/chunking.py)
+    return chunk_noun_phrases(pos_tags)
 
 # Αναγνώριση ομάδων ρημάτων και διάκριση βοηθητικών από κύριων ρημάτων 
 def find_verb_groups(pos_tags):
     # Επιστρέφει: List of (start_idx, end_idx, tokens, is_main_verb)
-    verb_groups = []
-    i = 0
-    
-    while i < len(pos_tags):
-        phrase_start = i
-        phrase_tokens = []
-        
-        # Έλεγχος κύριου ή δευτερεύων / βοηθητικού
-        if pos_tags[i][1] == 'MD' or (pos_tags[i][1].startswith('VB') and pos_tags[i][0].lower() in AUXILIARY_VERBS):
-            phrase_tokens.append(pos_tags[i][0])
-            i += 1
-        
-        # κύριο ρήμα
-        if i < len(pos_tags) and pos_tags[i][1].startswith('VB'):
-            phrase_tokens.append(pos_tags[i][0])
-            is_main = pos_tags[i][0].lower() not in AUXILIARY_VERBS
-            i += 1
-            
-            if i < len(pos_tags) and pos_tags[i][1] == 'RP':
-                phrase_tokens.append(pos_tags[i][0])
-                i += 1
-            
-            if len(phrase_tokens) > 0:
-                verb_groups.append((phrase_start, i, phrase_tokens, is_main))
-        else:
-            if len(phrase_tokens) > 0:
-                verb_groups.append((phrase_start, i, phrase_tokens, False))
-            else:
-                i += 1
-    
-    return verb_groups
+    # MD/βοηθητικό + VB* + RP? - τρέχει ως compiled regex (βλ. sentence_pipeline/chunking.py)
+    return chunk_verb_groups(pos_tags)
 
 # Εντοπισμός δευτερεύουσων συδνέσμων χρησιμοποιώντας μόνο την λίστα λέξεων 
 def detect_subordinate_conjunctions(pos_tags):
@@ -149,34 +150,46 @@ def detect_subordinate_conjunctions(pos_tags):
     return subordinate_markers
 
 # ============== STEP 2: PROBLEMATIC PATTERN DETECTION WITH FIXES ==============
+# Κάθε διόρθωση μετακινεί ένα μόνο token. Οι fix_* επιστρέφουν νέα λίστα (όπως πριν), ενώ το
+# detect_and_fix_problems εφαρμόζει τις μετακινήσεις in-place με _move_token, ώστε κάθε διόρθωση να
+# κοστίζει όσο η απόσταση της μετακίνησης και όχι όσο όλη η πρόταση (γραμμικό σε μακριές προτάσεις)
+
+def _move_token(pos_tags, source_idx, target_idx):
+    # Μετακίνηση του pos_tags[source_idx] στη θέση target_idx, in-place
+    # Μετατοπίζονται μόνο τα tokens ανάμεσα (slice assignment ίδιου μήκους - χωρίς αντιγραφή της υπόλοιπης λίστας)
+    token = pos_tags[source_idx]
+    if source_idx < target_idx:
+        pos_tags[source_idx:target_idx] = pos_tags[source_idx+1:target_idx+1]
+    elif source_idx > target_idx:
+        pos_tags[target_idx+1:source_idx+1] = pos_tags[target_idx:source_idx]
+    pos_tags[target_idx] = token
+
+
+def _find_noun_after_adjective(pos_tags, problem_idx):
+    # Εύρεση πλησιέστερου ουσιαστικού μετά το επίθετο (εντός 3 tokens) - επιστρέφει index ή None
+    for i in range(problem_idx + 2, min(problem_idx + 5, len(pos_tags))):
+        if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
+            return i
+    return None
+
+
 def fix_preposition_adjective_no_noun(pos_tags, problem_idx):
     # Fix: IN + JJ without NN
     # Επισύναψη επίθετου στην πλησιέστερη ακόλουθη ονοματική φράση - Επιστρέφει τροποποιημένα POS tags 
-    # Εύρεση πλησιέστερου ουσιαστικού μετά το επίθετο
-    nearest_noun_idx = None
-    for i in range(problem_idx + 2, min(problem_idx + 5, len(pos_tags))):
-        if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS']:
-            nearest_noun_idx = i
-            break
+    nearest_noun_idx = _find_noun_after_adjective(pos_tags, problem_idx)
     
     if nearest_noun_idx:
-        adj_token = pos_tags[problem_idx + 1] # Επίθετο δίπλα από το ουσιαστικό 
-        # Αναδιάταξη: διατήρηση πρόθεσης, μετακίνηση επιθέτου και ουσιαστικού μαζί
-        new_tags = (
-            pos_tags[:problem_idx+1] +  # Keep up to preposition
-            [adj_token] +                # Adjective
-            [pos_tags[nearest_noun_idx]] +  # Noun
-            pos_tags[problem_idx+2:nearest_noun_idx] +  # In-between
-            pos_tags[nearest_noun_idx+1:]  # Rest
-        )
+        # Αναδιάταξη: διατήρηση πρόθεσης και επιθέτου, το ουσιαστικό αμέσως μετά το επίθετο
+        new_tags = list(pos_tags)
+        _move_token(new_tags, nearest_noun_idx, problem_idx + 2)
         return new_tags
     
     return pos_tags
 
-# ρήμα χωρίς σαφές υποκείμενο
-def fix_verb_without_subject(pos_tags, verb_idx):
-    # Εύρεση πλησιέστερου NP/PRP και μετακίνησή τους πριν το ρήμα
-    # Αναζήτηση υποψήφιων υποκειμένων γύρω από το ρήμα - εντός 5 tokens 
+
+def _find_subject_move(pos_tags, verb_idx):
+    # Εύρεση πλησιέστερου NP/PRP γύρω από το ρήμα (εντός 5 tokens) και της θέσης όπου πρέπει να πάει
+    # Επιστρέφει (subject_idx, target_idx) ή None αν δεν χρειάζεται μετακίνηση
     subject_idx = None
     
     # Πρώτα έλεγχος πριν το ρήμα
@@ -191,60 +204,56 @@ def fix_verb_without_subject(pos_tags, verb_idx):
                 subject_idx = i
                 break
     
-    if subject_idx is not None and subject_idx != verb_idx - 1:
-        # Μετακίνησε το υποκείμενο πριν το ρήμα 
-        subject_token = pos_tags[subject_idx]
-        
-        if subject_idx < verb_idx:
-            # Υποκείμενο είναι πριν αλλά όχι αμέσως πριν
-            new_tags = (
-                pos_tags[:subject_idx] +  # Before 
-                pos_tags[subject_idx+1:verb_idx] +  # Between (subject-verb)
-                [subject_token] +  # Subject moved 
-                pos_tags[verb_idx:]  # Verb and rest
-            )
-        else:
-            # Υποκείμενο είναι μετά, μετακίνησε το πριν
-            new_tags = (
-                pos_tags[:verb_idx] +  # Before
-                [subject_token] +  # Subject moved 
-                pos_tags[verb_idx:subject_idx] +  # Verb to subject
-                pos_tags[subject_idx+1:]  # After subject
-            )
-        
+    if subject_idx is None or subject_idx == verb_idx - 1:
+        return None
+    
+    # Υποκείμενο πριν (αλλά όχι αμέσως πριν) -> ακριβώς πριν το ρήμα, μετά -> στη θέση του ρήματος
+    target_idx = verb_idx - 1 if subject_idx < verb_idx else verb_idx
+    return subject_idx, target_idx
+
+
+# ρήμα χωρίς σαφές υποκείμενο
+def fix_verb_without_subject(pos_tags, verb_idx):
+    # Εύρεση πλησιέστερου NP/PRP και μετακίνησή τους πριν το ρήμα
+    move = _find_subject_move(pos_tags, verb_idx)
+    
+    if move is not None:
+        new_tags = list(pos_tags)
+        _move_token(new_tags, *move)
         return new_tags
     
     return pos_tags
 
-# Η πρόταση ξεκινάει με επίθετο/ επίρρημα χωρίς δομή
-def fix_unusual_start(pos_tags):
-    # Μετακίνηση μετά το πρώτο noun phrase ή verb
+
+def _find_unusual_start_target(pos_tags):
+    # Βρες πρώτο ουσιαστικό ή ρήμα μετά το πρώτο token - επιστρέφει index ή None
     if len(pos_tags) < 2:
-        return pos_tags
-    
-    first_token = pos_tags[0]
+        return None
     
-    # Βρες πρώτο ουσιαστικό ή ρήμα
-    target_idx = None
     for i in range(1, len(pos_tags)):
         if pos_tags[i][1] in ['NN', 'NNS', 'NNP', 'NNPS', 'PRP'] or pos_tags[i][1].startswith('VB'):
-            target_idx = i
-            break
+            return i
+    return None
+
+
+# Η πρόταση ξεκινάει με επίθετο/ επίρρημα χωρίς δομή
+def fix_unusual_start(pos_tags):
+    # Μετακίνηση μετά το πρώτο noun phrase ή verb
+    target_idx = _find_unusual_start_target(pos_tags)
     
     if target_idx:
         # Μετακίνηση επιθέτου/επιρρήματος μετά τον στόχο
-        new_tags = (
-            pos_tags[1:target_idx+1] +  # Skip first, go to target
-            [first_token] +  # Move first token here
-            pos_tags[target_idx+1:]  # Rest
-        )
+        new_tags = list(pos_tags)
+        _move_token(new_tags, 0, target_idx)
         return new_tags
     
     return pos_tags
 
 # Εντοπισμός προβληματικών μοτίβων και εφαρμογή διορθώσεων
-def detect_and_fix_problems(pos_tags):
+def detect_and_fix_problems(pos_tags, context=None):
     # Επιστρέφει: (fixed_pos_tags, problems_found)
+    # context: (optional) AnalysisContext - ενημερώνεται με τα διορθωμένα tags
+    # Όλες οι διορθώσεις γίνονται in-place πάνω στο ίδιο αντίγραφο (fixed_tags) - O(n) συνολικά
     problems = []
     fixed_tags = list(pos_tags)
     
@@ -263,11 +272,18 @@ def detect_and_fix_problems(pos_tags):
                     'position': i,
                     'original': [fixed_tags[i][0], fixed_tags[i+1][0]]
                 })
-                fixed_tags = fix_preposition_adjective_no_noun(fixed_tags, i)
+                nearest_noun_idx = _find_noun_after_adjective(fixed_tags, i)
+                if nearest_noun_idx:
+                    _move_token(fixed_tags, nearest_noun_idx, i + 2)
         i += 1
     
     # Problem 2: Verb without subject (check main verbs only)
-    verb_groups = find_verb_groups(fixed_tags)
+    if context is not None:
+        # αντίγραφο για το context, αφού τα fixed_tags θα αλλάξουν in-place παρακάτω
+        context.update(list(fixed_tags))
+        verb_groups = context.verb_groups()
+    else:
+        verb_groups = find_verb_groups(fixed_tags)
     for start, end, tokens, is_main in verb_groups:
         if is_main:
             # Check for subject before verb
@@ -283,7 +299,9 @@ def detect_and_fix_problems(pos_tags):
                     'position': start,
                     'original': tokens
                 })
-                fixed_tags = fix_verb_without_subject(fixed_tags, start)
+                move = _find_subject_move(fixed_tags, start)
+                if move is not None:
+                    _move_token(fixed_tags, *move)
     
     # Problem 3: Unusual start
     if len(fixed_tags) > 0 and fixed_tags[0][1] in ['JJ', 'RB', 'RBR', 'RBS']:
@@ -294,15 +312,21 @@ def detect_and_fix_problems(pos_tags):
                 'original': [fixed_tags[0][0]]
             })
             # Apply fix
-            fixed_tags = fix_unusual_start(fixed_tags)
+            target_idx = _find_unusual_start_target(fixed_tags)
+            if target_idx:
+                _move_token(fixed_tags, 0, target_idx)
+    
+    if context is not None:
+        context.update(fixed_tags)
     
     return fixed_tags, problems
 
 # ============== STEP 3: S-V-O EXTRACTION ==============
 
 # Εξαγωγή SVO Υποκείμενο-Ρήμα-Αντικείμενο
-def extract_svo_components(pos_tags):
+def extract_svo_components(pos_tags, context=None):
     # Επιστρέφει dictionary με: 'subject', 'verb', 'object', 'prepositional_phrases', 'other'
+    # context: (optional) AnalysisContext για τα ίδια pos_tags - noun phrases / verb groups από εκεί
     components = {
         'subject': [],
         'verb': [],
@@ -311,8 +335,15 @@ def extract_svo_components(pos_tags):
         'other': []
     }
     
-    noun_phrases = identify_noun_phrases(pos_tags)
-    verb_groups = find_verb_groups(pos_tags)
+    if context is not None:
+        context.update(pos_tags)
+        noun_phrases = context.noun_phrases()
+        verb_groups = context.verb_groups()
+        np_starts, np_ends = context.noun_phrase_bounds()
+    else:
+        noun_phrases = identify_noun_phrases(pos_tags)
+        verb_groups = find_verb_groups(pos_tags)
+        np_starts, np_ends = _noun_phrase_bounds(noun_phrases)
     
     # Βρες όλα τα ρήματα (για να ελέγξουμε πολλαπλά ρήματα) 
     all_verb_positions = [start for start, end, tokens, is_main in verb_groups]
@@ -339,47 +370,44 @@ def extract_svo_components(pos_tags):
     components['prepositional_phrases'] = prepositional_phrases
     
     # Υποκείμενο: κοντινότερο NP πριν το κύριο ρήμα (όχι το πρώτο NP)
+    # = το τελευταίο NP με end <= main_verb_idx (τα ends είναι αύξοντα)
     if main_verb_idx is not None:
-        closest_np = None
-        closest_distance = float('inf')
-        
-        for start, end, tokens in noun_phrases:
-            if end <= main_verb_idx:
-                distance = main_verb_idx - end
-                if distance < closest_distance:
-                    closest_distance = distance
-                    closest_np = tokens
-        
-        if closest_np:
-            components['subject'] = closest_np
+        closest = bisect_right(np_ends, main_verb_idx) - 1
+        if closest >= 0:
+            components['subject'] = noun_phrases[closest][2]
     
     # Υποκείμενο: Πρώτο NP μετά το κύριο ρήμα
     if main_verb_idx is not None:
         verb_end = main_verb_idx + len(main_verb_tokens)
-        for start, end, tokens in noun_phrases:
-            if start >= verb_end:
-                components['object'] = tokens
-                break
+        first_after = bisect_left(np_starts, verb_end)
+        if first_after < len(noun_phrases):
+            components['object'] = noun_phrases[first_after][2]
     
     # Συλλογή υπόλοιπων tokens (εκτός από prep phrases)
-    used_indices = set()
+    # used[i] = 1 αν το token i ανήκει σε subject/object/ρήμα/prep phrase
+    used = bytearray(len(pos_tags))
     
     # Σημείωσε χρησιμοποιημένους δείκτες
-    for start, end, tokens in noun_phrases:
-        if tokens == components['subject'] or tokens == components['object']:
-            used_indices.update(range(start, end))
+    # (όλα τα NP με ίδια tokens με το subject/object, όχι μόνο αυτά τα δύο - όπως πριν)
+    subject, obj = components['subject'], components['object']
+    if subject or obj:
+        for start, end, tokens in noun_phrases:
+            if tokens == subject or tokens == obj:
+                used[start:end] = b'\x01' * (end - start)
     
     if main_verb_idx is not None:
-        used_indices.update(range(main_verb_idx, main_verb_idx + len(main_verb_tokens)))
+        verb_end = main_verb_idx + len(main_verb_tokens)
+        used[main_verb_idx:verb_end] = b'\x01' * (verb_end - main_verb_idx)
     
     # Σημείωσε τους δείκτες προθετικών φράσεων
     for prep_idx, np_start, np_end in prepositional_phrases:
-        used_indices.update(range(prep_idx, np_end))
+        used[prep_idx:np_end] = b'\x01' * (np_end - prep_idx)
     
     # Σύλλεξε τα λοιπά tokens
-    for i, (token, pos) in enumerate(pos_tags):
-        if i not in used_indices and token not in [',', '.', '!', '?']:
-            components['other'].append(token)
+    components['other'] = [
+        token for (token, pos), is_used in zip(pos_tags, used)
+        if not is_used and token not in (',', '.', '!', '?')
+    ]
     
     return components
     
@@ -388,12 +416,16 @@ def extract_prepositional_phrases(pos_tags, noun_phrases):
     # Επιστρέφει λίστα
     prep_phrases = []
     
+    # NP ανά θέση έναρξης - άμεσο lookup αντί για scan όλων των NP για κάθε IN
+    np_end_by_start = {}
+    for start, end, tokens in noun_phrases:
+        np_end_by_start.setdefault(start, end)
+    
     for i, (token, pos) in enumerate(pos_tags):
         if pos == 'IN': # Ψάξε το NP που ακολουθεί 
-            for start, end, tokens in noun_phrases:
-                if start == i + 1:  
-                    prep_phrases.append((i, start, end))
-                    break
+            end = np_end_by_start.get(i + 1)
+            if end is not None:
+                prep_phrases.append((i, i + 1, end))
     
     return prep_phrases
 
@@ -436,12 +468,13 @@ def identify_clauses(pos_tags):
     return clauses
 
 
-def reorder_clause(pos_tags):
+def reorder_clause(pos_tags, context=None):
     # Αναδιάταξη μιας μεμονωμένης πρότασης σε δομή S-V-O με προθετικές φράσεις.
+    # context: (optional) AnalysisContext - μόνο όταν η πρόταση είναι ολόκληρη η ακολουθία του context
     if len(pos_tags) == 0:
         return ""
     
-    components = extract_svo_components(pos_tags)
+    components = extract_svo_components(pos_tags, context)
     # Σχηματισμός πρότασης: Υποκείμενο + Ρήμα + Αντικείμενο + Προθετικές φράσεις + Άλλο
     parts = []
     
@@ -471,7 +504,7 @@ def reorder_clause(pos_tags):
     return result
 
 
-def handle_clauses(pos_tags):
+def handle_clauses(pos_tags, context=None):
     # Χειρισμός πολλαπλών προτάσεων με καλύτερη ανίχνευση ορίων.
     # 1. Διαχωρισμός με συντονισμένους συνδέσμους (and, but, or)
     # 2. Προσδιορισμός εξαρτημένων προτάσεων (με δευτερεύοντες συνδέσμους)
@@ -486,12 +519,14 @@ def handle_clauses(pos_tags):
     # Αν υπάρχουν πολλαπλοί συντονισμένοι σύνδεσμοι, χωρίσε τους σε ξεχωριστές προτάσεις
     if len(coord_conj_positions) > 0:
         clauses = []
+        clause_ranges = []  # (start, end) κάθε πρότασης στα pos_tags, για το context
         start = 0
         
         for conj_pos in coord_conj_positions:
             clause_tokens = pos_tags[start:conj_pos]
             if len(clause_tokens) > 0:
                 clauses.append((clause_tokens, None))  # (tokens, conjunction)
+                clause_ranges.append((start, conj_pos))
             
             conjunction = pos_tags[conj_pos][0] # Αποθήκευση συνδέσμο
             start = conj_pos + 1
@@ -499,12 +534,14 @@ def handle_clauses(pos_tags):
         
         if start < len(pos_tags): # Τε΄λευταία πρόταση
             clauses.append((pos_tags[start:], None))
+            clause_ranges.append((start, len(pos_tags)))
         
         # Αναδιάταξη και συνδυασμός κάθε πρότασης
         reconstructed_clauses = []
-        for clause_tokens, conj in clauses:
+        for (clause_tokens, conj), (clause_start, clause_end) in zip(clauses, clause_ranges):
             if len(clause_tokens) > 0:
-                reordered = reorder_clause(clause_tokens)
+                clause_context = context.sub_context(clause_start, clause_end) if context is not None else None
+                reordered = reorder_clause(clause_tokens, clause_context)
                 if conj:
                     reconstructed_clauses.append(f"{reordered} {conj}")
                 else:
@@ -516,14 +553,17 @@ def handle_clauses(pos_tags):
     clause_info = identify_clauses(pos_tags)
     
     if len(clause_info['dependent']) == 0:
-        return reorder_clause(pos_tags)
+        return reorder_clause(pos_tags, context)
     
     main_tokens = [pos_tags[i] for i in clause_info['main']]
     dependent_tokens = [pos_tags[i] for i in clause_info['dependent']]
     
     main_reconstructed = ""
     if len(main_tokens) > 0:
-        main_reconstructed = reorder_clause(main_tokens)
+        main_context = None
+        if context is not None:
+            main_context = context.sub_context(clause_info['main'][0], clause_info['main'][-1] + 1)
+        main_reconstructed = reorder_clause(main_tokens, main_context)
     
     dependent_reconstructed = ""
     if len(dependent_tokens) > 0:
@@ -531,7 +571,10 @@ def handle_clauses(pos_tags):
         rest_tokens = dependent_tokens[1:]
         
         if len(rest_tokens) > 0:
-            rest_reconstructed = reorder_clause(rest_tokens)
+            rest_context = None
+            if context is not None:
+                rest_context = context.sub_context(clause_info['dependent'][1], clause_info['dependent'][-1] + 1)
+            rest_reconstructed = reorder_clause(rest_tokens, rest_context)
             dependent_reconstructed = f"{conjunction} {rest_reconstructed}".strip()
         else:
             dependent_reconstructed = conjunction
@@ -577,13 +620,15 @@ def print_analysis_step(step_number, step_name, content):
 
 # ============== MAIN SYNTACTIC ANALYSIS PIPELINE ==============
 
-def syntactic_analysis_pipeline(preprocessing_dict, verbose):
+def syntactic_analysis_pipeline(preprocessing_dict, verbose, check_problems=True):
     # 1. Εντοπισμός και διόρθωση προβληματικών μοτίβων
     # 2. Προσδιορισμός noun phrases και verb groups
     # 3. Εξαγωγή S-V-O στοιχείων 
     # 4. Προσδιορισμός και αναδιάταξη προτάσεων
     # 5. Αναδόμηση πρότασης
     # Παίρνει pos_tags από το preprocessing και μεταβλητή που αν αληθής δείχνει τα βήματα
+    # check_problems=False: ο έλεγχος του corpus (flag_structural_problems) έδειξε ότι η πρόταση δεν έχει
+    # προβληματικά μοτίβα, οπότε το detect_and_fix_problems παραλείπεται (θα επέστρεφε τα ίδια tags, [])
     # Επιστρέφει dicrionary με: original, reconstructed, analysis details
     pos_tags = preprocessing_dict.get('pos_tags', [])
 
@@ -607,8 +652,15 @@ def syntactic_analysis_pipeline(preprocessing_dict, verbose):
         print("="*80)
         print_analysis_step(0, "Original Sentence", original)
     
+    # Κοινό context: noun phrases / verb groups υπολογίζονται μία φορά για τα (διορθωμένα) tags
+    context = AnalysisContext(pos_tags)
+    
     # Step 1: Εντοπισμός και διόρθωση προβλημάτων
-    fixed_pos_tags, problems = detect_and_fix_problems(pos_tags)
+    if check_problems:
+        fixed_pos_tags, problems = detect_and_fix_problems(pos_tags, context)
+    else:
+        fixed_pos_tags, problems = list(pos_tags), []
+        context.update(fixed_pos_tags)
     
     if verbose:
         if len(problems) > 0:
@@ -617,12 +669,12 @@ def syntactic_analysis_pipeline(preprocessing_dict, verbose):
             print_analysis_step(1, "Problems Detected & Fixed", "No problems detected")
     
     # Step 2: Αναγνώριση noun phrases
-    noun_phrases = identify_noun_phrases(fixed_pos_tags)
+    noun_phrases = context.noun_phrases()
     if verbose:
         print_analysis_step(2, "Noun Phrases Identified", noun_phrases)
     
     # Step 3: Αναγνώριση verb groups 
-    verb_groups = find_verb_groups(fixed_pos_tags)
+    verb_groups = context.verb_groups()
     if verbose:
         formatted_verbs = [(start, end, tokens, "MAIN" if is_main else "AUX") 
                           for start, end, tokens, is_main in verb_groups]
@@ -634,12 +686,12 @@ def syntactic_analysis_pipeline(preprocessing_dict, verbose):
         print_analysis_step(4, "Clause Structure", clauses)
     
     # Step 5: Εξαγωγή S-V-O 
-    svo_components = extract_svo_components(fixed_pos_tags)
+    svo_components = extract_svo_components(fixed_pos_tags, context)
     if verbose:
         print_analysis_step(5, "S-V-O Components Extracted", svo_components)
     
     # Step 6: Ανακατασκευή με χειρισμό προτάσεων
-    reconstructed = handle_clauses(fixed_pos_tags)
+    reconstructed = handle_clauses(fixed_pos_tags, context)
     
     # Step 7: Καθαρισμός
     reconstructed = re.sub(r'\s+([.,!?])', r'\1', reconstructed)
@@ -667,3 +719,19 @@ def syntactic_analysis_pipeline(preprocessing_dict, verbose):
         'clauses': clauses,
         'svo_components': svo_components
     }
+
+
+def syntactic_analysis_pipeline_batch(preprocessing_dicts, screen=True):
+    # Batch εκδοχή (χωρίς verbose): λίστα από preprocessing dictionaries -> λίστα αποτελεσμάτων στη σειρά εισόδου
+    # Χρειάζεται μόνο τα pos_tags, άρα δεν υπάρχει tagger/lemmatizer να μοιραστεί
+    # screen=True: ένας vectorized έλεγχος για όλο το batch, και το detect_and_fix_problems τρέχει
+    # μόνο για τις προτάσεις που επισημάνθηκαν
+    preprocessing_dicts = list(preprocessing_dicts)
+    if screen:
+        flags = flag_structural_problems([d.get('pos_tags', []) for d in preprocessing_dicts]).tolist()
+    else:
+        flags = [True] * len(preprocessing_dicts)
+    return [
+        syntactic_analysis_pipeline(preprocessing_dict, verbose=False, check_problems=flagged)
+        for preprocessing_dict, flagged in zip(preprocessing_dicts, flags)
+    ]
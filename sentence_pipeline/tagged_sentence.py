@@ -0,0 +1,242 @@
+# Συμπαγής αναπαράσταση μίας tagged πρότασης
+# Αντί για list από (token, tag) tuples: τα tags γίνονται interned IDs σε array('H') (2 bytes ανά tag),
+# τα tokens μπαίνουν σε ένα ενιαίο string buffer με offsets και οι κατηγορίες (noun / verb / adj)
+# είναι έτοιμες boolean masks σε numpy.
+# Το TaggedSentence είναι Sequence από (token, tag) tuples, οπότε οι υπάρχουσες συναρτήσεις των
+# pipelines (identify_noun_phrases, detect_and_fix_problems, apply_lemmatization, ...) δουλεύουν
+# πάνω του χωρίς αλλαγές - indexing δίνει tuple, slicing δίνει list από tuples όπως πριν.
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+import numpy as np
+
+from sentence_pipeline.chunking import (
+    AUXILIARY_VERBS, TAG_CODES, VERB_CODES, AUXILIARY_VERB_CODES, UNKNOWN_CODE
+)
+
+NOUN_TAGS = {'NN', 'NNS', 'NNP', 'NNPS'}
+ADJECTIVE_TAGS = {'JJ', 'JJR', 'JJS'}
+
+
+# ============== TAG VOCABULARY ==============
+
+class TagVocabulary:
+    # tag string <-> tag ID. Άγνωστα tags (εκτός Penn) παίρνουν νέο ID την πρώτη φορά που εμφανίζονται.
+    # Κρατάει και lookup tables ανά tag ID (masks, κωδικοί chunking) για vectorized πράξεις σε numpy.
+
+    def __init__(self, tags=()):
+        self.tags = []
+        self.ids = {}
+        self._tables = None
+        for tag in tags:
+            self.intern(tag)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def intern(self, tag):
+        tag_id = self.ids.get(tag)
+        if tag_id is None:
+            tag_id = len(self.tags)
+            self.ids[tag] = tag_id
+            self.tags.append(tag)
+            self._tables = None
+        return tag_id
+
+    def table(self, predicate, dtype=bool):
+        # numpy lookup table: table[tag_id] = predicate(tag)
+        return np.array([predicate(tag) for tag in self.tags], dtype=dtype)
+
+    def tables(self):
+        # numpy lookup tables με index το tag ID - ξαναχτίζονται μόνο όταν προστεθεί νέο tag
+        if self._tables is None:
+            tags = self.tags
+            self._tables = {
+                'is_noun': np.array([tag in NOUN_TAGS for tag in tags], dtype=bool),
+                'is_verb': np.array([tag.startswith('VB') for tag in tags], dtype=bool),
+                'is_adj': np.array([tag in ADJECTIVE_TAGS for tag in tags], dtype=bool),
+                # κωδικοί του chunking για κύριο και για βοηθητικό ρήμα (lists - για μικρές προτάσεις
+                # το Python indexing είναι γρηγορότερο από το overhead του numpy)
+                'code': [_tag_code(tag, False) for tag in tags],
+                'aux_code': [_tag_code(tag, True) for tag in tags],
+                'verb_flags': [tag.startswith('VB') for tag in tags],
+            }
+        return self._tables
+
+
+def _tag_code(tag, is_auxiliary):
+    # ίδια αντιστοίχιση με το chunking.encode_tags
+    if tag in TAG_CODES:
+        return TAG_CODES[tag]
+    if tag.startswith('VB'):
+        if is_auxiliary:
+            return AUXILIARY_VERB_CODES.get(tag, 'B')
+        return VERB_CODES.get(tag, 'b')
+    return UNKNOWN_CODE
+
+
+# κοινό vocabulary για όλες τις προτάσεις - τα Penn tags έχουν σταθερά IDs
+# Το PAD_TAG γεμίζει τις κενές θέσεις στο pack_tag_matrix και δεν ταιριάζει σε κανένα table
+PAD_TAG = '<PAD>'
+TAG_VOCABULARY = TagVocabulary([PAD_TAG] + list(TAG_CODES) + list(VERB_CODES))
+PAD_TAG_ID = TAG_VOCABULARY.ids[PAD_TAG]
+
+
+# ============== TAGGED SENTENCE ==============
+
+class TaggedSentence(Sequence):
+    __slots__ = ('vocabulary', 'tag_ids', '_text', '_offsets', '_masks', '_encoded')
+
+    def __init__(self, tokens, tags, vocabulary=TAG_VOCABULARY):
+        if len(tokens) != len(tags):
+            raise ValueError(f"{len(tokens)} tokens but {len(tags)} tags")
+        self.vocabulary = vocabulary
+        intern = vocabulary.intern
+        self.tag_ids = array('H', [intern(tag) for tag in tags])
+        # όλα τα tokens σε ένα string - το token i είναι το _text[_offsets[i]:_offsets[i+1]]
+        self._text = ''.join(tokens)
+        self._offsets = array('I', accumulate(map(len, tokens), initial=0))
+        self._masks = None
+        self._encoded = None
+
+    @classmethod
+    def from_pos_tags(cls, pos_tags, vocabulary=TAG_VOCABULARY):
+        # [(token, tag), ...] -> TaggedSentence
+        if isinstance(pos_tags, cls):
+            return pos_tags
+        tokens = [token for token, _ in pos_tags]
+        tags = [tag for _, tag in pos_tags]
+        return cls(tokens, tags, vocabulary)
+
+    # ---- Sequence adapter: συμπεριφέρεται σαν list από (token, tag) tuples ----
+
+    def __len__(self):
+        return len(self.tag_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            text, offsets, tag_ids, names = self._text, self._offsets, self.tag_ids, self.vocabulary.tags
+            return [
+                (text[offsets[i]:offsets[i + 1]], names[tag_ids[i]])
+                for i in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('TaggedSentence index out of range')
+        offsets = self._offsets
+        return (self._text[offsets[index]:offsets[index + 1]], self.vocabulary.tags[self.tag_ids[index]])
+
+    def __iter__(self):
+        return zip(self.tokens(), self.tags())
+
+    def __eq__(self, other):
+        # ίση με list από tuples που έχει τα ίδια (token, tag) - όπως το AnalysisContext.update περιμένει
+        if isinstance(other, TaggedSentence) and other.vocabulary is self.vocabulary:
+            return self.tag_ids == other.tag_ids and self._offsets == other._offsets and self._text == other._text
+        if isinstance(other, (TaggedSentence, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TaggedSentence({list(self)!r})"
+
+    def tokens(self):
+        text = self._text
+        offsets = self._offsets
+        return [text[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def tags(self):
+        tags = self.vocabulary.tags
+        return [tags[tag_id] for tag_id in self.tag_ids]
+
+    def to_list(self):
+        return list(self)
+
+    # ---- vectorized πληροφορία ανά token ----
+
+    def tag_id_array(self):
+        # numpy view πάνω στο ίδιο buffer (χωρίς αντιγραφή)
+        return np.frombuffer(self.tag_ids, dtype=np.uint16)
+
+    def _mask(self, name):
+        # boolean mask ανά token - υπολογίζεται μία φορά με ένα table lookup πάνω στα tag IDs
+        if self._masks is None:
+            self._masks = {}
+        mask = self._masks.get(name)
+        if mask is None:
+            if name == 'is_aux':
+                mask = np.zeros(len(self), dtype=bool)
+                text, offsets = self._text, self._offsets
+                for i in np.flatnonzero(self.is_verb).tolist():
+                    mask[i] = text[offsets[i]:offsets[i + 1]].lower() in AUXILIARY_VERBS
+            else:
+                mask = self.vocabulary.tables()[name][self.tag_id_array()]
+            self._masks[name] = mask
+        return mask
+
+    @property
+    def is_noun(self):
+        return self._mask('is_noun')
+
+    @property
+    def is_verb(self):
+        return self._mask('is_verb')
+
+    @property
+    def is_adj(self):
+        return self._mask('is_adj')
+
+    @property
+    def is_aux(self):
+        # VB* token που η λέξη του είναι βοηθητικό ρήμα
+        return self._mask('is_aux')
+
+    def encoded(self):
+        # Ίδιο αποτέλεσμα με chunking.encode_tags: lookup ανά tag ID αντί για σύγκριση strings,
+        # και η λέξη κοιτάζεται μόνο για τα VB* tokens. Η πρόταση δεν αλλάζει, οπότε κρατιέται cached.
+        if self._encoded is None:
+            tables = self.vocabulary.tables()
+            code, aux_code, is_verb = tables['code'], tables['aux_code'], tables['verb_flags']
+            text, offsets = self._text, self._offsets
+            self._encoded = ''.join([
+                aux_code[tag_id]
+                if is_verb[tag_id] and text[offsets[i]:offsets[i + 1]].lower() in AUXILIARY_VERBS
+                else code[tag_id]
+                for i, tag_id in enumerate(self.tag_ids)
+            ])
+        return self._encoded
+
+    def nbytes(self):
+        # μνήμη της συμπαγούς αναπαράστασης (χωρίς τις lazy masks)
+        return sys.getsizeof(self.tag_ids) + sys.getsizeof(self._offsets) + sys.getsizeof(self._text)
+
+
+def compact_pos_tags(pos_tags_list, vocabulary=TAG_VOCABULARY):
+    # Batch: [[(token, tag), ...], ...] -> [TaggedSentence, ...] με κοινό vocabulary
+    return [TaggedSentence.from_pos_tags(pos_tags, vocabulary) for pos_tags in pos_tags_list]
+
+
+# ============== CORPUS TAG MATRIX ==============
+
+def pack_tag_matrix(pos_tags_list, vocabulary=TAG_VOCABULARY, pad_columns=0):
+    # Όλες οι προτάσεις σε έναν πίνακα tag IDs (uint16), μία γραμμή ανά πρόταση, γεμισμένο με PAD_TAG
+    # pad_columns: επιπλέον στήλες PAD δεξιά, ώστε οι μετατοπισμένες συγκρίσεις (i+1, i+2) να μη βγαίνουν εκτός
+    # Επιστρέφει (matrix, lengths)
+    lengths = np.fromiter((len(pos_tags) for pos_tags in pos_tags_list), dtype=np.int64, count=len(pos_tags_list))
+    width = (int(lengths.max()) if len(lengths) else 0) + pad_columns
+    pad_id = vocabulary.intern(PAD_TAG)
+    matrix = np.full((len(lengths), width), pad_id, dtype=np.uint16)
+
+    # όλα τα tags σε μία λίστα - τα άγνωστα γίνονται intern μία φορά, τα υπόλοιπα είναι απλό dict lookup
+    flat_tags = [tag for pos_tags in pos_tags_list for _, tag in pos_tags]
+    for tag in set(flat_tags).difference(vocabulary.ids):
+        vocabulary.intern(tag)
+    flat_ids = array('H', map(vocabulary.ids.__getitem__, flat_tags))
+    # οι θέσεις (γραμμή, στήλη < length) σε row-major σειρά είναι ακριβώς η σειρά του flat_ids
+    matrix[np.arange(width) < lengths[:, None]] = np.frombuffer(flat_ids, dtype=np.uint16)
+    return matrix, lengths
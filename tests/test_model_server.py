@@ -0,0 +1,44 @@
+# MicroBatcher: κανένα batch πάνω από max_batch items (εκτός από ένα request που είναι από μόνο του μεγαλύτερο)
+# και κάθε request παίρνει τα δικά του outputs - ή error, αν η batched συνάρτηση δώσει λάθος πλήθος outputs.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from model_server import MicroBatcher
+
+
+def run_requests(function, requests, max_batch=8):
+    # όλα τα requests μπαίνουν στην ουρά πριν ξεκινήσει ο batcher -> (outputs ή exception ανά request)
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = MicroBatcher(function, executor, max_batch=max_batch, max_wait=0.01)
+            tasks = [asyncio.ensure_future(batcher.submit(items)) for items in requests]
+            await asyncio.sleep(0)
+            runner = asyncio.ensure_future(batcher.run())
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            runner.cancel()
+            return results
+    return asyncio.run(main())
+
+
+def test_batches_do_not_exceed_max_batch():
+    sizes = []
+
+    def double(items):
+        sizes.append(len(items))
+        return [item * 2 for item in items]
+
+    requests = [list(range(start, start + 3)) for start in range(0, 30, 3)] + [list(range(100, 120))]
+    results = run_requests(double, requests)
+    assert results == [[item * 2 for item in items] for items in requests]
+    assert sizes[:-1] and max(sizes[:-1]) <= 8
+    assert sizes[-1] == 20  # μεγαλύτερο από max_batch: μόνο του
+    assert sum(sizes) == sum(len(items) for items in requests)
+
+
+def test_wrong_number_of_outputs_fails_the_requests():
+    results = run_requests(lambda items: items[:-1], [[1, 2], [3, 4, 5]])
+    for result in results:
+        with pytest.raises(ValueError):
+            raise result
@@ -0,0 +1,71 @@
+# Differential tests των βημάτων 1-4 του preprocessing:
+# - expand_contractions (compiled trie regex) απέναντι στο contractions.fix
+# - normalize_text (fused, και με return_offsets) απέναντι στην αλυσίδα _normalize_step_by_step
+# Κάθε κλειδί των contractions / leftovers / slang dictionaries σε πεζά, ΚΕΦΑΛΑΙΑ, Title και ανάμικτα,
+# μέσα σε context (στίξη, κολλημένα / διπλανά κλειδιά, μη-ASCII), ένα seeded τυχαίο corpus και κείμενα
+# με χαρακτήρες που αλλάζουν μήκος στο lower().
+import random
+
+import contractions
+import pytest
+
+from sentence_pipeline.preprocessing_1.preprocessing import _normalize_step_by_step, expand_contractions, normalize_text
+
+KEYS = sorted({key for source in (contractions.contractions_dict, contractions.leftovers_dict, contractions.slang_dict)
+               for key in source})
+CONTEXTS = ('{}', 'x {} y', '({})', '{}.', '"{}"', 'a{}', '{}b', "{}'s", '{} {}', '{}{}', '_{}', '—{}…',
+            'Well, {}!', '{}\n{}', 'ΟΔΟΣ {} ΟΔΟΣ', 'ΟΔΟΣ{}')  # 'ΟΔΟΣ': το τελικό σίγμα εξαρτάται από το context
+# Κείμενα όπου το lower() αλλάζει το μήκος ('İ', 'ﬁ' μένει): η expand_contractions περνάει στο contractions.fix
+# (που σε πολλά τέτοια κείμενα πετάει IndexError - εδώ μόνο όσα χειρίζεται)
+LENGTH_CHANGING = ["İstanbul: I don't know, they're late.", "I can't see İ here", "ﬁne, don't",
+                   "Straße ISN'T ΟΔΟΣ", "'tis İ", "We're in İzmir"]
+FILLER = ['the', 'Cat', 'SAT', 'on', 'mat', '1999', 'x', '—', '…', ',', '.', '!', '?', '"', "'", '’', '(', ')']
+
+
+def casings(key):
+    mixed = ''.join(char.upper() if i % 2 else char.lower() for i, char in enumerate(key))
+    return dict.fromkeys([key, key.lower(), key.upper(), key.title(), key[0].upper() + key[1:], key.swapcase(), mixed])
+
+
+def key_cases():
+    for key in KEYS:
+        for form in casings(key):
+            for context in CONTEXTS:
+                yield context.format(form, form)
+
+
+def random_cases(seed=0, count=5000):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = [rng.choice(list(casings(rng.choice(KEYS)))) if rng.random() < 0.5 else rng.choice(FILLER)
+                 for _ in range(rng.randint(1, 8))]
+        separators = [rng.choice([' ', '', ', ', '. ', '\t', '  ']) for _ in words]
+        yield ''.join(word + separator for word, separator in zip(words, separators))
+
+
+CASES = {
+    'keys': key_cases,
+    'random': random_cases,
+    'length_changing': lambda: iter(LENGTH_CHANGING),
+}
+
+
+def step_by_step(text):
+    return _normalize_step_by_step(text, {})
+
+
+@pytest.mark.parametrize('cases', list(CASES))
+def test_expand_contractions_matches_contractions_fix(cases):
+    mismatches = [text for text in CASES[cases]() if expand_contractions(text) != contractions.fix(text)]
+    assert mismatches == []
+
+
+@pytest.mark.parametrize('cases', list(CASES))
+def test_normalize_text_matches_step_by_step(cases):
+    for text in CASES[cases]():
+        expected = step_by_step(text)
+        assert normalize_text(text) == expected, text
+        normalized, offsets = normalize_text(text, return_offsets=True)
+        assert normalized == expected, text
+        assert len(offsets) == len(normalized)
+        assert offsets == sorted(offsets) and all(0 <= offset < len(text) for offset in offsets)
@@ -0,0 +1,46 @@
+# Guard της εκκίνησης: το menu και το sentence pipeline δεν πρέπει να φορτώνουν torch / transformers / gensim.
+# Το measure_startup ελέγχει μόνο τα imports - το δεύτερο test τρέχει και το sentence pipeline σε νέο interpreter,
+# ώστε να πιαστεί και ένα lazy import μέσα στον κώδικα του pipeline. Ο tagger / tokenizer του NLTK
+# (και ο lemmatizer) αντικαθίστανται με stubs (το test δεν χρειάζεται τα NLTK data).
+import json
+import os
+import subprocess
+import sys
+
+import main
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SENTENCE_PIPELINE_PROBE = """
+import json, sys, types
+import nltk, nltk.corpus, nltk.stem, nltk.tag, nltk.tokenize
+TAGS = {'the': 'DT', 'a': 'DT', 'sat': 'VBD', 'is': 'VBZ', 'on': 'IN', '.': '.'}
+def pos_tag(tokens, *args, **kwargs):
+    return [(token, TAGS.get(token.lower(), 'NN')) for token in tokens]
+def pos_tag_sents(sentences, *args, **kwargs):
+    return [pos_tag(tokens) for tokens in sentences]
+def word_tokenize(text, *args, **kwargs):
+    return text.replace('.', ' .').split()
+nltk.pos_tag = nltk.tag.pos_tag = pos_tag
+nltk.pos_tag_sents = nltk.tag.pos_tag_sents = pos_tag_sents
+nltk.word_tokenize = nltk.tokenize.word_tokenize = word_tokenize
+nltk.stem.WordNetLemmatizer = lambda: types.SimpleNamespace(lemmatize=lambda word, pos='n': word)
+nltk.corpus.wordnet = types.SimpleNamespace(ADJ='a', VERB='v', NOUN='n', ADV='r')
+import main
+results = main.run_sentence_pipeline_batch(["The cat sat on the mat.", "The cat is on the mat."])
+json.dumps(results, default=main._json_default)  # και τα lazy πεδία (lemmatization)
+print(json.dumps([m for m in main.HEAVY_MODULES if m in sys.modules]))
+"""
+
+
+def test_menu_option_1_does_not_import_heavy_modules():
+    result = main.measure_startup('1')
+    assert 'error' not in result, result.get('error')
+    assert result['heavy'] == []
+
+
+def test_sentence_pipeline_does_not_import_heavy_modules():
+    completed = subprocess.run([sys.executable, "-c", _SENTENCE_PIPELINE_PROBE],
+                               cwd=REPO_DIR, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout.strip().splitlines()[-1]) == []
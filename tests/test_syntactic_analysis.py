@@ -0,0 +1,125 @@
+# Differential test του extract_svo_components / extract_prepositional_phrases (bisect πάνω στα όρια των
+# noun phrases) απέναντι στην αρχική υλοποίηση με scan όλων των NP, σε τυχαίες μεγάλες ακολουθίες tags.
+# Το λεξιλόγιο είναι μικρό ώστε να υπάρχουν NP με ίδια tokens (το 'other' εξαρτάται από το match κατά τιμή).
+import random
+
+import pytest
+
+from sentence_pipeline.syntactic_analysis_2.syntactic_analysis import (
+    AnalysisContext, extract_prepositional_phrases, extract_svo_components, find_verb_groups, identify_noun_phrases,
+)
+
+WORDS = {
+    'DT': ['the', 'a', 'this'], 'PRP$': ['his', 'our'], 'JJ': ['big', 'old'], 'JJR': ['older'],
+    'NN': ['cat', 'report', 'cat'], 'NNS': ['cats', 'days'], 'NNP': ['Anna', 'Paris'], 'PRP': ['he', 'it', 'they'],
+    'VB': ['see', 'be', 'have'], 'VBD': ['saw', 'was', 'had'], 'VBZ': ['sees', 'is', 'has'],
+    'VBG': ['seeing', 'being'], 'VBN': ['seen', 'been'], 'VBP': ['see', 'are'], 'MD': ['will', 'can'],
+    'RP': ['up'], 'IN': ['in', 'of', 'on'], 'RB': ['quickly', 'not'], 'CC': ['and', 'but'], 'TO': ['to'],
+    'CD': ['two'], ',': [','], '.': ['.'], '?': ['?'],
+}
+TAGS = list(WORDS)
+
+
+# ---------- αρχική υλοποίηση (reference) ----------
+
+def reference_prepositional_phrases(pos_tags, noun_phrases):
+    prep_phrases = []
+    for i, (token, pos) in enumerate(pos_tags):
+        if pos == 'IN':
+            for start, end, tokens in noun_phrases:
+                if start == i + 1:
+                    prep_phrases.append((i, start, end))
+                    break
+    return prep_phrases
+
+
+def reference_svo_components(pos_tags):
+    components = {'subject': [], 'verb': [], 'object': [], 'prepositional_phrases': [], 'other': []}
+    noun_phrases = identify_noun_phrases(pos_tags)
+    verb_groups = find_verb_groups(pos_tags)
+
+    main_verb_idx = None
+    main_verb_tokens = []
+    for start, end, tokens, is_main in verb_groups:
+        if is_main:
+            main_verb_idx = start
+            main_verb_tokens = tokens
+            components['verb'] = tokens
+            break
+    if main_verb_idx is None and len(verb_groups) > 0:
+        main_verb_idx = verb_groups[0][0]
+        main_verb_tokens = verb_groups[0][2]
+        components['verb'] = main_verb_tokens
+
+    prepositional_phrases = reference_prepositional_phrases(pos_tags, noun_phrases)
+    components['prepositional_phrases'] = prepositional_phrases
+
+    if main_verb_idx is not None:
+        closest_np = None
+        closest_distance = float('inf')
+        for start, end, tokens in noun_phrases:
+            if end <= main_verb_idx:
+                distance = main_verb_idx - end
+                if distance < closest_distance:
+                    closest_distance = distance
+                    closest_np = tokens
+        if closest_np:
+            components['subject'] = closest_np
+
+    if main_verb_idx is not None:
+        verb_end = main_verb_idx + len(main_verb_tokens)
+        for start, end, tokens in noun_phrases:
+            if start >= verb_end:
+                components['object'] = tokens
+                break
+
+    used_indices = set()
+    for start, end, tokens in noun_phrases:
+        if tokens == components['subject'] or tokens == components['object']:
+            used_indices.update(range(start, end))
+    if main_verb_idx is not None:
+        used_indices.update(range(main_verb_idx, main_verb_idx + len(main_verb_tokens)))
+    for prep_idx, np_start, np_end in prepositional_phrases:
+        used_indices.update(range(prep_idx, np_end))
+    for i, (token, pos) in enumerate(pos_tags):
+        if i not in used_indices and token not in [',', '.', '!', '?']:
+            components['other'].append(token)
+    return components
+
+
+# ---------- corpus ----------
+
+def generate_pos_tags(rng, length):
+    tags = []
+    for _ in range(length):
+        tag = rng.choice(TAGS)
+        tags.append((rng.choice(WORDS[tag]), tag))
+    return tags
+
+
+def generate_corpus(seed, count, min_length, max_length):
+    rng = random.Random(seed)
+    return [generate_pos_tags(rng, rng.randint(min_length, max_length)) for _ in range(count)]
+
+
+CORPORA = {
+    'short': (0, 2000, 0, 20),
+    'long': (1, 300, 200, 800),
+    'very_long': (2, 10, 3000, 5000),
+}
+
+
+@pytest.mark.parametrize('corpus', list(CORPORA))
+def test_svo_components_match_reference(corpus):
+    for pos_tags in generate_corpus(*CORPORA[corpus]):
+        expected = reference_svo_components(pos_tags)
+        assert extract_svo_components(pos_tags) == expected
+        assert extract_svo_components(pos_tags, AnalysisContext(pos_tags)) == expected
+
+
+@pytest.mark.parametrize('corpus', list(CORPORA))
+def test_prepositional_phrases_match_reference(corpus):
+    for pos_tags in generate_corpus(*CORPORA[corpus]):
+        noun_phrases = identify_noun_phrases(pos_tags)
+        assert (extract_prepositional_phrases(pos_tags, noun_phrases)
+                == reference_prepositional_phrases(pos_tags, noun_phrases))
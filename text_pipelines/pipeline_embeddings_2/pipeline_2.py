@@ -7,14 +7,18 @@
 import nltk
 import numpy as np
 from typing import List, Tuple, Optional
-import gensim.downloader as api
 from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.tag import pos_tag
 import random
 import warnings
 
+from text_pipelines.sentence_cache import cached_sentences, source_version
+
 warnings.filterwarnings('ignore')
 
+# μέρος του key του sentence cache (μαζί με το μοντέλο και το threshold)
+EMBEDDINGS_SOURCE_VERSION = source_version(__file__)
+
 # # Ensure NLTK data is available
 # try:
 #     nltk.data.find('tokenizers/punkt')
@@ -53,24 +57,39 @@ def pipeline_embeddings_2_main(text):
     return reconstructed_txt
 
 
+# pretrained embeddings ανά όνομα - φορτώνονται μία φορά ανά process (όχι σε κάθε κείμενο)
+_embedding_models = {}
+
+def load_embeddings_model(model_name: str = 'glove-wiki-gigaword-100'):
+    model = _embedding_models.get(model_name)
+    if model is None:
+        # το gensim φορτώνεται μόνο όταν χρειαστεί το μοντέλο, όχι με το import του pipeline
+        import gensim.downloader as api
+        print(f"Φόρτωση pretrained embeddings: {model_name}...")
+        model = api.load(model_name)
+        print("✓ Embeddings ")
+        _embedding_models[model_name] = model
+    return model
+
+
 # η συνάρτηση που είναι υπεύθυνη για το reconstruction με τη χρήση embeddings
 def reconstruct_text_with_embeddings(text: str, model_name: str = 'glove-wiki-gigaword-100', similarity_threshold: float = 0.65) -> str:
     # Ανακατασκευή κειμένου με word embeddings.
     # Αντικαθιστά content words με σημασιολογικά παρόμοιες λέξεις.
 
-    # Φόρτωση pretrained embeddings
-    print(f"Φόρτωση pretrained embeddings: {model_name}...")
-    model = api.load(model_name)
-    print("✓ Embeddings ")
-    
     # Διαχωρισμός σε προτάσεις
     sentences = sent_tokenize(text)
     
     reconstructed_sentences = []
+
+    # Ανακατασκευή κάθε πρότασης - όσες υπάρχουν ήδη στο sentence cache δεν ξαναϋπολογίζονται.
+    # Τα pretrained embeddings φορτώνονται (μία φορά) μόνο αν κάποια πρόταση χρειάζεται υπολογισμό.
+    # Σημ.: η τυχαία επιλογή συνωνύμου μένει σταθερή για μια πρόταση όσο είναι στο cache
+    config = f"{model_name}|{similarity_threshold}|{EMBEDDINGS_SOURCE_VERSION}"
+    outputs = cached_sentences('embeddings', config, sentences, lambda index: _reconstruct_sentence(
+        sentences[index], load_embeddings_model(model_name), similarity_threshold))
     
-    for sentence in sentences:
-        # Ανακατασκευή κάθε πρότασης
-        reconstructed = _reconstruct_sentence(sentence, model, similarity_threshold)
+    for reconstructed in outputs:
         if reconstructed:
             reconstructed_sentences.append(reconstructed)
     
@@ -78,6 +97,20 @@ def reconstruct_text_with_embeddings(text: str, model_name: str = 'glove-wiki-gi
     return " ".join(reconstructed_sentences)
 
 
+# Πολλά κείμενα μαζί (π.χ. τα ταυτόχρονα requests του model server): οι προτάσεις όλων περνάνε από ένα
+# cached_sentences, οπότε το cache ρωτιέται μία φορά και μια πρόταση που υπάρχει σε πολλά κείμενα υπολογίζεται μία
+def reconstruct_texts_with_embeddings(texts: List[str], model_name: str = 'glove-wiki-gigaword-100', similarity_threshold: float = 0.65) -> List[str]:
+    sentences_per_text = [sent_tokenize(text) for text in texts]
+    sentences = [sentence for text_sentences in sentences_per_text for sentence in text_sentences]
+    config = f"{model_name}|{similarity_threshold}|{EMBEDDINGS_SOURCE_VERSION}"
+    outputs = iter(cached_sentences('embeddings', config, sentences, lambda index: _reconstruct_sentence(
+        sentences[index], load_embeddings_model(model_name), similarity_threshold)))
+    return [
+        " ".join(reconstructed for reconstructed in (next(outputs) for _ in text_sentences) if reconstructed)
+        for text_sentences in sentences_per_text
+    ]
+
+
 # Ανακατασκευή της πρότασης με word embeddings
 def _reconstruct_sentence(sentence: str, model, similarity_threshold: float) -> str:
     # Βήματα:
@@ -9,8 +9,13 @@ from typing import List, Tuple
 import re
 import warnings
 
+from text_pipelines.sentence_cache import cached_sentences, source_version
+
 warnings.filterwarnings('ignore')
 
+# key του sentence cache: η έξοδος κάθε πρότασης εξαρτάται μόνο από την πρόταση και τον κώδικα του pipeline
+TEXTBLOB_CACHE_CONFIG = source_version(__file__)
+
 def pipeline_textblob_1_main(text):
     #main συνάρτηση για το pipeline 1 - καλεί τις υπόλοιπες, εκτυπώνει και επιστρέφει το νέο κείμενο στη main
     
@@ -42,12 +47,13 @@ def reconstruct_text_with_textblob(text:str)->str:
     # TextBlob object
     blob = TextBlob(text)
 
-    # επεξεργασία κάθε πρότασης
+    # επεξεργασία κάθε πρότασης - όσες υπάρχουν ήδη στο sentence cache δεν ξαναϋπολογίζονται
+    sentences = blob.sentences
     reconstructed_sentences = []
 
-    for sentence in blob.sentences: # corrections and reconstruction
-        reconstructed = _reconstruct_sentence(sentence)
-        clean_sent_str = str(reconstructed).strip()
+    outputs = cached_sentences('textblob', TEXTBLOB_CACHE_CONFIG, [str(sentence) for sentence in sentences],
+                               lambda index: _reconstruct_sentence(sentences[index])) # corrections and reconstruction
+    for reconstructed in outputs:
         if reconstructed: reconstructed_sentences.append(reconstructed)
     # ένωσε τις προτάσεις
     return " ".join(reconstructed_sentences)
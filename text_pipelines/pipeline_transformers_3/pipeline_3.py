@@ -1,10 +1,11 @@
 # Pipeline 3: Transformer-based text reconstruction with text-to-text generation
 # Το pipeline χρησιμοποιεί encoder-decoder transformer για επανεγγραφή κειμένου με βάση τα συμφραζόμενα
 
-from transformers import pipeline as hf_pipeline
 #from typing import Optional
 import warnings
 
+from text_pipelines.sentence_cache import cached_sentences, cached_sentences_batch, source_version
+
 warnings.filterwarnings('ignore')
 
 
@@ -36,6 +37,45 @@ def pipeline_transformer_3_main(text: str) -> str:
         traceback.print_exc()
         raise
 
+TRANSFORMER_MODEL_NAME = "google/flan-t5-base" # μικρότερο, πιο γρήγορο
+# TRANSFORMER_MODEL_NAME = "prithvida/grammar_error_correcter_v1" # συγκεκριμένο για γραμματικά errors 
+
+# key του sentence cache. Ο transformer ξαναγράφει όλο το κείμενο σε ένα generation (τα συμφραζόμενα και το
+# min_length αφορούν όλο το κείμενο), οπότε η μονάδα του cache εδώ είναι το κείμενο και όχι η πρόταση
+TRANSFORMER_CACHE_CONFIG = f"{TRANSFORMER_MODEL_NAME}|{source_version(__file__)}"
+
+# text2text-generation pipelines ανά μοντέλο - φορτώνονται μία φορά ανά process (όχι σε κάθε κείμενο)
+_reconstructors = {}
+
+def load_transformer_reconstructor(model_name: str = TRANSFORMER_MODEL_NAME):
+    reconstructor = _reconstructors.get(model_name)
+    if reconstructor is None:
+        # το transformers (και μαζί του το torch) φορτώνεται μόνο όταν χρειαστεί το μοντέλο, όχι με το import του pipeline
+        from transformers import pipeline as hf_pipeline
+
+        # επιβεβαίωση για το ποιό μοντέλο χρησιμοποιείται για λόγους debug
+        print(f"[Pipeline 3] Loading model: {model_name}") 
+        
+        # Initialize text2text-generation pipeline
+        # This wraps a T5/BART-style encoder-decoder model
+        reconstructor = hf_pipeline(
+            "text2text-generation",
+            model=model_name,
+            device=-1,  # CPU; αλλαή σε 0 για GPU
+            max_length=512
+        )
+        _reconstructors[model_name] = reconstructor
+    return reconstructor
+
+# Όριο στα intra-op threads του torch για όλο το process, ώστε ο transformer να μην πιάνει όλα τα cores
+# όταν τρέχει ταυτόχρονα με άλλα pipelines (ή σε πολλούς workers). Επιστρέφει τον αριθμό threads που ισχύει.
+def limit_transformer_threads(num_threads: int) -> int:
+    import torch  # το φορτώνει ήδη το transformers
+    num_threads = max(1, int(num_threads))
+    if torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+    return num_threads
+
 # Ανακατασκευή κειμένου με βάση pretrained transformer μέσω text-to-text
 def reconstruct_with_transformer(text: str) -> str:    
     # Χρήση encoder-decoder transformer:
@@ -51,33 +91,37 @@ def reconstruct_with_transformer(text: str) -> str:
     # model_name = "t5-base" # μικρό, γρήγορο
     # χρήση με input_text = f"grammar: {text}"
 
-    model_name = "google/flan-t5-base" # μικρότερο, πιο γρήγορο
-    # model_name = "prithvida/grammar_error_correcter_v1" # συγκεκριμένο για γραμματικά errors 
-    # επιβεβαίωση για το ποιό μοντέλο χρησιμοποιείται για λόγους debug
-    print(f"[Pipeline 3] Loading model: {model_name}") 
-    
-    # Initialize text2text-generation pipeline
-    # This wraps a T5/BART-style encoder-decoder model
-    reconstructor = hf_pipeline(
-        "text2text-generation",
-        model=model_name,
-        device=-1,  # CPU; αλλαή σε 0 για GPU
-        max_length=512
-    )
+    return cached_sentences('transformer', TRANSFORMER_CACHE_CONFIG, [text], lambda _: _generate(text))[0]
+
+# Πολλά κείμενα μαζί (π.χ. τα ταυτόχρονα requests του model server): όσα δεν είναι στο cache περνάνε από
+# ένα batched generation αντί για ένα generation ανά κείμενο
+def reconstruct_with_transformer_batch(texts: list) -> list:
+    return cached_sentences_batch('transformer', TRANSFORMER_CACHE_CONFIG, texts,
+                                  lambda indices: _generate_batch([texts[index] for index in indices]))
+
+# Ένα generation πάνω σε όλο το κείμενο
+def _generate(text: str) -> str:
+    return _generate_batch([text])[0]
+
+# Τα κείμενα ενός batch περνάνε μαζί από το μοντέλο (padding στο μεγαλύτερο) - ένα generation το καθένα
+def _generate_batch(texts: list) -> list:
+    model_name = TRANSFORMER_MODEL_NAME
+    reconstructor = load_transformer_reconstructor(model_name)
     
     # Προετοιμασία input για το model
     # Κάποια μοντέλα χρειάζονται ακριβής οδηγίες
     if "t5" in model_name.lower():
-        input_text = f"Rewrite this text to fix all grammar errors and make it clear and formal: {text}" 
+        inputs = [f"Rewrite this text to fix all grammar errors and make it clear and formal: {text}" for text in texts]
     else:
-        input_text = text
+        inputs = list(texts)
     
     # Generate reconstructed text
     # The model uses its encoder-decoder architecture to:
     # - Encode: Transform input into contextualized representations
     # - Decode: Generate improved output conditioned on those representations
-    result = reconstructor(
-        input_text,
+    results = reconstructor(
+        inputs,
+        batch_size=len(inputs),
         max_length=512,
         min_length=30,
         do_sample=True,  # Deterministic generation (greedy decoding)
@@ -87,13 +131,12 @@ def reconstruct_with_transformer(text: str) -> str:
         repetition_penalty=1.2 # prevents repetition
     )
     
-    # Εξαγωγή generated text από την έξοδο του μοντέλου
-    reconstructed = result[0]['generated_text']
-    
-    # post-processing για το format του κειμένου
-    reconstructed = _post_process_output(reconstructed)
-    
-    return reconstructed
+    # Εξαγωγή generated text από την έξοδο του μοντέλου (μία λίστα ανά input αν το pipeline δεν τις ενώσει)
+    # και post-processing για το format του κειμένου
+    return [
+        _post_process_output((result[0] if isinstance(result, list) else result)['generated_text'])
+        for result in results
+    ]
 
 # Ελαφρύ post-processing για την έξοδο
 def _post_process_output(text: str) -> str:
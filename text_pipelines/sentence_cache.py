@@ -0,0 +1,205 @@
+# Persistent cache σε επίπεδο πρότασης για τα text pipelines
+# Τα documents αλλάζουν λίγο-λίγο: σε κάθε νέο run οι περισσότερες προτάσεις είναι ίδιες με πριν.
+# Κάθε pipeline ρωτάει το cache για όλες τις προτάσεις ενός κειμένου με ένα query, υπολογίζει μόνο όσες
+# δεν έχει ξαναδεί και αποθηκεύει τα νέα αποτελέσματα - οι υπόλοιπες συναρμολογούνται από το cache.
+# Key: (pipeline, config, hash της κανονικοποιημένης πρότασης). Το config περιέχει τις ρυθμίσεις και το hash
+# του κώδικα του pipeline, οπότε μια αλλαγή στο pipeline δεν επιστρέφει παλιά αποτελέσματα.
+# Χωρίς ανοιχτό cache (open_sentence_cache) τα pipelines δουλεύουν όπως πριν, χωρίς SQLite.
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+SENTENCE_CACHE_FILENAME = "sentence_cache.sqlite"
+
+# όριο παραμέτρων ανά query του SQLite
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sentences (
+    pipeline TEXT NOT NULL,
+    config TEXT NOT NULL,
+    sentence_hash TEXT NOT NULL,
+    output TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (pipeline, config, sentence_hash)
+) WITHOUT ROWID
+"""
+
+
+def normalize_sentence(sentence):
+    # ίδια πρόταση με διαφορετικά κενά / αλλαγές γραμμής -> ίδιο key (τα κεφαλαία μένουν, αλλάζουν την έξοδο)
+    return " ".join(sentence.split())
+
+
+def sentence_hash(sentence):
+    return hashlib.blake2b(normalize_sentence(sentence).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def source_version(*paths):
+    # hash του κώδικα ενός pipeline - μπαίνει στο config, ώστε μια αλλαγή στον κώδικα να ακυρώνει τα παλιά entries
+    digest = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class SentenceCache:
+    # Ένα SQLite αρχείο - ένα connection ανά thread (τα text pipelines τρέχουν και ταυτόχρονα σε threads)
+    # και ανά process (οι batch workers ανοίγουν το ίδιο αρχείο, WAL για ταυτόχρονα reads/writes)
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        # pipeline -> {'hits', 'misses', 'computed_seconds', 'saved_seconds'} για αυτό το process
+        self.stats = {}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(_SCHEMA)
+
+    def _connection(self):
+        if os.getpid() != self._pid:
+            # μετά από fork: τα connections του parent δεν χρησιμοποιούνται στο child
+            self._local = threading.local()
+            self._pid = os.getpid()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=60)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get_many(self, pipeline, config, hashes):
+        # hashes -> {hash: (output, seconds)} για όσα υπάρχουν στο cache
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        connection = self._connection()
+        for start in range(0, len(unique), _QUERY_CHUNK):
+            chunk = unique[start:start + _QUERY_CHUNK]
+            rows = connection.execute(
+                f"SELECT sentence_hash, output, seconds FROM sentences "
+                f"WHERE pipeline = ? AND config = ? AND sentence_hash IN ({', '.join('?' * len(chunk))})",
+                (pipeline, config, *chunk),
+            )
+            found.update((row[0], (row[1], row[2])) for row in rows)
+        return found
+
+    def put_many(self, pipeline, config, entries):
+        # entries: [(hash, output, seconds)]
+        if not entries:
+            return
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO sentences (pipeline, config, sentence_hash, output, seconds) VALUES (?, ?, ?, ?, ?)",
+                [(pipeline, config, digest, output, seconds) for digest, output, seconds in entries],
+            )
+
+    def map(self, pipeline, config, sentences, compute):
+        # Έξοδος για κάθε πρόταση (ίδια σειρά): από το cache ή compute(index) για όσες λείπουν
+        def compute_missing(indices):
+            timed = []
+            for index in indices:
+                start = time.perf_counter()
+                output = compute(index)
+                timed.append((output, time.perf_counter() - start))
+            return timed
+        return self._map(pipeline, config, sentences, compute_missing)
+
+    def map_batch(self, pipeline, config, sentences, compute_many):
+        # Όπως το map, αλλά όσες λείπουν υπολογίζονται με μία κλήση compute_many(indices) -> outputs
+        # (batched μοντέλα) - ο χρόνος της κλήσης μοιράζεται ισόποσα στις προτάσεις
+        def compute_missing(indices):
+            start = time.perf_counter()
+            outputs = compute_many(indices)
+            seconds = (time.perf_counter() - start) / len(indices)
+            return [(output, seconds) for output in outputs]
+        return self._map(pipeline, config, sentences, compute_missing)
+
+    def _map(self, pipeline, config, sentences, compute_missing):
+        hashes = [sentence_hash(sentence) for sentence in sentences]
+        cached = self.get_many(pipeline, config, hashes)
+        saved_seconds = 0.0
+        missing = {}  # hash -> index της πρώτης εμφάνισης (ίδια πρόταση δύο φορές υπολογίζεται μία)
+        for index, digest in enumerate(hashes):
+            if digest in cached:
+                saved_seconds += cached[digest][1]
+            elif digest not in missing:
+                missing[digest] = index
+        computed = dict(zip(missing, compute_missing(list(missing.values())))) if missing else {}
+        outputs = [cached[digest][0] if digest in cached else computed[digest][0] for digest in hashes]
+        self.put_many(pipeline, config, [(digest, output, seconds) for digest, (output, seconds) in computed.items()])
+
+        with self._lock:
+            stats = self.stats.setdefault(pipeline, {'hits': 0, 'misses': 0, 'computed_seconds': 0.0, 'saved_seconds': 0.0})
+            stats['hits'] += len(hashes) - len(computed)
+            stats['misses'] += len(computed)
+            stats['computed_seconds'] += sum(seconds for _, seconds in computed.values())
+            stats['saved_seconds'] += saved_seconds
+        return outputs
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and os.getpid() == self._pid:
+            connection.close()
+        self._local = threading.local()
+
+
+# ============== cache του process ==============
+# Όπως τα μοντέλα (load_embeddings_model, load_transformer_reconstructor): ένα ανά process, το ανοίγει η main
+
+_cache = None
+
+
+def open_sentence_cache(path):
+    global _cache
+    if _cache is None or _cache.path != path:
+        close_sentence_cache()
+        _cache = SentenceCache(path)
+    return _cache
+
+
+def close_sentence_cache():
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+def cached_sentences(pipeline, config, sentences, compute):
+    # compute(index) -> έξοδος της πρότασης sentences[index]
+    if _cache is None:
+        # χωρίς cache: κάθε διαφορετική πρόταση του κειμένου υπολογίζεται μία φορά
+        computed = {}
+        outputs = []
+        for index, sentence in enumerate(sentences):
+            key = normalize_sentence(sentence)
+            if key not in computed:
+                computed[key] = compute(index)
+            outputs.append(computed[key])
+        return outputs
+    return _cache.map(pipeline, config, sentences, compute)
+
+
+def cached_sentences_batch(pipeline, config, sentences, compute_many):
+    # compute_many(indices) -> έξοδοι των sentences[index] με μία κλήση (batched μοντέλα)
+    if _cache is None:
+        first = {}  # κανονικοποιημένη πρόταση -> index της πρώτης εμφάνισης
+        for index, sentence in enumerate(sentences):
+            first.setdefault(normalize_sentence(sentence), index)
+        computed = dict(zip(first, compute_many(list(first.values())))) if first else {}
+        return [computed[normalize_sentence(sentence)] for sentence in sentences]
+    return _cache.map_batch(pipeline, config, sentences, compute_many)
+
+
+def sentence_cache_stats():
+    # αντίγραφο των στατιστικών του process: pipeline -> {'hits', 'misses', 'computed_seconds', 'saved_seconds'}
+    if _cache is None:
+        return {}
+    with _cache._lock:
+        return {pipeline: dict(stats) for pipeline, stats in _cache.stats.items()}
@@ -0,0 +1,174 @@
+# Ουρά εργασιών σε κοινό filesystem (για πολλά μηχανήματα χωρίς τίποτα άλλο κοινό)
+# Το corpus χωρίζεται σε shards - ένα JSON αρχείο ανά shard. Η κατάσταση ενός shard είναι ο φάκελος όπου βρίσκεται:
+#   pending/  -> claimed/  -> done/
+# Κάθε μετακίνηση είναι ένα os.rename, που είναι atomic: από όσους workers πάνε να πάρουν το ίδιο shard, ένας μόνο
+# τα καταφέρνει (οι άλλοι παίρνουν FileNotFoundError και δοκιμάζουν το επόμενο).
+# Όσο ένας worker δουλεύει ένα shard ανανεώνει το mtime του claim (heartbeat). Claims χωρίς heartbeat για
+# stale_after δευτερόλεπτα (worker που έπεσε) ξαναμπαίνουν στο pending. Αν ο worker ζει ακόμα (π.χ. είχε κολλήσει),
+# το επόμενο heartbeat του αποτυγχάνει και εγκαταλείπει το shard (Heartbeat.lost) - το συνεχίζει ο νέος worker.
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+
+QUEUE_CONFIG_FILENAME = "queue.json"
+QUEUE_STATES = ('pending', 'claimed', 'done')
+HEARTBEAT_SECONDS = 30
+
+
+class ClaimLost(RuntimeError):
+    # το claim ενός shard χάθηκε (θεωρήθηκε stale) ενώ ο worker το επεξεργαζόταν
+    pass
+
+
+def worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.config = {}
+        if os.path.exists(self._path(QUEUE_CONFIG_FILENAME)):
+            self.load()
+
+    def _path(self, *parts):
+        return os.path.join(self.directory, *parts)
+
+    def load(self):
+        with open(self._path(QUEUE_CONFIG_FILENAME), 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        return self
+
+    @property
+    def initialized(self):
+        return bool(self.config)
+
+    def create(self, shards, config):
+        # shards: [[item, ...], ...] -> True αν η ουρά δημιουργήθηκε από αυτό το process.
+        # Όλη η ουρά γράφεται σε προσωρινό φάκελο δίπλα στον τελικό και μπαίνει στη θέση του με ένα rename:
+        # αν δύο workers ξεκινήσουν μαζί, το rename του δεύτερου αποτυγχάνει και χρησιμοποιεί την ουρά του πρώτου.
+        parent = os.path.dirname(os.path.abspath(self.directory))
+        temporary = os.path.join(parent, f".{os.path.basename(os.path.abspath(self.directory))}.{worker_id()}")
+        for state in QUEUE_STATES:
+            os.makedirs(os.path.join(temporary, state))
+        for index, items in enumerate(shards):
+            with open(os.path.join(temporary, 'pending', self.shard_filename(index)), 'w', encoding='utf-8') as f:
+                json.dump(items, f)
+        with open(os.path.join(temporary, QUEUE_CONFIG_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump({**config, 'shards': len(shards)}, f, indent=1, sort_keys=True)
+        try:
+            os.rename(temporary, self.directory)  # ο τελικός φάκελος δεν πρέπει να υπάρχει (ή να είναι άδειος)
+            created = True
+        except OSError:
+            created = False
+            shutil.rmtree(temporary)
+        self.load()
+        return created
+
+    @staticmethod
+    def shard_filename(index):
+        return f"shard-{index:05d}.json"
+
+    @staticmethod
+    def shard_name(filename):
+        return os.path.splitext(filename)[0]
+
+    @staticmethod
+    def claimed_filename(filename, worker=None):
+        # το αρχείο ενός shard στο claimed/ για έναν worker (default: αυτό το process)
+        return f"{os.path.splitext(filename)[0]}.{worker or worker_id()}.json"
+
+    @staticmethod
+    def unclaimed_filename(claimed):
+        # claimed/shard-00000.<worker>.json -> shard-00000.json
+        return claimed.split('.', 1)[0] + ".json"
+
+    def shards(self, state):
+        # ονόματα αρχείων των shards σε μια κατάσταση, ταξινομημένα
+        return sorted(name for name in os.listdir(self._path(state)) if name.endswith('.json'))
+
+    def counts(self):
+        return {state: len(self.shards(state)) for state in QUEUE_STATES}
+
+    def claim(self):
+        # Το επόμενο ελεύθερο shard -> (filename, items) ή None αν δεν έμεινε κανένα στο pending
+        for filename in self.shards('pending'):
+            claimed = self._path('claimed', self.claimed_filename(filename))
+            try:
+                os.rename(self._path('pending', filename), claimed)
+            except FileNotFoundError:
+                continue  # το πήρε άλλος worker
+            os.utime(claimed)  # το heartbeat μετράει από το claim
+            with open(claimed, 'r', encoding='utf-8') as f:
+                return filename, json.load(f)
+        return None
+
+    def heartbeat(self, filename):
+        # False αν το claim αυτού του worker δεν υπάρχει πια (θεωρήθηκε stale - μπορεί να το πήρε άλλος)
+        try:
+            os.utime(self._path('claimed', self.claimed_filename(filename)))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, filename):
+        # False αν το shard είχε θεωρηθεί stale στο μεταξύ (το claim δεν είναι πια αυτού του worker)
+        try:
+            os.rename(self._path('claimed', self.claimed_filename(filename)), self._path('done', filename))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def requeue_stale(self, stale_after):
+        # Claims χωρίς heartbeat για stale_after δευτερόλεπτα -> πίσω στο pending. Επιστρέφει τα filenames.
+        requeued = []
+        now = time.time()
+        for claimed in self.shards('claimed'):
+            filename = self.unclaimed_filename(claimed)
+            try:
+                if now - os.path.getmtime(self._path('claimed', claimed)) < stale_after:
+                    continue
+                os.rename(self._path('claimed', claimed), self._path('pending', filename))
+            except FileNotFoundError:
+                continue  # ολοκληρώθηκε ή το ξαναέβαλε άλλος worker
+            requeued.append(filename)
+        return requeued
+
+
+class Heartbeat:
+    # Thread που ανανεώνει το claim ενός shard όσο το επεξεργάζεται ο worker (with Heartbeat(queue, filename): ...)
+    # lost: Event που γίνεται set αν το claim χαθεί - από εκεί και πέρα ο worker δεν πρέπει να γράψει τίποτα στο shard
+    # (ελέγχεται με alive() πριν από κάθε write / commit)
+
+    def __init__(self, queue, filename, interval=HEARTBEAT_SECONDS):
+        self.queue = queue
+        self.filename = filename
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.queue.heartbeat(self.filename):
+                self.lost.set()
+                return
+
+    def alive(self):
+        # Heartbeat τώρα, όχι στο επόμενο interval: ένας worker που είχε κολλήσει (ή ήταν suspended) μαθαίνει ότι
+        # έχασε το claim πριν γράψει. Μετά από True το claim δεν γίνεται stale για stale_after δευτερόλεπτα.
+        if not self.lost.is_set() and not self.queue.heartbeat(self.filename):
+            self.lost.set()
+        return not self.lost.is_set()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()